@@ -0,0 +1,80 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Paths seguros
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from datos import (DatosProfesores, ColumnaTexto, carpeta_facultad, escribir_dataset, leer_dataset,
+                   DATA_PATH, DATASET_PATH)
+
+def diferencias(original: DatosProfesores, leido: DatosProfesores) -> list[str]:
+    """
+    Compara los datos del CSV con los leídos del dataset columnar.
+    Args:
+        original (DatosProfesores): Datos construidos desde el CSV.
+        leido (DatosProfesores): Datos leídos con `leer_dataset`.
+    Returns:
+        list[str]: Columnas que no coinciden (vacía si todo coincide).
+    """
+    distintas = []
+    for columna, valores in original.columnas.items():
+        otros = leido.columnas.get(columna)
+        if isinstance(valores, ColumnaTexto):
+            iguales = otros is not None and all(
+                (pd.isna(valores[i]) and pd.isna(otros[i])) or valores[i] == otros[i]
+                for i in range(original.n_filas)
+            )
+        else:
+            iguales = otros is not None and np.array_equal(valores, otros, equal_nan=True)
+        if not iguales:
+            distintas.append(columna)
+    for columna, valores in original.reseñas.items():
+        if not np.array_equal(valores, leido.reseñas.get(columna), equal_nan=True):
+            distintas.append(f"reseñas.{columna}")
+    if not np.array_equal(original.offsets, leido.offsets):
+        distintas.append("offsets")
+    if any(original.tags[i] != leido.tags[i] for i in range(original.n_filas)):
+        distintas.append("tags")
+    return distintas
+
+def convertir(csv: str | Path = DATA_PATH, destino: str | Path = DATASET_PATH) -> Path:
+    """
+    Convierte `professor_data.csv` al dataset columnar y comprueba que se lea igual.
+    Args:
+        csv (str | Path): CSV de profesores.
+        destino (str | Path): Carpeta del dataset.
+    Returns:
+        Path: Carpeta del dataset.
+    Raises:
+        ValueError: Si los datos leídos del dataset no coinciden con los del CSV.
+    """
+    inicio = time.perf_counter()
+    original = DatosProfesores(pd.read_csv(csv))
+    destino = escribir_dataset(original, destino)
+    print(f"{original.n_filas} profesores y {int(original.offsets[-1])} reseñas escritos en {destino} "
+          f"({time.perf_counter() - inicio:.2f} s)")
+
+    distintas = diferencias(original, leer_dataset(destino))
+    if distintas:
+        raise ValueError(f"El dataset no coincide con {csv} en: {', '.join(distintas)}")
+
+    tamano = sum(archivo.stat().st_size for archivo in Path(destino).glob("*.parquet"))
+    print(f"Tamaño: {tamano / 1024:.0f} KB (CSV: {Path(csv).stat().st_size / 1024:.0f} KB)")
+    return destino
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convierte el CSV de profesores al dataset columnar.")
+    parser.add_argument("--csv", help="CSV de profesores.")
+    parser.add_argument("--destino", help="Carpeta del dataset.")
+    parser.add_argument("--facultad", help="Convertir los datos de data/facultades/<facultad>/.")
+    args = parser.parse_args()
+
+    carpeta = DATA_PATH.parent if args.facultad is None else carpeta_facultad(args.facultad)
+    convertir(args.csv or carpeta / DATA_PATH.name, args.destino or carpeta / DATASET_PATH.name)
+    print("Conversión completada.")
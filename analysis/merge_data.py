@@ -1,5 +1,12 @@
-import pandas as pd
+import argparse
+import json
 import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from hashlib import md5
+import pandas as pd
 from pathlib import Path
 
 # Paths seguros
@@ -12,29 +19,313 @@ REVIEWS_DIR = DATA_DIR / "reviews_individuales"
 TAGS_DIR.mkdir(exist_ok=True)
 REVIEWS_DIR.mkdir(exist_ok=True)
 
-def merge_data():
-    # Cargar los archivos CSV de tags y reviews
-    tags_files = list(TAGS_DIR.glob("*.csv"))
-    reviews_files = list(REVIEWS_DIR.glob("*.csv"))
+# Lo que se fusionó en la última ejecución (para fusionar solo los archivos que cambiaron)
+MANIFIESTO_PATH = DATA_DIR / "merge_manifiesto.json"
+# Una carpeta por facultad con los mismos archivos que data/
+FACULTADES_DIR = DATA_DIR / "facultades"
+
+# Columnas y tipos esperados en cada archivo individual
+ESQUEMAS = {
+    "tags": {"profesor": "string", "tags": "string"},
+    "reviews": {
+        "profesor": "string",
+        "fecha": "string",
+        "comentario": "string",
+        "calidad_general": "float64",
+        "facilidad": "float64",
+    },
+}
+
+# Filas por bloque al reescribir la salida
+TAMANO_BLOQUE = 50_000
+# Archivos por bloque: cada DataFrame pendiente ocupa varios KB aunque tenga una sola fila
+MAX_PENDIENTES = 500
+
+
+def _firma(archivo: Path) -> dict:
+    info = archivo.stat()
+    return {"mtime_ns": info.st_mtime_ns, "tamano": info.st_size}
+
+
+def _md5(archivo: Path, limite: int | None = None) -> str:
+    # Hash del archivo completo o de sus primeros `limite` bytes
+    with open(archivo, "rb") as f:
+        return md5(f.read() if limite is None else f.read(limite)).hexdigest()
+
+
+def leer_archivo(archivo: Path, tipo: str) -> pd.DataFrame:
+    """
+    Lee un archivo individual y valida sus columnas y tipos.
+    Args:
+        archivo (Path): CSV de tags o reseñas de un profesor.
+        tipo (str): 'tags' o 'reviews' (ver `ESQUEMAS`).
+    Returns:
+        pd.DataFrame: Datos con las columnas de `ESQUEMAS[tipo]`, en ese orden.
+    Raises:
+        ValueError: Si faltan columnas o algún valor no tiene el tipo esperado.
+    """
+    esquema = ESQUEMAS[tipo]
+    # pandas lanza ValueError si un valor no se puede convertir al tipo pedido
+    df = pd.read_csv(archivo, dtype=esquema)
+    faltantes = [c for c in esquema if c not in df.columns]
+    if faltantes:
+        raise ValueError(f"faltan las columnas {faltantes}")
+    return df[list(esquema)]
+
+
+def _leer_en_paralelo(archivos: list[Path], tipo: str, hilos: int | None):
+    # Lee y valida los archivos con un pool de hilos y los entrega en orden como
+    # (archivo, datos, error), con a lo sumo dos lecturas por hilo en curso: la
+    # memoria no crece con el número de archivos
+    def leer(archivo):
+        try:
+            return archivo, leer_archivo(archivo, tipo), None
+        except (ValueError, pd.errors.ParserError) as e:
+            return archivo, None, str(e)
+
+    hilos = hilos or min(32, (os.cpu_count() or 1) + 4)
+    pendientes = iter(archivos)
+    with ThreadPoolExecutor(max_workers=hilos) as pool:
+        en_curso = deque(pool.submit(leer, archivo) for archivo in islice(pendientes, 2 * hilos))
+        while en_curso:
+            resultado = en_curso.popleft().result()
+            siguiente = next(pendientes, None)
+            if siguiente is not None:
+                en_curso.append(pool.submit(leer, siguiente))
+            yield resultado
+
+
+class _Salida:
+    """Escritor por bloques de la salida fusionada (CSV o Parquet con un row group por bloque)."""
+
+    def __init__(self, destino: Path, formato: str, esquema: dict, anexar: bool = False):
+        self.destino = destino
+        self.formato = formato
+        self.esquema = esquema
+        self.anexar = anexar and destino.exists()
+        self._escritor = None
+        self._pendientes = []
+        self._filas_pendientes = 0
+        self.filas = 0
+
+    def agregar(self, df: pd.DataFrame):
+        # Junta los archivos pequeños hasta tener un bloque completo (por filas o por archivos)
+        if df.empty:
+            return
+        self._pendientes.append(df)
+        self._filas_pendientes += len(df)
+        if self._filas_pendientes >= TAMANO_BLOQUE or len(self._pendientes) >= MAX_PENDIENTES:
+            self._escribir()
+
+    def _escribir(self):
+        if not self._pendientes:
+            return
+        df = pd.concat(self._pendientes, ignore_index=True)
+        self._pendientes, self._filas_pendientes = [], 0
+        if self.formato == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            tabla = pa.Table.from_pandas(df.astype(self.esquema), preserve_index=False)
+            if self._escritor is None:
+                self._escritor = pq.ParquetWriter(self.destino, tabla.schema)
+            self._escritor.write_table(tabla)
+        else:
+            escribir_encabezado = self.filas == 0 and not self.anexar
+            df.to_csv(self.destino, mode="w" if escribir_encabezado else "a", header=escribir_encabezado, index=False)
+        self.filas += len(df)
+
+    def cerrar(self):
+        self._escribir()
+        if self._escritor is not None:
+            self._escritor.close()
+        elif self.filas == 0 and not self.anexar:
+            # Salida vacía pero con las columnas del esquema
+            vacia = pd.DataFrame({c: pd.Series(dtype=t) for c, t in self.esquema.items()})
+            if self.formato == "parquet":
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                pq.write_table(pa.Table.from_pandas(vacia, preserve_index=False), self.destino)
+            else:
+                vacia.to_csv(self.destino, index=False)
+
+
+def _leer_salida(destino: Path, formato: str, esquema: dict):
+    # Recorre la salida anterior por bloques
+    if formato == "parquet":
+        import pyarrow.parquet as pq
+
+        for lote in pq.ParquetFile(destino).iter_batches(batch_size=TAMANO_BLOQUE):
+            yield lote.to_pandas()
+    else:
+        yield from pd.read_csv(destino, dtype=esquema, chunksize=TAMANO_BLOQUE)
+
+
+def fusionar(tipo: str, carpeta: Path, destino: Path, manifiesto: dict, hilos: int | None = None,
+             formato: str = "csv", completo: bool = False) -> dict:
+    """
+    Fusiona los archivos individuales de un tipo en `destino`, leyendo solo los que
+    cambiaron desde la última ejecución según `manifiesto` (que se actualiza).
+
+    - Archivos nuevos o a los que solo se les agregaron filas: se anexan sus filas nuevas.
+    - Archivos reescritos o eliminados: la salida se reescribe por bloques sin las filas
+      de sus profesores y después se anexan las filas actuales.
+    - Archivos inválidos (ver `leer_archivo`): no se fusionan. Si habían sido reescritos,
+      sus filas anteriores también se quitan y el archivo se vuelve a intentar como nuevo.
+
+    Los archivos se escriben en la salida conforme se leen, sin juntarlos en memoria. Parquet no
+    admite anexar: si hay algo que leer o quitar, la salida se reescribe completa.
+    Args:
+        tipo (str): 'tags' o 'reviews'.
+        carpeta (Path): Carpeta de los archivos individuales.
+        destino (Path): Archivo fusionado.
+        manifiesto (dict): Estado de la última ejecución para este tipo.
+        hilos (int | None): Hilos para leer los archivos.
+        formato (str): 'csv' o 'parquet' (requiere pyarrow).
+        completo (bool): Ignorar el manifiesto y fusionar todo.
+    Returns:
+        dict: Conteos de archivos nuevos, anexados, reescritos, eliminados, inválidos y filas escritas.
+    """
+    esquema = ESQUEMAS[tipo]
+    archivos = sorted(carpeta.glob("*.csv"))
+    reinicio = completo or not destino.exists()
+    if reinicio:
+        manifiesto.clear()
+
+    actuales = {archivo.name: archivo for archivo in archivos}
+    eliminados = [nombre for nombre in manifiesto if nombre not in actuales]
+    cambiados = [a for a in archivos if manifiesto.get(a.name, {}).get("firma") != _firma(a)]
+
+    # Se clasifican los archivos con el manifiesto (sin leerlos) para saber qué quitar de la salida
+    nuevos, anexados, reescritos = [], {}, []
+    for archivo in cambiados:
+        anterior = manifiesto.get(archivo.name)
+        if anterior is None:
+            nuevos.append(archivo)
+        elif _md5(archivo) == anterior["md5"]:
+            anterior["firma"] = _firma(archivo)  # Solo cambió la fecha de modificación
+        elif (_firma(archivo)["tamano"] > anterior["firma"]["tamano"]
+              and _md5(archivo, anterior["firma"]["tamano"]) == anterior["md5"]):
+            anexados[archivo] = anterior["filas"]
+        else:
+            reescritos.append(archivo)
+
+    # Profesores cuyas filas hay que quitar de la salida anterior
+    quitar = {p for nombre in eliminados for p in manifiesto[nombre]["profesores"]}
+    quitar |= {p for archivo in reescritos for p in manifiesto[archivo.name]["profesores"]}
+
+    for nombre in eliminados:
+        del manifiesto[nombre]
+    por_leer = nuevos + reescritos + list(anexados)
+    if not (reinicio or quitar or por_leer):
+        # Nada que leer ni que quitar: la salida no se toca
+        return {"nuevos": 0, "anexados": 0, "reescritos": 0, "eliminados": len(eliminados), "invalidos": 0, "filas": 0}
+
+    temporal = None
+    if quitar and destino.exists():
+        temporal = destino.with_name(destino.name + ".tmp")
+        salida = _Salida(temporal, formato, esquema)
+        for bloque in _leer_salida(destino, formato, esquema):
+            salida.agregar(bloque[~bloque["profesor"].isin(quitar)])
+    elif reinicio:
+        temporal = destino.with_name(destino.name + ".tmp")
+        salida = _Salida(temporal, formato, esquema)
+    elif formato == "parquet":
+        # Parquet no admite anexar: se reescribe siempre
+        temporal = destino.with_name(destino.name + ".tmp")
+        salida = _Salida(temporal, formato, esquema)
+        for bloque in _leer_salida(destino, formato, esquema):
+            salida.agregar(bloque)
+    else:
+        # CSV con solo filas nuevas: se anexan sin reescribir
+        salida = _Salida(destino, formato, esquema, anexar=True)
+
+    # Cada archivo se escribe y se registra en cuanto se lee; después se descarta
+    invalidos, filas_nuevas = 0, 0
+    for archivo, df, error in _leer_en_paralelo(por_leer, tipo, hilos):
+        if error is not None:
+            invalidos += 1
+            print(f"⚠️ {archivo.name} no se fusionó: {error}")
+            if archivo in reescritos:
+                # Sus filas anteriores ya no están en la salida: se fusionará como nuevo
+                del manifiesto[archivo.name]
+            continue
+        filas = df.iloc[anexados.get(archivo, 0):]
+        salida.agregar(filas)
+        filas_nuevas += len(filas)
+        manifiesto[archivo.name] = {
+            "firma": _firma(archivo),
+            "md5": _md5(archivo),
+            "filas": len(df),
+            "profesores": sorted(df["profesor"].dropna().unique().tolist()),
+        }
+        del df, filas
+    salida.cerrar()
+    if temporal is not None:
+        os.replace(temporal, destino)
+
+    return {
+        "nuevos": len(nuevos), "anexados": len(anexados), "reescritos": len(reescritos),
+        "eliminados": len(eliminados), "invalidos": invalidos, "filas": filas_nuevas,
+    }
+
+
+def merge_data(hilos: int | None = None, formato: str = "csv", completo: bool = False,
+               tags_dir: Path = TAGS_DIR, reviews_dir: Path = REVIEWS_DIR, salida_dir: Path = DATA_DIR,
+               manifiesto_path: Path = MANIFIESTO_PATH) -> dict:
+    """
+    Fusiona los tags y las reseñas individuales en `merged_tags` y `merged_reviews`.
+    Args:
+        hilos (int | None): Hilos para leer los archivos.
+        formato (str): 'csv' o 'parquet' (requiere pyarrow).
+        completo (bool): Fusionar todo de nuevo aunque los archivos no hayan cambiado.
+        tags_dir (Path): Carpeta de tags individuales.
+        reviews_dir (Path): Carpeta de reseñas individuales.
+        salida_dir (Path): Carpeta de los archivos fusionados.
+        manifiesto_path (Path): Manifiesto de la última ejecución.
+    Returns:
+        dict: Resumen de `fusionar` por tipo.
+    """
+    tags_files = list(tags_dir.glob("*.csv"))
+    reviews_files = list(reviews_dir.glob("*.csv"))
 
     if not tags_files or not reviews_files:
         print("No se encontraron archivos de tags o reviews para fusionar.")
-        return
+        return {}
 
-    # Leer y concatenar los DataFrames de tags
-    tags_dfs = [pd.read_csv(file) for file in tags_files]
-    merged_tags = pd.concat(tags_dfs, ignore_index=True)
+    manifiesto = {}
+    if manifiesto_path.exists():
+        with open(manifiesto_path, encoding="utf-8") as f:
+            manifiesto = json.load(f)
+    # Un manifiesto de otro formato de salida no sirve
+    if manifiesto.get("formato") != formato:
+        manifiesto = {"formato": formato}
 
-    # Leer y concatenar los DataFrames de reviews
-    reviews_dfs = [pd.read_csv(file) for file in reviews_files]
-    merged_reviews = pd.concat(reviews_dfs, ignore_index=True)
+    resumen = {}
+    for tipo, carpeta in (("tags", tags_dir), ("reviews", reviews_dir)):
+        inicio = time.perf_counter()
+        destino = salida_dir / f"merged_{tipo}.{formato}"
+        resumen[tipo] = fusionar(tipo, carpeta, destino, manifiesto.setdefault(tipo, {}), hilos, formato, completo)
+        print(f"{destino.name}: {resumen[tipo]} en {time.perf_counter() - inicio:.2f} s")
 
-    # Guardar los DataFrames fusionados
-    merged_tags.to_csv(DATA_DIR / "merged_tags.csv", index=False)
-    merged_reviews.to_csv(DATA_DIR / "merged_reviews.csv", index=False)
+    temporal = manifiesto_path.with_suffix(".tmp")
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(manifiesto, f, ensure_ascii=False)
+    os.replace(temporal, manifiesto_path)
 
     print("Datos fusionados y guardados correctamente.")
+    return resumen
 
 if __name__ == "__main__":
-    merge_data()
+    parser = argparse.ArgumentParser(description="Fusiona los tags y reseñas individuales.")
+    parser.add_argument("--hilos", type=int, help="Hilos para leer los archivos.")
+    parser.add_argument("--formato", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--completo", action="store_true", help="Ignorar el manifiesto y fusionar todo.")
+    parser.add_argument("--facultad", help="Identificador de la facultad (carpeta en data/facultades/).")
+    args = parser.parse_args()
+
+    carpeta = DATA_DIR if args.facultad is None else FACULTADES_DIR / args.facultad
+    merge_data(args.hilos, args.formato, args.completo, carpeta / TAGS_DIR.name, carpeta / REVIEWS_DIR.name,
+               carpeta, carpeta / MANIFIESTO_PATH.name)
     print("Proceso de fusión de datos completado.")
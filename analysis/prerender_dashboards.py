@@ -0,0 +1,66 @@
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Paths seguros
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from plotly.io.json import to_json_plotly
+from datos import cargar_datos, carpeta_facultad, guardar_dashboards, hash_archivo, resolver_ruta, ruta_facultad
+from utils import generar_secciones
+
+_datos = None
+
+def _iniciar(ruta: str, cache_dir: str | None):
+    # Cada proceso carga los datos una sola vez (desde la caché binaria)
+    global _datos
+    _datos = cargar_datos(ruta, cache_dir)
+
+def _renderizar(nombres: list[str]) -> list[tuple[str, bytes]]:
+    return [(nombre, to_json_plotly(generar_secciones(_datos, nombre)).encode()) for nombre in nombres]
+
+def prerender_dashboards(ruta: str | Path | None = None, procesos: int | None = None, tamano_lote: int = 16,
+                         directorio: str | Path | None = None, cache_dir: str | Path | None = None) -> Path:
+    """
+    Renderiza el dashboard de todos los profesores y los guarda con `guardar_dashboards`.
+    Args:
+        ruta (str | Path | None): CSV o dataset columnar de profesores (por defecto el de `cargar_datos`).
+        procesos (int | None): Número de procesos del pool (por defecto, uno por CPU).
+        tamano_lote (int): Profesores por tarea enviada al pool.
+        directorio (str | Path | None): Carpeta base de salida (por defecto la de `guardar_dashboards`).
+        cache_dir (str | Path | None): Carpeta de la caché binaria (por defecto la de `cargar_datos`).
+            Cada facultad usa la suya: al publicar una versión se borran las demás de esa carpeta.
+    Returns:
+        Path: Carpeta con los dashboards.
+    """
+    ruta = resolver_ruta(ruta)
+    nombres = cargar_datos(ruta, cache_dir).nombres
+    lotes = [nombres[i:i + tamano_lote] for i in range(0, len(nombres), tamano_lote)]
+
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar, initargs=(str(ruta), cache_dir and str(cache_dir))) as pool:
+        registros = (registro for lote in pool.map(_renderizar, lotes) for registro in lote)
+        destino = guardar_dashboards(registros, hash_archivo(ruta), directorio)
+    duracion = time.perf_counter() - inicio
+
+    print(f"{len(nombres)} dashboards renderizados en {duracion:.1f} s ({len(nombres) / duracion:.1f} profesores/s)")
+    print(f"Guardados en {destino}")
+    return destino
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prerenderiza los dashboards de todos los profesores.")
+    parser.add_argument("--datos", help="Ruta del CSV o del dataset columnar de profesores.")
+    parser.add_argument("--procesos", type=int, help="Número de procesos (por defecto, uno por CPU).")
+    parser.add_argument("--facultad", help="Prerenderizar la partición de data/facultades/<facultad>/.")
+    args = parser.parse_args()
+
+    if args.facultad is None:
+        prerender_dashboards(args.datos, args.procesos)
+    else:
+        carpeta = carpeta_facultad(args.facultad)
+        prerender_dashboards(ruta_facultad(args.facultad), args.procesos,
+                             directorio=carpeta / "prerender", cache_dir=carpeta / "cache")
+    print("Proceso de prerenderizado completado.")
@@ -0,0 +1,334 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+import pandas as pd
+
+# Paths seguros
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+sys.path.insert(0, str(BASE_DIR))
+
+from convertir_dataset import convertir
+from datos import DATA_PATH, DATASET_PATH
+
+# Reseñas con su puntuación (salida de sentimientos.py)
+REVIEWS_PATH = DATA_DIR / "reviews_plus_score.csv"
+# Resúmenes por profesor (los que usa Unificar Stats.ipynb)
+SUMMARIES_PATH = DATA_DIR / "summaries.csv"
+# Un resumen por línea (JSON) con el hash de los comentarios de los que salió
+CHECKPOINT_PATH = DATA_DIR / "resumenes_checkpoint.jsonl"
+# Una carpeta por facultad con los mismos archivos que data/
+FACULTADES_DIR = DATA_DIR / "facultades"
+
+MODELO_HF = "CohereLabs/c4ai-command-r7b-12-2024"
+PROMPT = "Resume el siguiente texto de forma clara, concisa, unificada y coherente:\n\n{texto}\n\nResumen:"
+# Los textos más largos se resumen por fragmentos y luego se resumen los resúmenes
+MAX_CARACTERES = 100_000
+CONCURRENCIA = 4
+
+
+class BackendTransformers:
+    """Modelo del cuadernillo `Resumen de Opiniones con LLM.ipynb` (requiere transformers, torch y bitsandbytes)."""
+
+    def __init__(self, modelo: str = MODELO_HF):
+        try:
+            import torch
+            from transformers import AutoModelForCausalLM, AutoTokenizer, BitsAndBytesConfig, pipeline
+        except ImportError as e:
+            raise ImportError("El backend de transformers necesita transformers, torch y bitsandbytes: "
+                              "pip install transformers accelerate bitsandbytes torch") from e
+        self.nombre = modelo
+        tokenizer = AutoTokenizer.from_pretrained(modelo)
+        model = AutoModelForCausalLM.from_pretrained(
+            modelo, device_map="auto", torch_dtype=torch.float16,
+            quantization_config=BitsAndBytesConfig(load_in_4bit=True),
+        )
+        self._pipeline = pipeline("text-generation", model=model, tokenizer=tokenizer)
+        # Un solo modelo en la GPU: las llamadas concurrentes esperan su turno
+        self._candado = threading.Lock()
+
+    def generar(self, prompt: str) -> str:
+        with self._candado:
+            salida = self._pipeline(prompt, max_new_tokens=500, do_sample=True, temperature=0.7, top_p=0.9,
+                                    return_full_text=False)
+        return salida[0]["generated_text"].strip()
+
+
+class BackendHTTP:
+    """
+    Servidor con la API de chat de OpenAI (vLLM, TGI, llama.cpp, ...). Aquí sí
+    sirve la concurrencia: el servidor agrupa las peticiones en lotes.
+    """
+
+    def __init__(self, url: str, modelo: str = MODELO_HF, clave: str | None = None, timeout: float = 300):
+        self.nombre = modelo
+        self.url = url.rstrip("/") + "/v1/chat/completions"
+        self.clave = clave if clave is not None else os.environ.get("LLM_API_KEY")
+        self.timeout = timeout
+
+    def generar(self, prompt: str) -> str:
+        cuerpo = json.dumps({
+            "model": self.nombre,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": 500, "temperature": 0.7, "top_p": 0.9,
+        }).encode()
+        encabezados = {"Content-Type": "application/json"}
+        if self.clave:
+            encabezados["Authorization"] = f"Bearer {self.clave}"
+        peticion = urllib.request.Request(self.url, data=cuerpo, headers=encabezados)
+        with urllib.request.urlopen(peticion, timeout=self.timeout) as respuesta:
+            return json.load(respuesta)["choices"][0]["message"]["content"].strip()
+
+
+class BackendPrueba:
+    """
+    Backend local para pruebas: devuelve las primeras palabras del texto a
+    resumir, siempre igual para el mismo prompt. `demora` simula la latencia
+    de un modelo real (en segundos por llamada).
+    """
+
+    nombre = "prueba"
+
+    def __init__(self, demora: float = 0.0, palabras: int = 40):
+        self.demora = demora
+        self.palabras = palabras
+
+    def generar(self, prompt: str) -> str:
+        if self.demora:
+            time.sleep(self.demora)
+        texto = prompt.split("\n\n", 1)[-1].rsplit("\n\nResumen:", 1)[0]
+        return " ".join(texto.split()[:self.palabras])
+
+
+BACKENDS = {"transformers": BackendTransformers, "http": BackendHTTP, "prueba": BackendPrueba}
+
+
+def hash_comentarios(comentarios: list[str], modelo: str) -> str:
+    """
+    Hash del conjunto de comentarios de un profesor (sin importar su orden) y del
+    modelo y prompt con los que se resume: si no cambia, el resumen tampoco.
+    Args:
+        comentarios (list[str]): Comentarios del profesor.
+        modelo (str): Nombre del modelo (`nombre` del backend).
+    Returns:
+        str: SHA-1 en hexadecimal.
+    """
+    h = hashlib.sha1(f"{modelo}\x00{PROMPT}".encode("utf-8"))
+    for comentario in sorted(comentarios):
+        h.update(b"\x00" + comentario.encode("utf-8"))
+    return h.hexdigest()
+
+
+def leer_checkpoint(ruta: str | Path) -> dict[str, dict]:
+    """
+    Lee los resúmenes guardados.
+    Args:
+        ruta (str | Path): Archivo JSONL con `profesor`, `hash` y `resumen` por línea.
+    Returns:
+        dict[str, dict]: Última entrada de cada profesor (vacío si no hay archivo).
+    """
+    entradas = {}
+    if not Path(ruta).exists():
+        return entradas
+    with open(ruta, encoding="utf-8") as f:
+        for linea in f:
+            try:
+                entrada = json.loads(linea)
+            except json.JSONDecodeError:
+                continue  # Línea cortada si el proceso se interrumpió mientras escribía
+            entradas[entrada["profesor"]] = entrada
+    return entradas
+
+
+def _escribir_checkpoint(ruta: Path, entradas: dict[str, dict]):
+    # Compacta el archivo: una línea por profesor
+    temporal = ruta.with_name(ruta.name + ".tmp")
+    with open(temporal, "w", encoding="utf-8") as f:
+        for entrada in entradas.values():
+            f.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+    os.replace(temporal, ruta)
+
+
+def _fragmentar(texto: str, max_caracteres: int = MAX_CARACTERES) -> list[str]:
+    return [texto[i:i + max_caracteres] for i in range(0, len(texto), max_caracteres)] or [""]
+
+
+async def resumen_jerarquico(backend, texto: str, limite: asyncio.Semaphore) -> tuple[str, int]:
+    """
+    Resume un texto por fragmentos y, si hay más de uno, resume después sus resúmenes.
+    Args:
+        backend: Objeto con `generar(prompt) -> str` (ver `BACKENDS`).
+        texto (str): Comentarios del profesor unidos.
+        limite (asyncio.Semaphore): Límite de llamadas simultáneas al backend.
+    Returns:
+        tuple[str, int]: Resumen y número de llamadas al backend.
+    """
+    async def generar(fragmento: str) -> str:
+        async with limite:
+            return await asyncio.to_thread(backend.generar, PROMPT.format(texto=fragmento))
+
+    fragmentos = _fragmentar(texto)
+    resumenes = await asyncio.gather(*(generar(f) for f in fragmentos))
+    if len(resumenes) == 1:
+        return resumenes[0], 1
+    return await generar(" ".join(resumenes)), len(fragmentos) + 1
+
+
+async def _regenerar(backend, pendientes: dict[str, dict], checkpoint: Path, concurrencia: int) -> tuple[dict, dict, int]:
+    limite = asyncio.Semaphore(concurrencia)
+    nuevos, errores, llamadas = {}, {}, 0
+
+    async def procesar(profesor: str, pendiente: dict):
+        nonlocal llamadas
+        try:
+            resumen, n = await resumen_jerarquico(backend, pendiente["texto"], limite)
+        except Exception as e:
+            errores[profesor] = str(e)
+            print(f"❌ Error al resumir a {profesor}: {e}")
+            return
+        llamadas += n
+        entrada = {"profesor": profesor, "hash": pendiente["hash"], "resumen": resumen}
+        nuevos[profesor] = entrada
+        # Se guarda en cuanto termina: al reanudar solo faltan los que no se guardaron
+        with open(checkpoint, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+        print(f"  {len(nuevos)}/{len(pendientes)} resúmenes generados")
+
+    await asyncio.gather(*(procesar(p, d) for p, d in pendientes.items()))
+    return nuevos, errores, llamadas
+
+
+def escribir_resumenes(resumenes: dict[str, str], datos_path: str | Path = DATA_PATH,
+                       dataset_path: str | Path = DATASET_PATH) -> int:
+    """
+    Escribe los resúmenes en la columna `resumen` de los datos de profesores (y
+    en el dataset columnar, si existe).
+    Args:
+        resumenes (dict[str, str]): Resumen por profesor (nombre como en `datos_path`).
+        datos_path (str | Path): CSV de profesores.
+        dataset_path (str | Path): Carpeta del dataset columnar.
+    Returns:
+        int: Profesores cuyo resumen cambió.
+    """
+    # Todo como texto para no alterar las demás columnas al reescribir el CSV
+    df = pd.read_csv(datos_path, dtype=str, keep_default_na=False)
+    nuevos = df["profesor"].map(resumenes)
+    cambiados = nuevos.notna() & (nuevos != df["resumen"])
+    if not cambiados.any():
+        return 0
+
+    df.loc[cambiados, "resumen"] = nuevos[cambiados]
+    datos_path = Path(datos_path)
+    temporal = datos_path.with_name(datos_path.name + ".tmp")
+    df.to_csv(temporal, index=False)
+    os.replace(temporal, datos_path)
+    if Path(dataset_path).exists():
+        convertir(datos_path, dataset_path)
+    return int(cambiados.sum())
+
+
+def actualizar_resumenes(backend, entrada: str | Path = REVIEWS_PATH, checkpoint_path: str | Path = CHECKPOINT_PATH,
+                         summaries_path: str | Path = SUMMARIES_PATH, datos_path: str | Path = DATA_PATH,
+                         dataset_path: str | Path = DATASET_PATH, concurrencia: int = CONCURRENCIA,
+                         adoptar: bool = False) -> dict:
+    """
+    Regenera solo los resúmenes de los profesores cuyos comentarios cambiaron desde
+    la última ejecución y los escribe en `summaries.csv` y en los datos de profesores.
+    Args:
+        backend: Objeto con `nombre` y `generar(prompt) -> str` (ver `BACKENDS`).
+        entrada (str | Path): Reseñas con columnas `profesor` y `comentario`.
+        checkpoint_path (str | Path): Resúmenes ya generados con el hash de sus comentarios.
+        summaries_path (str | Path): CSV de salida con `profesor` y `resumen`.
+        datos_path (str | Path): CSV de profesores al que se escriben los resúmenes.
+        dataset_path (str | Path): Dataset columnar que se regenera si existe.
+        concurrencia (int): Llamadas simultáneas al backend.
+        adoptar (bool): Tomar como vigentes los resúmenes que ya están en `datos_path` para los
+            profesores que no aparecen en el checkpoint (en lugar de generarlos de nuevo).
+    Returns:
+        dict: Profesores, sin cambios, adoptados, regenerados, errores, llamadas al backend,
+            profesores escritos y segundos.
+    """
+    inicio = time.perf_counter()
+    checkpoint_path = Path(checkpoint_path)
+    reseñas = pd.read_csv(entrada, usecols=["profesor", "comentario"]).dropna()
+    # Mismos nombres que en los datos de profesores (Unificar Stats.ipynb)
+    reseñas["profesor"] = reseñas["profesor"].str.title()
+    comentarios = reseñas.groupby("profesor", sort=True)["comentario"].agg(list)
+
+    guardados = leer_checkpoint(checkpoint_path)
+    anteriores = {}
+    if adoptar and Path(datos_path).exists():
+        df = pd.read_csv(datos_path, usecols=["profesor", "resumen"]).dropna()
+        anteriores = dict(zip(df["profesor"], df["resumen"]))
+
+    pendientes, adoptados = {}, 0
+    for profesor, lista in comentarios.items():
+        h = hash_comentarios(lista, backend.nombre)
+        if guardados.get(profesor, {}).get("hash") == h:
+            continue
+        if profesor not in guardados and profesor in anteriores:
+            guardados[profesor] = {"profesor": profesor, "hash": h, "resumen": anteriores[profesor]}
+            adoptados += 1
+            continue
+        pendientes[profesor] = {"hash": h, "texto": " ".join(lista)}
+    print(f"{len(comentarios)} profesores: {len(pendientes)} resúmenes por generar")
+
+    nuevos, errores, llamadas = asyncio.run(_regenerar(backend, pendientes, checkpoint_path, concurrencia))
+    guardados.update(nuevos)
+    _escribir_checkpoint(checkpoint_path, guardados)
+
+    resumenes = {p: guardados[p]["resumen"] for p in comentarios.index if p in guardados}
+    summaries_path = Path(summaries_path)
+    temporal = summaries_path.with_name(summaries_path.name + ".tmp")
+    pd.DataFrame({"profesor": list(resumenes), "resumen": list(resumenes.values())}).to_csv(temporal, index=False)
+    os.replace(temporal, summaries_path)
+    escritos = escribir_resumenes(resumenes, datos_path, dataset_path) if Path(datos_path).exists() else 0
+
+    resumen = {
+        "profesores": len(comentarios),
+        "sin_cambios": len(comentarios) - len(pendientes) - adoptados,
+        "adoptados": adoptados,
+        "regenerados": len(nuevos),
+        "errores": len(errores),
+        "llamadas": llamadas,
+        "escritos": escritos,
+        "segundos": time.perf_counter() - inicio,
+    }
+    print(f"{resumen['regenerados']} resúmenes regenerados con {llamadas} llamadas a {backend.nombre}, "
+          f"{resumen['sin_cambios']} sin cambios, {adoptados} adoptados, {resumen['errores']} con error; "
+          f"{escritos} escritos en {Path(datos_path).name} ({resumen['segundos']:.1f} s)")
+    return resumen
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Regenera los resúmenes de los profesores cuyos comentarios cambiaron.")
+    parser.add_argument("--backend", choices=list(BACKENDS), default="transformers")
+    parser.add_argument("--url", help="URL del servidor para --backend http.")
+    parser.add_argument("--modelo", default=MODELO_HF, help="Modelo para --backend transformers o http.")
+    parser.add_argument("--concurrencia", type=int, default=CONCURRENCIA, help="Llamadas simultáneas al backend.")
+    parser.add_argument("--adoptar", action="store_true",
+                        help="Conservar los resúmenes existentes de los profesores que no están en el checkpoint.")
+    parser.add_argument("--facultad", help="Identificador de la facultad (carpeta en data/facultades/).")
+    args = parser.parse_args()
+
+    if args.backend == "http":
+        if not args.url:
+            parser.error("--backend http necesita --url")
+        backend = BackendHTTP(args.url, args.modelo)
+    elif args.backend == "transformers":
+        backend = BackendTransformers(args.modelo)
+    else:
+        backend = BackendPrueba()
+
+    carpeta = DATA_DIR if args.facultad is None else FACULTADES_DIR / args.facultad
+    actualizar_resumenes(backend, carpeta / REVIEWS_PATH.name, carpeta / CHECKPOINT_PATH.name,
+                         carpeta / SUMMARIES_PATH.name, carpeta / DATA_PATH.name, carpeta / DATASET_PATH.name,
+                         args.concurrencia, args.adoptar)
+    print("Resúmenes actualizados.")
@@ -0,0 +1,199 @@
+import argparse
+import hashlib
+import os
+import re
+import time
+import unicodedata
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Paths seguros
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+
+# Reseñas fusionadas por merge_data.py y reseñas con su puntuación (las que usa Unificar Stats.ipynb)
+REVIEWS_PATH = DATA_DIR / "merged_reviews.csv"
+SALIDA_PATH = DATA_DIR / "reviews_plus_score.csv"
+# Puntuaciones ya calculadas por modelo y hash del comentario
+CACHE_PATH = DATA_DIR / "cache_sentimientos.csv"
+# Una carpeta por facultad con los mismos archivos que data/
+FACULTADES_DIR = DATA_DIR / "facultades"
+
+# Texto que pone el sitio mientras un comentario no se ha aprobado
+COMENTARIO_PENDIENTE = "[Comentario esperando revisión]"
+# Etiquetas del modelo de Hugging Face (Unificar Stats.ipynb las convierte en 1-5)
+ETIQUETAS = ["1 star", "2 stars", "3 stars", "4 stars", "5 stars"]
+MODELO_HF = "nlptown/bert-base-multilingual-uncased-sentiment"
+TAMANO_LOTE = 128
+
+
+def hash_texto(texto: str) -> str:
+    """
+    Hash de un comentario para la caché de puntuaciones.
+    Args:
+        texto (str): Comentario.
+    Returns:
+        str: SHA-1 del texto en UTF-8 (hexadecimal).
+    """
+    return hashlib.sha1(texto.encode("utf-8")).hexdigest()
+
+
+def _normalizar(texto: str) -> str:
+    # Sin acentos, en minúsculas y solo letras y números (como `normalizar` de busqueda.py)
+    texto = unicodedata.normalize('NFKD', str(texto)).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', ' ', texto.lower()).strip()
+
+
+class ModeloTransformers:
+    """Modelo de Hugging Face del cuadernillo `Análisis de Sentimientos.ipynb` (requiere transformers y torch)."""
+
+    def __init__(self, nombre: str = MODELO_HF, dispositivo: int | None = None):
+        try:
+            import torch
+            from transformers import pipeline
+        except ImportError as e:
+            raise ImportError("El modelo de sentimientos necesita transformers y torch: "
+                              "pip install transformers torch") from e
+        if dispositivo is None:
+            dispositivo = 0 if torch.cuda.is_available() else -1
+        self.nombre = nombre
+        self._pipeline = pipeline("sentiment-analysis", model=nombre, device=dispositivo)
+
+    def clasificar(self, textos: list[str]) -> list[str]:
+        # Todo el lote en una sola llamada (el cuadernillo llamaba al modelo texto por texto)
+        resultados = self._pipeline(textos, batch_size=len(textos), truncation=True)
+        return [resultado["label"] for resultado in resultados]
+
+
+class ModeloDeterminista:
+    """
+    Modelo de prueba sin dependencias: parte de 3 estrellas y suma o resta una
+    por cada palabra positiva o negativa del comentario. Da siempre la misma
+    etiqueta para el mismo texto.
+    """
+
+    nombre = "determinista"
+    POSITIVAS = {"excelente", "bueno", "buena", "buen", "recomiendo", "explica", "claro", "clara",
+                 "aprendes", "paciente", "amable", "interesante", "mejor", "increible", "genial"}
+    NEGATIVAS = {"pesimo", "pesima", "malo", "mala", "falta", "nunca", "no", "aburrido", "aburrida",
+                 "injusto", "injusta", "grosero", "grosera", "peor", "desinteresado", "desinteresada"}
+
+    def clasificar(self, textos: list[str]) -> list[str]:
+        etiquetas = []
+        for texto in textos:
+            palabras = _normalizar(texto).split()
+            saldo = sum(p in self.POSITIVAS for p in palabras) - sum(p in self.NEGATIVAS for p in palabras)
+            etiquetas.append(ETIQUETAS[int(np.clip(2 + saldo, 0, 4))])
+        return etiquetas
+
+
+MODELOS = {"transformers": ModeloTransformers, "determinista": ModeloDeterminista}
+
+
+def leer_cache(ruta: str | Path, modelo: str) -> dict[str, str]:
+    """
+    Lee las puntuaciones guardadas de un modelo.
+    Args:
+        ruta (str | Path): CSV de la caché (columnas modelo, hash y rating).
+        modelo (str): Nombre del modelo.
+    Returns:
+        dict[str, str]: Etiqueta por hash de comentario (vacío si no hay caché).
+    """
+    if not Path(ruta).exists():
+        return {}
+    cache = pd.read_csv(ruta, dtype="string")
+    cache = cache[cache["modelo"] == modelo]
+    return dict(zip(cache["hash"], cache["rating"]))
+
+
+def _anexar_cache(ruta: Path, modelo: str, hashes: list[str], etiquetas: list[str]):
+    # Se anexa después de cada lote: si el proceso se interrumpe no se pierde lo ya puntuado
+    nuevo = not ruta.exists()
+    pd.DataFrame({"modelo": modelo, "hash": hashes, "rating": etiquetas}).to_csv(
+        ruta, mode="w" if nuevo else "a", header=nuevo, index=False)
+
+
+def _leer_reseñas(ruta: Path) -> pd.DataFrame:
+    if ruta.suffix == ".parquet":
+        return pd.read_parquet(ruta)
+    return pd.read_csv(ruta)
+
+
+def puntuar_reseñas(modelo, entrada: str | Path = REVIEWS_PATH, salida: str | Path = SALIDA_PATH,
+                    cache_path: str | Path = CACHE_PATH, tamano_lote: int = TAMANO_LOTE) -> dict:
+    """
+    Puntúa de 1 a 5 estrellas los comentarios de las reseñas por lotes. Solo se
+    pasan al modelo los comentarios cuyo hash no está en la caché.
+    Args:
+        modelo: Objeto con `nombre` y `clasificar(textos) -> etiquetas` (ver `MODELOS`).
+        entrada (str | Path): Reseñas fusionadas (CSV o Parquet de merge_data.py).
+        salida (str | Path): CSV con las reseñas y las columnas `review` y `rating`.
+        cache_path (str | Path): CSV de la caché de puntuaciones.
+        tamano_lote (int): Comentarios por llamada al modelo.
+    Returns:
+        dict: Reseñas, comentarios distintos, comentarios puntuados, tomados de la caché,
+            segundos del modelo y comentarios por segundo.
+    Raises:
+        ValueError: Si el modelo no devuelve una etiqueta válida por comentario.
+    """
+    cache_path = Path(cache_path)
+    # Como el cuadernillo, se descartan las reseñas con algún campo vacío
+    reseñas = _leer_reseñas(Path(entrada)).dropna()
+    reseñas = reseñas[reseñas["comentario"] != COMENTARIO_PENDIENTE].reset_index(drop=True)
+    hashes = reseñas["comentario"].map(hash_texto)
+
+    # Cada comentario distinto se puntúa una sola vez
+    textos = dict(zip(hashes, reseñas["comentario"]))
+    cache = leer_cache(cache_path, modelo.nombre)
+    pendientes = [h for h in textos if h not in cache]
+
+    segundos = 0.0
+    for i in range(0, len(pendientes), tamano_lote):
+        lote = pendientes[i:i + tamano_lote]
+        inicio = time.perf_counter()
+        etiquetas = list(modelo.clasificar([textos[h] for h in lote]))
+        segundos += time.perf_counter() - inicio
+        if len(etiquetas) != len(lote) or any(e not in ETIQUETAS for e in etiquetas):
+            raise ValueError(f"El modelo {modelo.nombre} no devolvió una etiqueta válida por comentario")
+        _anexar_cache(cache_path, modelo.nombre, lote, etiquetas)
+        cache.update(zip(lote, etiquetas))
+        hechos = min(i + tamano_lote, len(pendientes))
+        if (i // tamano_lote) % 10 == 9 or hechos == len(pendientes):
+            print(f"  {hechos}/{len(pendientes)} comentarios puntuados ({hechos / max(segundos, 1e-9):.0f} comentarios/s)")
+
+    reseñas["review"] = reseñas["comentario"]
+    reseñas["rating"] = hashes.map(cache)
+    salida = Path(salida)
+    temporal = salida.with_name(salida.name + ".tmp")
+    reseñas.to_csv(temporal, index=False)
+    os.replace(temporal, salida)
+
+    resumen = {
+        "reseñas": len(reseñas),
+        "distintos": len(textos),
+        "puntuados": len(pendientes),
+        "cache": len(textos) - len(pendientes),
+        "segundos": segundos,
+        "comentarios_por_segundo": len(pendientes) / segundos if segundos else 0.0,
+    }
+    print(f"{resumen['reseñas']} reseñas, {resumen['distintos']} comentarios distintos: "
+          f"{resumen['puntuados']} puntuados con {modelo.nombre} "
+          f"({resumen['comentarios_por_segundo']:.0f} comentarios/s) y {resumen['cache']} desde la caché")
+    return resumen
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Puntúa los comentarios de las reseñas con un modelo de sentimientos.")
+    parser.add_argument("--modelo", choices=list(MODELOS), default="transformers")
+    parser.add_argument("--entrada", help="Reseñas fusionadas (merged_reviews.csv o .parquet).")
+    parser.add_argument("--salida", help="CSV de salida con la columna rating.")
+    parser.add_argument("--tamano-lote", type=int, default=TAMANO_LOTE, help="Comentarios por llamada al modelo.")
+    parser.add_argument("--facultad", help="Identificador de la facultad (carpeta en data/facultades/).")
+    args = parser.parse_args()
+
+    carpeta = DATA_DIR if args.facultad is None else FACULTADES_DIR / args.facultad
+    # La caché es compartida: el mismo comentario tiene la misma puntuación en cualquier facultad
+    puntuar_reseñas(MODELOS[args.modelo](), args.entrada or carpeta / REVIEWS_PATH.name,
+                    args.salida or carpeta / SALIDA_PATH.name, CACHE_PATH, args.tamano_lote)
+    print("Análisis de sentimientos completado.")
@@ -2,32 +2,182 @@ from dash import html, dcc
 import dash_bootstrap_components as dbc
 import plotly.express as px
 import pandas as pd
-from dash import Dash, dcc, html, Output, Input
-from utils import generar_resumen, plot_facilidad, plot_calidad, show_means, get_tags, plot_tendencias, get_link, num_estrellas
+import logging
+import os
+import plotly.io as pio
+from dash import Dash, dcc, html, Output, Input, State, ClientsideFunction, Patch, ctx, no_update
+from dash.exceptions import PreventUpdate
+from busqueda import IndiceBusqueda
+from compresion import comprimir_respuestas
+from comparacion import METRICAS, TablaAgregados
+from metricas import instrumentar, medir, registro
+from datos import (cargar_datos, cargar_facultad, carpeta_facultad, listar_facultades, resolver_ruta, ruta_facultad,
+                   CacheFacultades, DashboardsPrecalculados)
+from refresco import Refrescador
+from utils import (cache_figuras, generar_comparacion, generar_dashboard_cliente, generar_esqueleto,
+                   generar_secciones, generar_textos, columnas_ranking, figura_distribucion, figura_seccion,
+                   filas_ranking, opciones_etiquetas, show_means, GRAFICAS, PLANTILLA)
 
-app = Dash(__name__, external_stylesheets=[dbc.themes.CYBORG,'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.0/css/all.min.css'])
+# Modo opcional en el que las gráficas y los indicadores se dibujan en el navegador
+# (assets/dashboard_cliente.js) a partir de datos compactos enviados por profesor.
+MODO_CLIENTE = os.environ.get("PROFESORES_CLIENTSIDE") == "1"
+# Compresión gzip/brotli de las respuestas en el propio servidor (desactivar si ya lo hace un proxy)
+COMPRESION = os.environ.get("PROFESORES_COMPRESION", "1") != "0"
+
+# En modo cliente las gráficas se crean dentro del contenido, así que sus ids
+# no existen en el layout inicial. En el modo normal el contenido es un esqueleto
+# fijo (utils.generar_esqueleto) y cada sección tiene su propio callback.
+app = Dash(__name__, external_stylesheets=[dbc.themes.CYBORG,'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.0/css/all.min.css'],
+           suppress_callback_exceptions=MODO_CLIENTE)
 
 server = app.server
+# Latencia y bytes por callback en /metrics (y perfilado opcional con PROFESORES_PERFIL)
+instrumentar(server)
+# Se registra después para que /metrics mida los bytes y el tiempo ya con la compresión
+if COMPRESION:
+    comprimir_respuestas(server)
 app.title = "Análisis de Opiniones de Profesores de la Facultad de Psicología, UNAM"
-URL = "https://raw.githubusercontent.com/Christian-F-Badillo/Profesor_Resume/refs/heads/master/data/professor_data.csv"
-data = pd.read_csv(URL)
+# Facultades con una partición en data/facultades/. Si no hay ninguna se usan los
+# datos de data/ como única facultad (None).
+facultades = listar_facultades()
+FACULTAD_INICIAL = os.environ.get("PROFESORES_FACULTAD") or next(iter(facultades), None)
+# Facultades que se mantienen en memoria a la vez; las demás se cargan al elegirlas
+MAX_FACULTADES = int(os.environ.get("PROFESORES_MAX_FACULTADES", 4))
+# Opciones que se envían por búsqueda
+MAX_OPCIONES = 50
+# Segundos entre revisiones de datos nuevos (0 desactiva la actualización en caliente)
+INTERVALO_REFRESCO = float(os.environ.get("PROFESORES_REFRESCO", 60))
+# Profesores cuyas figuras se construyen con los datos nuevos antes del cambio (0 no las construye)
+MAX_CALENTAR = int(os.environ.get("PROFESORES_CALENTAR", 100))
+
+def _cargar_facultad(facultad: str | None) -> tuple:
+    # Datos (o caché binaria) indexados, índice de búsqueda, dashboards generados con
+    # analysis/prerender_dashboards.py para esos mismos datos (si existen) y agregados
+    # por profesor para la vista de comparación. El índice y los agregados se guardan
+    # junto a la caché binaria, así que con la caché hecha todo se abre con memory-map.
+    if facultad is None:
+        datos = cargar_datos()
+        dashboards = DashboardsPrecalculados.abrir(hash_datos=datos.hash_datos)
+    else:
+        datos = cargar_facultad(facultad)
+        dashboards = DashboardsPrecalculados.abrir(ruta_facultad(facultad), carpeta_facultad(facultad) / "prerender",
+                                                   datos.hash_datos)
+    # Las opciones del selector se buscan en el servidor: el layout no incluye la lista de profesores
+    return datos, IndiceBusqueda.desde_datos(datos), dashboards, TablaAgregados.desde_datos(datos)
+
+cache_facultades = CacheFacultades(_cargar_facultad, MAX_FACULTADES)
+
+def _estadisticas_facultades() -> list[tuple]:
+    estadisticas = cache_facultades.estadisticas()
+    return [
+        ("profesores_facultades_cargadas", "gauge", len(estadisticas["cargadas"]), "Facultades en memoria."),
+        ("profesores_facultades_cargas_total", "counter", estadisticas["cargas"], "Facultades cargadas."),
+        ("profesores_facultades_descartes_total", "counter", estadisticas["descartes"], "Facultades descartadas."),
+    ]
+
+registro.agregar_valores(_estadisticas_facultades)
+
+def _facultad(facultad: str | None) -> tuple:
+    # Datos, índice, dashboards y agregados de la facultad elegida (se cargan la primera vez)
+    if facultades and facultad not in facultades:
+        raise PreventUpdate
+    return cache_facultades.obtener(facultad if facultades else None)
+
+# La facultad inicial se carga al iniciar (antes del fork de gunicorn). Los callbacks
+# usan siempre `_facultad`, así que estos nombres solo tienen los datos del arranque.
+data, indice_busqueda, dashboards, agregados = _facultad(FACULTAD_INICIAL)
+
+def _recientes(anterior: tuple) -> list[str]:
+    return cache_figuras.recientes(anterior[0].version, MAX_CALENTAR) if MAX_CALENTAR > 0 else []
+
+def _calentar(anterior: tuple, nuevo: tuple, figuras: list):
+    # Sin dashboards precalculados para los datos nuevos, se guardan antes del cambio las
+    # figuras de los profesores consultados hace poco: no hay pico de latencia después.
+    # Las construye el proceso aparte de refresco.py, así que aquí no se ocupa el GIL.
+    datos, _, dashboards, _ = nuevo
+    if dashboards is not None:
+        return
+    for tipo, nombre, figura in figuras:
+        cache_figuras.guardar((tipo, nombre, datos.version), figura)
+
+def _descartar_version(anterior: tuple, nuevo: tuple):
+    cache_figuras.invalidar(anterior[0].version)
+
+# Con gunicorn, los mensajes del hilo de actualización van a su log de errores
+_log_gunicorn = logging.getLogger("gunicorn.error")
+if _log_gunicorn.handlers:
+    logging.getLogger("refresco").handlers = _log_gunicorn.handlers
+    logging.getLogger("refresco").setLevel(_log_gunicorn.level)
+
+# Hilo que revisa si hay datos nuevos y los cambia sin reiniciar los workers (ver refresco.py)
+refrescador = Refrescador(
+    cache_facultades, _cargar_facultad,
+    lambda facultad: resolver_ruta() if facultad is None else ruta_facultad(facultad),
+    INTERVALO_REFRESCO, preparar=_calentar, descartar=_descartar_version, recientes=_recientes,
+)
+
+if INTERVALO_REFRESCO > 0:
+    @server.before_request
+    def _iniciar_refresco():
+        # Se inicia con la primera petición de cada proceso: con gunicorn, después del fork
+        refrescador.iniciar()
+
+def _estadisticas_refresco() -> list[tuple]:
+    estadisticas = refrescador.estadisticas()
+    return [
+        ("profesores_datos_cambios_total", "counter", estadisticas["cambios"], "Actualizaciones de datos en caliente."),
+        ("profesores_datos_errores_total", "counter", estadisticas["errores"], "Actualizaciones de datos fallidas."),
+    ]
 
-lista_profesores = sorted(data["profesor"].unique())
+registro.agregar_valores(_estadisticas_refresco)
+
+# La plantilla de las figuras se envía una sola vez con el layout
+almacenes_cliente = [
+    dcc.Store(id="plantilla-graficas", data=pio.templates[PLANTILLA].to_plotly_json()),
+    *([dcc.Store(id="datos-profesor")] if MODO_CLIENTE else []),
+]
+
+if MODO_CLIENTE:
+    contenido_inicial = None
+else:
+    contenido_inicial = [html.Div("Por favor, selecciona un profesor.", id="mensaje-seleccion"), generar_esqueleto()]
 
 app.layout = dbc.Container([
     html.H1(children = "Análisis de Opiniones de Profesores de la Facultad de Psicología, UNAM", className="text-center my-4", style = {'fontSize': 35}),
 
         dbc.Row([
             dbc.Col(
-                html.Div(
+                dbc.Tabs([
+                    dbc.Tab(label="Profesor", tab_id="profesor"),
+                    dbc.Tab(label="Comparar profesores", tab_id="comparar"),
+                ], id="vista", active_tab="profesor"),
+                width=9
+            ),
+            dbc.Col(
+                dcc.Dropdown(
+                    id='selector-facultad',
+                    options=[{"label": nombre, "value": facultad} for facultad, nombre in facultades.items()],
+                    value=FACULTAD_INICIAL,
+                    placeholder="Selecciona una facultad...",
+                    clearable=False,
+                    style={'fontSize': 18, 'width': '100%', **({} if facultades else {'display': 'none'})}
+                ),
+                width=3
+            )
+        ], className="mb-4"),
+
+        html.Div([
+        dbc.Row([
+            dbc.Col(
+                html.Div([
                     dcc.Dropdown(
                         id='selector-profesor',
-                        options=[{"label": nombre, "value": nombre} for nombre in lista_profesores],
-                        placeholder="Selecciona un profesor...",
+                        options=[],
+                        placeholder="Escribe el nombre de un profesor...",
                         searchable=True,
                         className="mb-4",
                         style={'fontSize': 18, 'width': '100%'}
-                    ),
+                    )],
                     style={'textAlign': 'center', 'margin': '0 auto', 'width': '100%'}
                 ),
                 width=3
@@ -37,7 +187,10 @@ app.layout = dbc.Container([
             dbc.Col(html.Div(id='indicador-3'), width=2),
             dbc.Col(html.Div(id='indicador-4'), width=2)
         ], className="mb-4", justify="center"),
-        html.Div(id="contenido-profesor"),
+        html.Div(id="contenido-profesor", children=contenido_inicial),
+        ], id="vista-profesor"),
+        html.Div(generar_comparacion(list(METRICAS)), id="vista-comparar", style={'display': 'none'}),
+        *almacenes_cliente,
         html.Hr(),
         html.Footer([
         html.Div([
@@ -59,90 +212,203 @@ app.layout = dbc.Container([
     fluid=True)
 
 @app.callback(
-   Output("contenido-profesor", "children"),
-    Output("indicador-1", "children"),
-    Output("indicador-2", "children"),
-    Output("indicador-3", "children"),
-    Output("indicador-4", "children"),
-    Input("selector-profesor", "value")
+    Output("selector-profesor", "options"),
+    Input("selector-profesor", "search_value"),
+    Input("selector-profesor", "value"),
+    Input("selector-facultad", "value")
 )
-def update_dashboard(nombre:str) -> tuple:
-    if nombre is None:
-        return html.Div("Por favor, selecciona un profesor."), html.Div(), html.Div(), html.Div(), html.Div()
-    
-
-    indicador1, indicador2, indicador3, indicador4 = show_means(data, nombre)
-    contenido_profesor = dbc.Container(
-            [
-                dbc.Row(
-                    [
-                        generar_resumen(data, nombre)
-                    ],
-                    className="mb-4"
-                ),
-                dbc.Row(
-                    [
-                        html.H5(children=f"Etiquetas", className="text-left mb-4"),
-                        dbc.Col(children=[
-                            html.Div([
-                                get_tags(data, nombre)
-                            ])
-                        ], width=12)
-                    ],
-                    className="mb-4"
-                ),
-                dbc.Row(
-                    [
-                        html.H6(children=f"Número de Estrellas", className="text-left mb-4"),
-                        dbc.Col(children=[
-                        num_estrellas(data, nombre)
-                    ], width=12)
-                    ],
-                    className="mb-4"
-                ),
-                dbc.Row(
-                    [
-                        dbc.Col(children=[
-                            html.Div([
-                                plot_facilidad(data, nombre)
-                            ])
-                            ], width=6),
-                        dbc.Col(children=[
-                            html.Div([
-                                plot_calidad(data, nombre)
-                            ])
-                        ], width=6)
-                    ]
-                ),
-                dbc.Row(
-                    [
-                        dbc.Col(children=[
-                            html.Div([
-                                plot_tendencias(data, nombre)
-                            ])
-                        ], width=12)
-                    ]
-                ),
-                html.Div(
-                [
-                    html.Span("Opiniones de alumnos extraídas de: ", style={"fontWeight": "bold"}),
-                    html.A(get_link(data, nombre),
-                        href=get_link(data, nombre),  # Reemplaza con tu URL
-                        target="_blank",
-                        style={"color": "#1E90FF", "textDecoration": "none"})
-                ],
-                style={
-                    "textAlign": "center",
-                    "marginTop": "30px",
-                    "fontSize": "16px",
-                    "color": "white"  # O ajusta según tu tema
-                }
-            )
-            ]
+@medir('update_opciones')
+def update_opciones(busqueda: str, nombre: str, facultad: str) -> list[dict]:
+    if ctx.triggered_id == "selector-facultad":
+        return []
+    if not busqueda:
+        # Sin búsqueda el selector debe conservar la opción elegida (si no, la borra)
+        return [{"label": nombre, "value": nombre}] if nombre else []
+    _, indice, _, _ = _facultad(facultad)
+    # `search` hace que el filtro del navegador acepte las coincidencias sin acentos o aproximadas
+    return [{"label": opcion, "value": opcion, "search": busqueda}
+            for opcion in indice.buscar(busqueda, MAX_OPCIONES)]
+
+@app.callback(
+    Output("selector-profesor", "value"),
+    Input("selector-facultad", "value"),
+    prevent_initial_call=True
+)
+def update_facultad(facultad: str) -> None:
+    # Los profesores son de una sola facultad: al cambiarla se borra la selección
+    return None
+
+app.clientside_callback(
+    ClientsideFunction(namespace="profesores", function_name="vista"),
+    Output("vista-profesor", "style"),
+    Output("vista-comparar", "style"),
+    Input("vista", "active_tab")
+)
+
+@app.callback(
+    Output("comparar-etiquetas", "options"),
+    Output("comparar-etiquetas", "value"),
+    Input("selector-facultad", "value")
+)
+@medir('update_etiquetas')
+def update_etiquetas(facultad: str) -> tuple:
+    # Las etiquetas (y cuántos profesores tienen cada una) dependen de la facultad
+    _, _, _, agregados = _facultad(facultad)
+    return opciones_etiquetas(agregados), []
+
+@app.callback(
+    Output("tabla-ranking", "data"),
+    Output("tabla-ranking", "columns"),
+    Output("grafica-distribucion", "figure"),
+    Output("comparar-resumen", "children"),
+    Input("comparar-metrica", "value"),
+    Input("comparar-minimo", "value"),
+    Input("comparar-etiquetas", "value"),
+    Input("comparar-orden", "value"),
+    Input("comparar-k", "value"),
+    State("selector-facultad", "value")
+)
+@medir('update_comparacion')
+def update_comparacion(metrica: str, minimo: int, etiquetas: list, orden: str, k: int, facultad: str) -> tuple:
+    # Todo sale de la tabla de agregados calculada al cargar: sin parsear ni recorrer filas
+    _, _, _, agregados = _facultad(facultad)
+    if metrica not in agregados.metricas:
+        return [], no_update, no_update, "Esta métrica no está disponible para estos datos."
+
+    mascara = agregados.filtrar(metrica, int(minimo or 0), etiquetas)
+    posiciones = agregados.ranking(metrica, mascara, orden != "peores", int(k or 10))
+    figura = figura_distribucion(agregados, metrica, mascara)
+    parche = Patch()
+    parche['data'] = figura['data']
+    for clave, valor in figura['layout'].items():
+        parche['layout'][clave] = valor
+    resumen = f"{int(mascara.sum())} de {len(agregados)} profesores cumplen los filtros."
+    return filas_ranking(agregados, posiciones, metrica), columnas_ranking(metrica), parche, resumen
+
+app.clientside_callback(
+    ClientsideFunction(namespace="profesores", function_name="figuraVacia"),
+    Output("grafica-distribucion", "figure", allow_duplicate=True),
+    Input("plantilla-graficas", "data"),
+    prevent_initial_call='initial_duplicate'
+)
+
+if MODO_CLIENTE:
+    @app.callback(
+        Output("contenido-profesor", "children"),
+        Output("datos-profesor", "data"),
+        Input("selector-profesor", "value"),
+        State("selector-facultad", "value")
+    )
+    @medir('update_dashboard')
+    def update_dashboard(nombre:str, facultad:str) -> tuple:
+        if nombre is None:
+            return html.Div("Por favor, selecciona un profesor."), None
+
+        datos, _, _, _ = _facultad(facultad)
+        return generar_dashboard_cliente(datos, nombre)
+
+    app.clientside_callback(
+        ClientsideFunction(namespace="profesores", function_name="graficas"),
+        Output("grafica-facilidad", "figure"),
+        Output("grafica-calidad", "figure"),
+        Output("grafica-tendencias", "figure"),
+        Input("datos-profesor", "data"),
+        State("plantilla-graficas", "data")
+    )
+    app.clientside_callback(
+        ClientsideFunction(namespace="profesores", function_name="indicadores"),
+        Output("indicador-1", "children"),
+        Output("indicador-2", "children"),
+        Output("indicador-3", "children"),
+        Output("indicador-4", "children"),
+        Input("datos-profesor", "data")
+    )
+else:
+    OCULTO = {"display": "none"}
+
+    def _seccion(facultad: str, nombre: str, seccion: str):
+        # Salidas precalculadas (analysis/prerender_dashboards.py) o renderizadas en vivo
+        datos, _, dashboards, _ = _facultad(facultad)
+        if dashboards is not None:
+            secciones = dashboards.obtener(nombre)
+            if secciones is not None:
+                return secciones[seccion]
+        if seccion == 'indicadores':
+            return list(show_means(datos, nombre))
+        if seccion == 'textos':
+            return list(generar_textos(datos, nombre))
+        return figura_seccion(datos, nombre, seccion)
+
+    # Los indicadores son la sección más ligera: llegan primero y muestran el esqueleto
+    @app.callback(
+        Output("indicador-1", "children"),
+        Output("indicador-2", "children"),
+        Output("indicador-3", "children"),
+        Output("indicador-4", "children"),
+        Output("mensaje-seleccion", "children"),
+        Output("secciones-profesor", "style"),
+        Input("selector-profesor", "value"),
+        State("selector-facultad", "value")
+    )
+    @medir('update_indicadores')
+    def update_indicadores(nombre:str, facultad:str) -> tuple:
+        if nombre is None:
+            return html.Div(), html.Div(), html.Div(), html.Div(), "Por favor, selecciona un profesor.", OCULTO
+
+        return *_seccion(facultad, nombre, 'indicadores'), None, {}
+
+    @app.callback(
+        Output("seccion-resumen", "children"),
+        Output("seccion-etiquetas", "children"),
+        Output("seccion-estrellas", "children"),
+        Output("seccion-enlace", "children"),
+        Input("selector-profesor", "value"),
+        State("selector-facultad", "value")
+    )
+    @medir('update_textos')
+    def update_textos(nombre:str, facultad:str) -> tuple:
+        if nombre is None:
+            raise PreventUpdate
+
+        return tuple(_seccion(facultad, nombre, 'textos'))
+
+    def _registrar_grafica(tipo: str):
+        # La figura se actualiza con un Patch: solo viajan data y layout, la plantilla
+        # se pone una vez en el navegador (profesores.plantilla).
+        @app.callback(
+            Output(f"grafica-{tipo}", "figure"),
+            Output(f"grafica-{tipo}", "style"),
+            Output(f"mensaje-{tipo}", "children"),
+            Input("selector-profesor", "value"),
+            State("selector-facultad", "value"),
         )
-    return contenido_profesor, indicador1, indicador2, indicador3, indicador4
+        @medir(f'update_grafica_{tipo}')
+        def update_grafica(nombre:str, facultad:str) -> tuple:
+            if nombre is None:
+                raise PreventUpdate
+
+            figura = _seccion(facultad, nombre, tipo)
+            if not (isinstance(figura, dict) and 'data' in figura):
+                # Mensaje de falta de datos
+                return no_update, OCULTO, figura
+            parche = Patch()
+            parche['data'] = figura['data']
+            for clave, valor in figura['layout'].items():
+                parche['layout'][clave] = valor
+            return parche, {}, None
+
+    for tipo in GRAFICAS:
+        _registrar_grafica(tipo)
+
+    app.clientside_callback(
+        ClientsideFunction(namespace="profesores", function_name="plantilla"),
+        *(Output(f"grafica-{tipo}", "figure", allow_duplicate=True) for tipo in GRAFICAS),
+        Input("plantilla-graficas", "data"),
+        prevent_initial_call='initial_duplicate'
+    )
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     app.run(debug = True)
 
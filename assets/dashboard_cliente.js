@@ -0,0 +1,131 @@
+// Gráficas e indicadores del modo cliente (PROFESORES_CLIENTSIDE=1).
+// Reproducen las figuras de plot_facilidad, plot_calidad, plot_tendencias y
+// show_means en utils.py a partir de los datos compactos de `datos_cliente`.
+
+// Los floats de Python se muestran con al menos un decimal ("10.0")
+function numeroPython(valor) {
+    return Number.isInteger(valor) ? valor.toFixed(1) : String(valor);
+}
+
+function histograma(datos, etiqueta, titulo, plantilla) {
+    return {
+        data: [{
+            type: 'bar',
+            x: datos.valores,
+            y: datos.frecuencias,
+            text: datos.frecuencias,
+            textposition: 'auto',
+            hovertext: datos.valores.map(
+                (valor, i) => `${etiqueta}: ${numeroPython(valor)}, Frecuencia: ${datos.frecuencias[i]}`
+            ),
+            hoverinfo: 'text',
+            marker: {line: {width: 0}},
+            orientation: 'v'
+        }],
+        layout: {
+            template: plantilla,
+            title: {text: titulo},
+            xaxis: {
+                title: {text: etiqueta},
+                tickvals: Array.from(new Set(datos.valores)),
+                showgrid: false,
+                ticks: 'outside'
+            },
+            yaxis: {title: {text: 'Frecuencia'}},
+            bargap: 0.2,
+            plot_bgcolor: 'black',
+            paper_bgcolor: 'black',
+            barcornerradius: 30
+        }
+    };
+}
+
+function tendencias(semestres, plantilla) {
+    // Misma figura que _figura_tendencias: los semestres ya vienen agrupados por
+    // _reducir_semestres y la etiqueta del valor va en la misma traza que el punto
+    const sizeref = 2 * Math.max(...semestres.n) / (40 ** 2);
+    return {
+        data: ['facilidad', 'calidad'].map(columna => ({
+            type: 'scatter',
+            x: semestres.fechas,
+            y: semestres[columna],
+            name: columna,
+            mode: 'lines+markers+text',
+            texttemplate: '%{y:.1f}',
+            textposition: 'top center',
+            line: {width: 4},
+            marker: {size: semestres.n, sizemode: 'area', sizeref: sizeref, sizemin: 6},
+            hovertemplate: '%{y:.2f}<br>Semestre: %{x|%Y-%m}<br>N: %{customdata}',
+            customdata: semestres.n
+        })),
+        layout: {
+            template: plantilla,
+            title: {text: 'Promedio por semestre'},
+            xaxis: {
+                title: {text: 'Semestre'},
+                tickvals: semestres.fechas,
+                ticktext: semestres.etiquetas,
+                tickangle: 45
+            },
+            yaxis: {
+                title: {text: 'Calificación promedio'},
+                gridcolor: 'LightGray',
+                ticks: 'outside'
+            },
+            legend: {
+                title: {text: 'Calificaciones'},
+                orientation: 'h',
+                yanchor: 'bottom',
+                y: 1.02,
+                xanchor: 'right',
+                x: 1
+            }
+        }
+    };
+}
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    profesores: {
+        graficas: function (datos, plantilla) {
+            if (!datos) {
+                return [window.dash_clientside.no_update, window.dash_clientside.no_update, window.dash_clientside.no_update];
+            }
+            return [
+                histograma(datos.facilidad, 'Facilidad', `Facilidad del docente ${datos.nombre}`, plantilla),
+                histograma(datos.calidad, 'Calidad', `Calidad del docente ${datos.nombre}`, plantilla),
+                tendencias(datos.semestres, plantilla)
+            ];
+        },
+        plantilla: function (plantilla) {
+            // Figuras vacías con la plantilla; el servidor solo envía data y layout (Patch)
+            const figura = () => ({data: [], layout: {template: plantilla}});
+            return [figura(), figura(), figura()];
+        },
+        figuraVacia: function (plantilla) {
+            // Igual que `plantilla`, para una sola gráfica
+            return {data: [], layout: {template: plantilla}};
+        },
+        vista: function (pestana) {
+            // Muestra la vista de la pestaña elegida y oculta la otra
+            const oculto = {display: 'none'};
+            return pestana === 'comparar' ? [oculto, {}] : [{}, oculto];
+        },
+        indicadores: function (datos) {
+            if (!datos) {
+                return ['', '', '', ''];
+            }
+            return datos.indicadores.map(indicador => ({
+                namespace: 'dash_daq',
+                type: 'LEDDisplay',
+                props: {
+                    label: indicador.label,
+                    value: indicador.value,
+                    color: indicador.color,
+                    backgroundColor: '#000000',
+                    style: {marginBottom: '15px'},
+                    labelPosition: 'bottom'
+                }
+            }));
+        }
+    }
+});
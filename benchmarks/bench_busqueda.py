@@ -0,0 +1,49 @@
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from busqueda import IndiceBusqueda
+from datos import cargar_datos
+from sintetico import generar_datos
+
+TAMANOS = [None, 10_000, 50_000]
+CONSULTAS = ["gonzalez", "Gonz", "gonzales", "maria lopez", "abrgo", "x", "hernandez martinez ana"]
+REPETICIONES = 200
+
+def main():
+    nombres_reales = cargar_datos().nombres
+
+    # Antes: todas las opciones del selector iban en el layout inicial
+    import app
+    layout = app.server.test_client().get("/_dash-layout").get_data()
+    print(f"Layout inicial: {len(layout) / 1024:.1f} KB (sin la lista de {len(nombres_reales)} profesores)\n")
+
+    print(f"{'profesores':>10} {'opciones en layout (KB)':>24} {'índice (ms)':>12} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+    for n in TAMANOS:
+        if n is None:
+            nombres = nombres_reales
+        else:
+            # Nombres sintéticos con el sufijo quitado para que se repitan palabras como en los reales
+            nombres = sorted({nombre.split(" #")[0] + f" {i}" for i, nombre in enumerate(generar_datos(n)['profesor'])})
+        opciones = len(json.dumps([{"label": nombre, "value": nombre} for nombre in nombres]).encode())
+
+        inicio = time.perf_counter()
+        indice = IndiceBusqueda(nombres)
+        ms_indice = (time.perf_counter() - inicio) * 1000
+
+        tiempos = []
+        for _ in range(REPETICIONES // len(CONSULTAS) + 1):
+            for consulta in CONSULTAS:
+                inicio = time.perf_counter()
+                indice.buscar(consulta, app.MAX_OPCIONES)
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+        p50, p99 = np.percentile(tiempos, [50, 99])
+        print(f"{len(nombres):>10} {opciones / 1024:>24.1f} {ms_indice:>12.1f} {p50:>9.2f} {p99:>9.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from datos import cargar_datos
+from utils import plot_facilidad, plot_calidad, plot_tendencias, cache_figuras
+
+GRAFICAS = [plot_facilidad, plot_calidad, plot_tendencias]
+
+def medir(datos, nombres) -> float:
+    tiempos = []
+    for nombre in nombres:
+        inicio = time.perf_counter()
+        for grafica in GRAFICAS:
+            grafica(datos, nombre)
+        tiempos.append(time.perf_counter() - inicio)
+    return float(np.median(tiempos)) * 1000
+
+def main():
+    datos = cargar_datos()
+    nombres = datos.nombres[::10]
+
+    cache_figuras.limpiar()
+    fria = medir(datos, nombres)
+    caliente = medir(datos, nombres)
+    print(f"Tres gráficas por profesor (mediana): fría {fria:.2f} ms, caliente {caliente:.2f} ms")
+    print(cache_figuras.estadisticas())
+
+if __name__ == "__main__":
+    main()
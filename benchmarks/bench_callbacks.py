@@ -0,0 +1,74 @@
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+# Sin dashboards precalculados: se mide el renderizado en vivo
+os.environ["PROFESORES_PRERENDER"] = str(BASE_DIR / "data" / "sin_prerender")
+
+from plotly.io.json import to_json_plotly
+import app as aplicacion
+from carga_http import peticiones_profesor
+from utils import cache_figuras, generar_dashboard
+
+N_PROFESORES = 60
+
+def _monolitico(nombre: str) -> tuple[float, int]:
+    # Diseño anterior: un solo callback con el contenido completo y los indicadores
+    inicio = time.perf_counter()
+    cuerpo = to_json_plotly(list(generar_dashboard(aplicacion.data, nombre))).encode()
+    return time.perf_counter() - inicio, len(cuerpo)
+
+def _separado(pool: ThreadPoolExecutor, dependencias: list[dict], nombre: str) -> dict:
+    # Diseño actual: las peticiones de cada sección se lanzan a la vez, como el navegador
+    def enviar(peticion):
+        cliente = aplicacion.server.test_client()
+        respuesta = cliente.post("/_dash-update-component", json=peticion)
+        return peticion["output"], time.perf_counter(), len(respuesta.data)
+
+    inicio = time.perf_counter()
+    resultados = list(pool.map(enviar, peticiones_profesor(dependencias, nombre)))
+    return {
+        salida.split("...")[0].strip("."): (fin - inicio, bytes_)
+        for salida, fin, bytes_ in resultados
+    }
+
+def main():
+    nombres = aplicacion.lista_profesores[:N_PROFESORES]
+    dependencias = json.loads(aplicacion.server.test_client().get("/_dash-dependencies").data)
+
+    monolitico = []
+    for nombre in nombres:
+        cache_figuras.limpiar()
+        monolitico.append(_monolitico(nombre))
+
+    separado = []
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        for nombre in nombres:
+            cache_figuras.limpiar()
+            separado.append(_separado(pool, dependencias, nombre))
+
+    tiempos, tamanos = np.array(monolitico).T
+    print(f"Un callback: {np.median(tamanos) / 1024:.1f} KB, primera pintura = respuesta completa "
+          f"{np.median(tiempos) * 1000:.1f} ms (mediana de {len(nombres)} profesores)")
+
+    secciones = separado[0].keys()
+    total = np.median([sum(b for _, b in s.values()) for s in separado])
+    ultimo = np.median([max(t for t, _ in s.values()) for s in separado])
+    print(f"Callbacks por sección: {total / 1024:.1f} KB en total, última respuesta {ultimo * 1000:.1f} ms")
+    for seccion in secciones:
+        t = np.median([s[seccion][0] for s in separado])
+        b = np.median([s[seccion][1] for s in separado])
+        print(f"  {seccion:<30} {b / 1024:6.1f} KB  llega a los {t * 1000:6.1f} ms")
+    print(f"Plantilla de las figuras (una vez en el layout): "
+          f"{len(to_json_plotly(aplicacion.pio.templates[aplicacion.PLANTILLA].to_plotly_json())) / 1024:.1f} KB")
+
+if __name__ == "__main__":
+    main()
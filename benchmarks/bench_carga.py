@@ -0,0 +1,46 @@
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from datos import DatosProfesores, cargar_datos, DATA_PATH, URL
+from sintetico import generar_datos
+
+TAMANOS = [None, 20_000, 100_000]
+
+def cronometrar(funcion) -> float:
+    inicio = time.perf_counter()
+    funcion()
+    return (time.perf_counter() - inicio) * 1000
+
+def main():
+    # Arranque anterior: descarga desde GitHub en cada worker
+    try:
+        ms_url = cronometrar(lambda: DatosProfesores(pd.read_csv(URL)))
+        print(f"GitHub (709 profesores): {ms_url:.1f} ms")
+    except Exception as e:
+        print(f"GitHub no disponible ({type(e).__name__}), se omite")
+
+    print(f"{'profesores':>10} {'CSV local (ms)':>15} {'caché fría (ms)':>16} {'caché caliente (ms)':>20}")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for n in TAMANOS:
+            if n is None:
+                ruta = DATA_PATH
+                n = len(pd.read_csv(ruta))
+            else:
+                ruta = tmp / f"sintetico_{n}.csv"
+                generar_datos(n).to_csv(ruta, index=False)
+
+            cache = tmp / f"cache_{n}"
+            ms_csv = cronometrar(lambda: DatosProfesores(pd.read_csv(ruta)))
+            ms_fria = cronometrar(lambda: cargar_datos(ruta, cache))
+            ms_caliente = cronometrar(lambda: cargar_datos(ruta, cache))
+            print(f"{n:>10} {ms_csv:>15.1f} {ms_fria:>16.1f} {ms_caliente:>20.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+BASE_DIR = BENCH_DIR.parent
+
+# Cada modo se mide en un proceso nuevo porque se elige al importar app.py
+MEDICION = """
+import json, sys, time
+sys.path.insert(0, {bench!r})
+import app
+from carga_http import peticiones_profesor
+cliente = app.server.test_client()
+dependencias = cliente.get("/_dash-dependencies").get_json()
+layout = len(cliente.get("/_dash-layout").data)
+nombres = app.data.nombres[::10]
+total, inicio = 0, time.perf_counter()
+for nombre in nombres:
+    for peticion in peticiones_profesor(dependencias, nombre):
+        total += len(cliente.post("/_dash-update-component", json=peticion).data)
+ms = (time.perf_counter() - inicio) / len(nombres) * 1000
+print(json.dumps({{"layout": layout, "bytes": total / len(nombres), "ms": ms}}))
+"""
+
+def medir(cliente: bool) -> dict:
+    env = {**os.environ, "PROFESORES_CLIENTSIDE": "1" if cliente else "0", "PROFESORES_PRERENDER": str(BENCH_DIR / "sin_prerender")}
+    salida = subprocess.run(
+        [sys.executable, "-c", MEDICION.format(bench=str(BENCH_DIR))],
+        cwd=BASE_DIR, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(salida.strip().splitlines()[-1])
+
+def main():
+    print(f"{'modo':>10} {'layout inicial (KB)':>20} {'respuesta por profesor (KB)':>28} {'CPU servidor (ms)':>18}")
+    for modo, cliente in [("servidor", False), ("cliente", True)]:
+        r = medir(cliente)
+        print(f"{modo:>10} {r['layout'] / 1024:>20.1f} {r['bytes'] / 1024:>28.1f} {r['ms']:>18.1f}")
+
+if __name__ == "__main__":
+    main()
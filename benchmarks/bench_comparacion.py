@@ -0,0 +1,74 @@
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from comparacion import TablaAgregados
+from datos import DATA_PATH, DatosProfesores
+from sintetico import generar_datos
+from utils import figura_distribucion, filas_ranking
+
+TAMANOS = [None, 10_000, 100_000]
+REPETICIONES = 200
+# (métrica, mínimo de reseñas, etiquetas, mejores, k)
+CONSULTAS = [
+    ('calidad', 5, [], True, 10),
+    ('facilidad', 0, [], False, 25),
+    ('calidad', 10, ['CLASES EXCELENTES'], True, 50),
+    ('rating', 3, ['CALIFICA DURO', 'MUCHAS TAREAS'], True, 10),
+    ('promedio', 20, [], False, 10),
+]
+
+def _ingenuo(df: pd.DataFrame, metrica: str, minimo: int, k: int) -> list[str]:
+    # Lo que haría cada petición sin agregados: separar el texto de todas las filas
+    valores = df[metrica].astype(str).str.split(',').map(lambda partes: [float(p) for p in partes])
+    medias = valores.map(np.mean)
+    validos = valores.map(len) >= minimo
+    return df.loc[validos].assign(media=medias[validos]).nlargest(k, 'media')['profesor'].tolist()
+
+def _percentiles(funcion) -> tuple[float, float]:
+    tiempos = []
+    for _ in range(REPETICIONES // len(CONSULTAS)):
+        for consulta in CONSULTAS:
+            inicio = time.perf_counter()
+            funcion(*consulta)
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+    return tuple(np.percentile(tiempos, [50, 99]))
+
+def main():
+    base = pd.read_csv(DATA_PATH)
+    print(f"{'profesores':>10} {'agregados (ms)':>15} {'ranking p50/p99 (ms)':>21} "
+          f"{'respuesta p50/p99 (ms)':>23} {'sin agregados (ms)':>19}")
+    for n in TAMANOS:
+        df = base if n is None else generar_datos(n, base)
+        datos = DatosProfesores(df)
+        inicio = time.perf_counter()
+        agregados = TablaAgregados(datos)
+        ms_agregados = (time.perf_counter() - inicio) * 1000
+
+        def ranking(metrica, minimo, etiquetas, mejores, k):
+            mascara = agregados.filtrar(metrica, minimo, etiquetas)
+            return agregados.ranking(metrica, mascara, mejores, k), mascara
+
+        def respuesta(metrica, minimo, etiquetas, mejores, k):
+            # Lo mismo que app.update_comparacion, incluida la serialización a JSON
+            posiciones, mascara = ranking(metrica, minimo, etiquetas, mejores, k)
+            filas = filas_ranking(agregados, posiciones, metrica)
+            figura = figura_distribucion(agregados, metrica, mascara)
+            return json.dumps({"filas": filas, "figura": figura})
+
+        r50, r99 = _percentiles(ranking)
+        p50, p99 = _percentiles(respuesta)
+        inicio = time.perf_counter()
+        _ingenuo(df, 'calidad_general', 5, 10)
+        ms_ingenuo = (time.perf_counter() - inicio) * 1000
+        print(f"{len(df):>10} {ms_agregados:>15.1f} {f'{r50:.3f}/{r99:.3f}':>21} "
+              f"{f'{p50:.2f}/{p99:.2f}':>23} {ms_ingenuo:>19.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+BASE_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import pandas as pd
+
+from datos import DatosProfesores, escribir_dataset, leer_dataset
+from sintetico import generar_datos
+
+TAMANOS = [None, 20_000, 100_000]
+REPETICIONES = 3
+
+def _rss_mb() -> float:
+    # Pico de memoria residente del proceso según /proc (ru_maxrss se hereda del padre)
+    for linea in Path("/proc/self/status").read_text().splitlines():
+        if linea.startswith("VmHWM:"):
+            return int(linea.split()[1]) / 1024
+    return 0.0
+
+def medir_carga(formato: str, ruta: str):
+    # Se ejecuta en un proceso nuevo para que el pico de memoria sea solo el de esta carga
+    if formato == "parquet":
+        import pyarrow.parquet  # noqa: F401  (la importación no cuenta como carga)
+    base = _rss_mb()
+    inicio = time.perf_counter()
+    if formato == "csv":
+        DatosProfesores(pd.read_csv(ruta))
+    else:
+        leer_dataset(ruta)
+    ms = (time.perf_counter() - inicio) * 1000
+    print(json.dumps({"ms": ms, "mb": _rss_mb() - base}))
+
+def _medir(formato: str, ruta: Path) -> dict:
+    resultados = []
+    for _ in range(REPETICIONES):
+        salida = subprocess.run([sys.executable, __file__, "--medir", formato, str(ruta)],
+                                capture_output=True, text=True, check=True).stdout
+        resultados.append(json.loads(salida.splitlines()[-1]))
+    return {"ms": min(r["ms"] for r in resultados), "mb": min(r["mb"] for r in resultados)}
+
+def _tamano_mb(ruta: Path) -> float:
+    archivos = ruta.glob("*.parquet") if ruta.is_dir() else [ruta]
+    return sum(archivo.stat().st_size for archivo in archivos) / 2**20
+
+def main():
+    base = pd.read_csv(BASE_DIR / "data" / "professor_data.csv")
+    print(f"{'profesores':>10} {'formato':>8} {'archivo (MB)':>13} {'carga (ms)':>11} {'pico (MB)':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for n in TAMANOS:
+            df = base if n is None else generar_datos(n, base)
+            csv = tmp / f"profesores_{len(df)}.csv"
+            df.to_csv(csv, index=False)
+            dataset = escribir_dataset(DatosProfesores(df), tmp / f"profesores_{len(df)}")
+
+            for formato, ruta in (("csv", csv), ("parquet", dataset)):
+                resultado = _medir(formato, ruta)
+                print(f"{len(df):>10} {formato:>8} {_tamano_mb(ruta):>13.2f} "
+                      f"{resultado['ms']:>11.1f} {resultado['mb']:>10.1f}")
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--medir":
+        medir_carga(sys.argv[2], sys.argv[3])
+    else:
+        main()
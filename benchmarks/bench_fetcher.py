@@ -0,0 +1,82 @@
+import asyncio
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR / "scrap"))
+
+from cliente_http import extraer_pagina
+from get_stats import limpiar_stats, main as extraer
+from sitio_local import generar_sitio, servir
+
+N_PROFESORES = 40
+TRABAJADORES = 8
+
+def _comparar(directorio: Path, tabla) -> int:
+    # Lee las páginas guardadas con el parser y las compara con las reseñas generadas
+    distintos = 0
+    for pagina in tabla["pagina"]:
+        verdad = json.loads((directorio / pagina).with_suffix(".json").read_text(encoding="utf-8"))
+        archivos = [directorio / pagina] + sorted((directorio / pagina).parent.glob(Path(pagina).stem + "-p*.html"),
+                                                  key=lambda p: int(p.stem.rsplit("-p", 1)[1]))
+        extraido = {"comments": [], "dates": [], "stats": [], "tags": []}
+        for archivo in archivos:
+            contenido = extraer_pagina(archivo.read_text(encoding="utf-8"))
+            for campo in extraido:
+                extraido[campo].extend(contenido[campo])
+        stats = limpiar_stats(extraido["stats"])
+        distintos += not (
+            extraido["comments"] == [r["comentario"] for r in verdad]
+            and extraido["dates"] == [r["fecha"] for r in verdad]
+            and stats["calidad_general"] == [r["calidad"] for r in verdad]
+            and stats["facilidad"] == [r["facilidad"] for r in verdad]
+            and extraido["tags"] == [t for r in verdad for t in r["tags"]]
+        )
+    return distintos
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        sitio = tmp / "sitio"
+        tabla = generar_sitio(sitio, N_PROFESORES, renderizado="servidor")
+        paginas = sorted((sitio / "profesores").glob("*.html"))
+
+        print(f"Profesores con reseñas distintas a las generadas: {_comparar(sitio, tabla)} de {N_PROFESORES}")
+
+        contenidos = [p.read_text(encoding="utf-8") for p in paginas]
+        inicio = time.perf_counter()
+        for contenido in contenidos:
+            extraer_pagina(contenido)
+        duracion = time.perf_counter() - inicio
+
+        tracemalloc.start()
+        for contenido in contenidos:
+            extraer_pagina(contenido)
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"Parser: {len(paginas) / duracion:.0f} páginas/s, pico de memoria {pico / 2**20:.2f} MB")
+
+        try:
+            import httpx  # noqa: F401
+        except ImportError:
+            print("httpx no está instalado; se omite la extracción por HTTP.")
+            return
+
+        servidor, url = servir(sitio, latencia=0.05)
+        entrada = tmp / "profesores.csv"
+        tabla.assign(enlace=url + "/" + tabla["pagina"]).to_csv(entrada, index=False)
+        (tmp / "tags").mkdir()
+        (tmp / "reviews").mkdir()
+        inicio = time.perf_counter()
+        completados = asyncio.run(extraer(entrada, TRABAJADORES, None, tmp / "tags", tmp / "reviews",
+                                          manifiesto_path=tmp / "manifiesto.json", fetcher="http"))
+        print(f"HTTP: {len(completados) / (time.perf_counter() - inicio):.1f} profesores/s "
+              f"con {TRABAJADORES} conexiones")
+        servidor.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+
+BENCH_DIR = Path(__file__).resolve().parent
+BASE_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from datos import DATA_PATH
+
+# Cada árbol (el actual o el de otro commit) se mide en un proceso nuevo con los mismos datos
+MEDICION = """
+import gzip, json, sys, time
+sys.path.insert(0, {bench!r})
+import app
+from carga_http import peticiones_profesor
+try:
+    import brotli
+except ImportError:
+    brotli = None
+cliente = app.server.test_client()
+dependencias = cliente.get("/_dash-dependencies").get_json()
+resultados = []
+for nombre in app.data.nombres[::{paso}]:
+    profesor = {{"crudo": 0, "gzip": 0, "br": 0, "ms": 0.0, "secciones": {{}}}}
+    for peticion in peticiones_profesor(dependencias, nombre):
+        inicio = time.perf_counter()
+        cuerpo = cliente.post("/_dash-update-component", json=peticion).data
+        profesor["ms"] += (time.perf_counter() - inicio) * 1000
+        seccion = peticion["output"].strip(".").split(".")[0]
+        profesor["secciones"][seccion] = len(cuerpo)
+        profesor["crudo"] += len(cuerpo)
+        profesor["gzip"] += len(gzip.compress(cuerpo, 6))
+        profesor["br"] += len(brotli.compress(cuerpo, quality=5)) if brotli else 0
+    resultados.append(profesor)
+print(json.dumps(resultados))
+"""
+PASO = 5  # uno de cada PASO profesores
+
+
+def medir(arbol: Path, tmp: Path) -> list[dict]:
+    # Sin dashboards precalculados ni compresión en el servidor: se miden los cuerpos en vivo
+    env = {
+        **os.environ,
+        "PROFESORES_DATA": str(DATA_PATH),
+        "PROFESORES_CACHE": str(tmp / f"cache_{arbol.name}"),
+        "PROFESORES_PRERENDER": str(tmp / "sin_prerender"),
+        "PROFESORES_FACULTADES": str(tmp / "sin_facultades"),
+        "PROFESORES_COMPRESION": "0",
+    }
+    salida = subprocess.run(
+        [sys.executable, "-c", MEDICION.format(bench=str(BENCH_DIR), paso=PASO)],
+        cwd=arbol, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(salida.strip().splitlines()[-1])
+
+
+def extraer(ref: str, destino: Path) -> Path:
+    # Copia del árbol de un commit (sin los datos, que se toman del árbol actual)
+    archivo = subprocess.run(["git", "archive", ref], cwd=BASE_DIR, capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=BytesIO(archivo)) as tar:
+        tar.extractall(destino, filter="data")
+    return destino
+
+
+def imprimir(nombre: str, resultados: list[dict]):
+    def kb(clave):
+        valores = np.array([r[clave] for r in resultados]) / 1024
+        return f"{np.median(valores):.1f} / {valores.max():.1f}"
+
+    br = kb("br") if resultados[0]["br"] else "sin brotli"
+    ms = np.median([r["ms"] for r in resultados])
+    print(f"{nombre:>10} {kb('crudo'):>18} {kb('gzip'):>18} {br:>18} {ms:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes por profesor de las respuestas de Dash.")
+    parser.add_argument("--base", help="Commit con el que comparar (p. ej. el anterior a las figuras compactas).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        arboles = {"actual": BASE_DIR}
+        if args.base:
+            arboles = {args.base: extraer(args.base, tmp / "base"), **arboles}
+        mediciones = {nombre: medir(arbol, tmp) for nombre, arbol in arboles.items()}
+
+    print(f"Respuestas de un profesor, KB (mediana / máximo de {len(mediciones['actual'])} profesores)")
+    print(f"{'árbol':>10} {'sin comprimir':>18} {'gzip':>18} {'brotli':>18} {'CPU (ms)':>10}")
+    for nombre, resultados in mediciones.items():
+        imprimir(nombre, resultados)
+
+    print("\nPor sección, sin comprimir (mediana, bytes)")
+    for nombre, resultados in mediciones.items():
+        secciones = {s: np.median([r["secciones"][s] for r in resultados]) for s in resultados[0]["secciones"]}
+        print(f"  {nombre}: " + ", ".join(f"{s} {b:.0f}" for s, b in secciones.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from datos import ColumnaPuntajes, DatosProfesores
+from sintetico import generar_datos
+from utils import _figura_facilidad
+
+TAMANOS = [709, 5_000, 20_000, 100_000]
+
+def frecuencias_pandas(valores: np.ndarray) -> pd.DataFrame:
+    # Lo que hacían plot_facilidad y plot_calidad por solicitud
+    frecuencias = pd.DataFrame({'valor': valores}).astype("category")
+    frecuencias = frecuencias['valor'].value_counts().reset_index()
+    frecuencias.columns = ['valor', 'frecuencia']
+    return frecuencias
+
+def por_profesor(funcion, nombres) -> float:
+    inicio = time.perf_counter()
+    for nombre in nombres:
+        funcion(nombre)
+    return (time.perf_counter() - inicio) / len(nombres) * 1e6
+
+def main():
+    print(f"{'profesores':>10} {'matriz (ms)':>12} {'value_counts (µs)':>18} {'fila (µs)':>10} {'figura (ms)':>12}")
+    for n in TAMANOS:
+        datos = DatosProfesores(generar_datos(n))
+        inicio = time.perf_counter()
+        for columna in ('facilidad', 'calidad_general'):
+            ColumnaPuntajes.desde_valores(datos.reseñas[columna], datos.offsets)
+        matriz = (time.perf_counter() - inicio) * 1000
+
+        nombres = datos.nombres[::max(1, n // 200)]
+        pandas = por_profesor(lambda nombre: frecuencias_pandas(datos.valores(nombre, 'facilidad')), nombres)
+        fila = por_profesor(lambda nombre: datos.histograma(nombre, 'facilidad'), nombres)
+        figura = por_profesor(lambda nombre: _figura_facilidad(datos, nombre), nombres) / 1000
+        print(f"{n:>10} {matriz:>12.1f} {pandas:>18.1f} {fila:>10.1f} {figura:>12.2f}")
+
+if __name__ == "__main__":
+    main()
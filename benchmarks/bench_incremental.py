@@ -0,0 +1,59 @@
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR / "scrap"))
+
+from get_stats import main as extraer, slugify
+from sitio_local import agregar_reseñas, generar_sitio, servir
+
+N_PROFESORES = 30
+CON_NUEVAS = 5
+TRABAJADORES = 4
+LATENCIA = 0.1
+RETRASO_MS = 150
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        sitio = tmp / "sitio"
+        tabla = generar_sitio(sitio, N_PROFESORES, retraso_ms=RETRASO_MS)
+        servidor, url = servir(sitio, latencia=LATENCIA)
+        entrada = tmp / "profesores.csv"
+        tabla.assign(enlace=url + "/" + tabla["pagina"]).to_csv(entrada, index=False)
+
+        tags_dir, reviews_dir = tmp / "tags", tmp / "reviews"
+        tags_dir.mkdir()
+        reviews_dir.mkdir()
+        rutas = dict(tags_dir=tags_dir, reviews_dir=reviews_dir, manifiesto_path=tmp / "manifiesto.json")
+
+        inicio = time.perf_counter()
+        asyncio.run(extraer(entrada, TRABAJADORES, None, **rutas))
+        completo = time.perf_counter() - inicio
+
+        # Nuevas reseñas publicadas y nueva tabla de conteos (como la de scrap-links.py)
+        tabla = agregar_reseñas(sitio, tabla, CON_NUEVAS, retraso_ms=RETRASO_MS)
+        tabla.to_csv(tmp / "tabla.csv", index=False)
+
+        inicio = time.perf_counter()
+        actualizados = asyncio.run(extraer(entrada, TRABAJADORES, None, incremental=True,
+                                           tabla=tmp / "tabla.csv", **rutas))
+        incremental = time.perf_counter() - inicio
+        servidor.shutdown()
+
+        extraidas = {
+            prof: len(pd.read_csv(reviews_dir / f"{slugify(prof)}_reviews.csv"))
+            for prof in tabla["profesor"]
+        }
+        faltantes = {p: (extraidas[p], n) for p, n in zip(tabla["profesor"], tabla["num_reviews"]) if extraidas[p] != n}
+
+    print(f"\nExtracción completa: {completo:.1f} s; incremental ({len(actualizados)} profesores): {incremental:.1f} s")
+    print("Reseñas por profesor iguales a num_reviews:", "sí" if not faltantes else f"no {faltantes}")
+
+if __name__ == "__main__":
+    main()
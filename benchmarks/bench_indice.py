@@ -0,0 +1,53 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from datos import DatosProfesores
+from utils import generar_resumen, plot_facilidad, plot_calidad, show_means, get_tags, plot_tendencias, get_link, num_estrellas
+from sintetico import generar_datos
+
+TAMANOS = [709, 5_000, 20_000, 100_000]
+REPETICIONES = 20
+
+def renderizar(data, nombre: str):
+    # Mismas llamadas que hace app.update_dashboard por selección
+    show_means(data, nombre)
+    generar_resumen(data, nombre)
+    get_tags(data, nombre)
+    num_estrellas(data, nombre)
+    plot_facilidad(data, nombre)
+    plot_calidad(data, nombre)
+    plot_tendencias(data, nombre)
+    get_link(data, nombre)
+    get_link(data, nombre)
+
+def medir(data, nombres) -> float:
+    tiempos = []
+    for nombre in nombres:
+        inicio = time.perf_counter()
+        renderizar(data, nombre)
+        tiempos.append(time.perf_counter() - inicio)
+    return float(np.median(tiempos)) * 1000
+
+def main():
+    print(f"{'profesores':>10} {'DataFrame (ms)':>15} {'índice (ms)':>12} {'construcción (ms)':>18}")
+    for n in TAMANOS:
+        df = generar_datos(n)
+        inicio = time.perf_counter()
+        datos = DatosProfesores(df)
+        construccion = (time.perf_counter() - inicio) * 1000
+
+        nombres = list(df['profesor'].sample(REPETICIONES, random_state=0))
+        # Calentamiento de Plotly
+        renderizar(datos, nombres[0])
+
+        ms_df = medir(df, nombres)
+        ms_indice = medir(datos, nombres)
+        print(f"{n:>10} {ms_df:>15.2f} {ms_indice:>12.2f} {construccion:>18.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import json
+
+BENCH_DIR = Path(__file__).resolve().parent
+BASE_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from datos import cargar_datos
+from sintetico import generar_datos
+from carga_http import obtener, peticiones_profesor
+
+WORKERS = [1, 4, 16]
+N_PROFESORES = 20_000
+
+def puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def hijos(pid: int) -> list[int]:
+    pids = []
+    for proc in Path("/proc").iterdir():
+        if proc.name.isdigit():
+            try:
+                campos = (proc / "stat").read_text().rsplit(")", 1)[1].split()
+            except OSError:
+                continue
+            if int(campos[1]) == pid:
+                pids.append(int(proc.name))
+    return pids
+
+def memoria(pid: int) -> dict:
+    # Rss, Pss y memoria privada (USS) en MB según /proc/<pid>/smaps_rollup
+    valores = {}
+    for linea in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        clave, valor = linea.split(":")
+        valores[clave] = int(valor.split()[0]) / 1024
+    return {
+        "rss": valores["Rss"],
+        "pss": valores["Pss"],
+        "uss": valores["Private_Clean"] + valores["Private_Dirty"],
+    }
+
+def medir(n_workers: int, config: Path, env: dict, nombres: list[str]) -> dict:
+    puerto = puerto_libre()
+    proceso = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "app:server", "--config", str(config),
+         "--workers", str(n_workers), "--bind", f"127.0.0.1:{puerto}", "--log-level", "warning"],
+        cwd=BASE_DIR, env=env,
+    )
+    url = f"http://127.0.0.1:{puerto}"
+    try:
+        for _ in range(600):
+            try:
+                obtener(url + "/")
+                break
+            except OSError:
+                time.sleep(0.1)
+        while len(hijos(proceso.pid)) < n_workers:
+            time.sleep(0.1)
+
+        # Varias selecciones para que cada worker toque los datos
+        dependencias = json.loads(obtener(url + "/_dash-dependencies"))
+        for nombre in nombres[: 4 * n_workers]:
+            for peticion in peticiones_profesor(dependencias, nombre):
+                obtener(url + "/_dash-update-component", peticion)
+
+        workers = [memoria(pid) for pid in hijos(proceso.pid)]
+        return {
+            "maestro": memoria(proceso.pid),
+            "uss": sum(w["uss"] for w in workers) / len(workers),
+            "pss": sum(w["pss"] for w in workers) / len(workers),
+            "rss": sum(w["rss"] for w in workers) / len(workers),
+        }
+    finally:
+        proceso.terminate()
+        proceso.wait()
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        ruta = tmp / "profesores.csv"
+        df = generar_datos(N_PROFESORES)
+        df.to_csv(ruta, index=False)
+        nombres = list(df["profesor"].sample(64, random_state=0))
+
+        env = {**os.environ, "PROFESORES_DATA": str(ruta), "PROFESORES_CACHE": str(tmp / "cache")}
+        cargar_datos(ruta, tmp / "cache")
+
+        sin_preload = tmp / "sin_preload.py"
+        sin_preload.write_text("preload_app = False\n")
+        modos = {"preload (gunicorn.conf.py)": BASE_DIR / "gunicorn.conf.py", "sin preload": sin_preload}
+
+        print(f"{N_PROFESORES} profesores sintéticos; memoria promedio por worker en MB")
+        print(f"{'modo':>28} {'workers':>8} {'USS':>8} {'PSS':>8} {'RSS':>8}")
+        for modo, config in modos.items():
+            for n in WORKERS:
+                r = medir(n, config, env, nombres)
+                print(f"{modo:>28} {n:>8} {r['uss']:>8.1f} {r['pss']:>8.1f} {r['rss']:>8.1f}")
+
+if __name__ == "__main__":
+    main()
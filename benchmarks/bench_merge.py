@@ -0,0 +1,68 @@
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR / "analysis"))
+
+from merge_data import merge_data
+
+N_PROFESORES = 2000
+MAX_RESEÑAS = 60
+CAMBIADOS = 20  # profesores con reseñas nuevas entre ejecuciones
+
+def _escribir(tags_dir: Path, reviews_dir: Path, i: int, n: int, rng, anexar: bool = False):
+    nombre = f"Profesor {i:05d}"
+    pd.DataFrame({
+        "profesor": nombre,
+        "fecha": "15/Ago/2024",
+        "comentario": [f"Comentario {j} sobre {nombre}, con comas y \"comillas\"" for j in range(n)],
+        "calidad_general": rng.integers(0, 11, n).astype(float),
+        "facilidad": rng.integers(1, 6, n).astype(float),
+    }).to_csv(reviews_dir / f"p{i:05d}_reviews.csv", mode="a" if anexar else "w", header=not anexar, index=False)
+    pd.DataFrame({"profesor": [nombre], "tags": ["Tag A, Tag B"]}).to_csv(tags_dir / f"p{i:05d}_tags.csv", index=False)
+
+def _medir(**kwargs) -> float:
+    inicio = time.perf_counter()
+    merge_data(**kwargs)
+    return time.perf_counter() - inicio
+
+def _pico_memoria(**kwargs) -> float:
+    # Aparte del tiempo: tracemalloc hace mucho más lenta la lectura
+    tracemalloc.start()
+    merge_data(**kwargs)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico / 2**20
+
+def main():
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        tags_dir, reviews_dir = tmp / "tags", tmp / "reviews"
+        tags_dir.mkdir()
+        reviews_dir.mkdir()
+        for i in range(N_PROFESORES):
+            _escribir(tags_dir, reviews_dir, i, int(rng.integers(1, MAX_RESEÑAS)), rng)
+        kwargs = dict(tags_dir=tags_dir, reviews_dir=reviews_dir, salida_dir=tmp, manifiesto_path=tmp / "m.json")
+
+        completo = _medir(completo=True, **kwargs)
+        filas = len(pd.read_csv(tmp / "merged_reviews.csv"))
+        sin_cambios = _medir(**kwargs)
+        for i in rng.choice(N_PROFESORES, CAMBIADOS, replace=False):
+            _escribir(tags_dir, reviews_dir, int(i), 5, rng, anexar=True)
+        incremental = _medir(**kwargs)
+        pico = _pico_memoria(completo=True, **kwargs)
+
+    print(f"\n{N_PROFESORES} archivos por tipo, {filas} reseñas")
+    print(f"  Completo:    {completo:.2f} s ({filas / completo:,.0f} filas/s), pico de memoria {pico:.1f} MB")
+    print(f"  Sin cambios: {sin_cambios:.2f} s")
+    print(f"  {CAMBIADOS} archivos con reseñas nuevas: {incremental:.2f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import os
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+# Sin dashboards precalculados: se mide el renderizado en vivo
+os.environ["PROFESORES_PRERENDER"] = str(BASE_DIR / "data" / "sin_prerender")
+
+import app as aplicacion
+from carga_http import peticiones_profesor
+from metricas import registro
+
+N_PROFESORES = 100
+
+def _medias(metrica: str) -> dict:
+    # Promedio de cada histograma de `registro` a partir de su suma y su total
+    return {valor: h.suma / h.total for (_, valor), h in registro._histogramas.get(metrica, {}).items() if h.total}
+
+def main():
+    cliente = aplicacion.server.test_client()
+    dependencias = cliente.get("/_dash-dependencies").get_json()
+    for nombre in aplicacion.data.nombres[:N_PROFESORES]:
+        for peticion in peticiones_profesor(dependencias, nombre):
+            cliente.post("/_dash-update-component", json=peticion)
+
+    render = _medias("profesores_render_segundos")
+    peticion = _medias("profesores_peticion_segundos")
+    bytes_ = _medias("profesores_respuesta_bytes")
+
+    print(f"{'renderer':>20} {'media (ms)':>11}")
+    for nombre, segundos in sorted(render.items(), key=lambda x: -x[1]):
+        if not nombre.startswith("update_"):
+            print(f"{nombre:>20} {segundos * 1000:>11.2f}")
+
+    # Lo que no es el callback es serialización a JSON y el resto de Dash/Flask
+    callbacks = {
+        "indicador-1": "update_indicadores", "seccion-resumen": "update_textos",
+        **{f"grafica-{tipo}": f"update_grafica_{tipo}" for tipo in ("facilidad", "calidad", "tendencias")},
+    }
+    print(f"\n{'callback':>20} {'petición (ms)':>14} {'callback (ms)':>14} {'resto (ms)':>11} {'bytes':>8}")
+    for salida, funcion in callbacks.items():
+        total, propio = peticion[salida] * 1000, render[funcion] * 1000
+        print(f"{salida:>20} {total:>14.2f} {propio:>14.2f} {total - propio:>11.2f} {bytes_[salida]:>8.0f}")
+
+    print(f"\n/metrics: {len(cliente.get('/metrics').data) / 1024:.1f} KB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(BASE_DIR / "analysis"))
+
+from datos import cargar_datos, DashboardsPrecalculados
+from prerender_dashboards import prerender_dashboards
+from sintetico import generar_datos
+from utils import generar_secciones, cache_figuras
+
+N_PROFESORES = 120
+PROCESOS = [1, 2, 4]
+
+def main():
+    print(f"CPUs disponibles: {os.cpu_count()}")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        ruta = tmp / "profesores.csv"
+        generar_datos(N_PROFESORES).to_csv(ruta, index=False)
+        os.environ["PROFESORES_CACHE"] = str(tmp / "cache")
+
+        for procesos in PROCESOS:
+            inicio = time.perf_counter()
+            prerender_dashboards(ruta, procesos, directorio=tmp / "prerender")
+            duracion = time.perf_counter() - inicio
+            print(f"  {procesos} procesos: {N_PROFESORES / duracion:.1f} profesores/s")
+
+        datos = cargar_datos(ruta)
+        dashboards = DashboardsPrecalculados.abrir(ruta, tmp / "prerender")
+        nombres = datos.nombres[:40]
+
+        en_vivo, precalculado = [], []
+        for nombre in nombres:
+            cache_figuras.limpiar()
+            inicio = time.perf_counter()
+            generar_secciones(datos, nombre)
+            en_vivo.append(time.perf_counter() - inicio)
+
+            inicio = time.perf_counter()
+            dashboards.obtener(nombre)
+            precalculado.append(time.perf_counter() - inicio)
+
+        print(f"Latencia por profesor (mediana): en vivo {np.median(en_vivo) * 1000:.2f} ms, "
+              f"precalculado {np.median(precalculado) * 1000:.3f} ms")
+
+if __name__ == "__main__":
+    main()
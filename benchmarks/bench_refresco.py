@@ -0,0 +1,111 @@
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+
+from sintetico import generar_datos
+
+# Latencia de los callbacks de un profesor mientras se cambian los datos en caliente,
+# comparada con lo que pasaría al reiniciar el worker (carga en frío y caché de figuras vacía).
+
+def escribir(ruta: Path, n: int, nuevos: int = 0):
+    # Los mismos profesores más `nuevos` profesores, con escritura atómica como la
+    # haría el proceso nocturno de actualización
+    df = generar_datos(n)
+    if nuevos:
+        extra = generar_datos(nuevos, seed=1)
+        extra['profesor'] = extra['profesor'] + " (nuevo)"
+        df = pd.concat([df, extra], ignore_index=True)
+    df.to_csv(ruta.with_suffix(".tmp"), index=False)
+    os.replace(ruta.with_suffix(".tmp"), ruta)
+
+def percentiles(latencias: list[float]) -> str:
+    if not latencias:
+        return f"{'-':>8} {'-':>8} {'-':>8} {0:>6}"
+    p50, p99 = np.percentile(latencias, [50, 99])
+    return f"{p50:>8.1f} {p99:>8.1f} {max(latencias):>8.1f} {len(latencias):>6}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Latencia durante una actualización de datos en caliente.")
+    parser.add_argument("--profesores", type=int, default=5_000)
+    parser.add_argument("--consultados", type=int, default=50, help="Profesores que se consultan en bucle.")
+    parser.add_argument("--segundos", type=float, default=5.0, help="Duración de cada ventana de medición.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        ruta = tmp / "professor_data.csv"
+        escribir(ruta, args.profesores)
+        os.environ.update({
+            "PROFESORES_DATA": str(ruta),
+            "PROFESORES_CACHE": str(tmp / "cache"),
+            "PROFESORES_PRERENDER": str(tmp / "sin_prerender"),
+            "PROFESORES_FACULTADES": str(tmp / "sin_facultades"),
+            "PROFESORES_REFRESCO": "0",  # el cambio se dispara a mano
+            "PROFESORES_COMPRESION": "0",
+        })
+        import app
+        from carga_http import peticiones_profesor
+
+        cliente = app.server.test_client()
+        dependencias = cliente.get("/_dash-dependencies").get_json()
+        nombres = list(app.data.nombres[:args.consultados])
+        peticiones = [p for nombre in nombres for p in peticiones_profesor(dependencias, nombre)]
+
+        # Reinicio: carga desde la caché binaria en un proceso nuevo y primeras peticiones sin caché de figuras
+        from utils import cache_figuras
+        inicio = time.perf_counter()
+        app._cargar_facultad(None)
+        carga = (time.perf_counter() - inicio) * 1000
+        frias = []
+        for peticion in peticiones:
+            inicio = time.perf_counter()
+            cliente.post("/_dash-update-component", json=peticion)
+            frias.append((time.perf_counter() - inicio) * 1000)
+
+        mediciones = []
+        detener = threading.Event()
+
+        def cargar_peticiones():
+            i = 0
+            while not detener.is_set():
+                inicio = time.perf_counter()
+                cliente.post("/_dash-update-component", json=peticiones[i % len(peticiones)])
+                mediciones.append((inicio, (time.perf_counter() - inicio) * 1000))
+                i += 1
+
+        hilo = threading.Thread(target=cargar_peticiones)
+        hilo.start()
+        time.sleep(args.segundos)
+        # Datos nuevos: los mismos profesores y un 5 % más
+        escribir(ruta, args.profesores, nuevos=args.profesores // 20)
+        inicio_cambio = time.perf_counter()
+        app.refrescador.revisar(esperar=False)
+        fin_cambio = time.perf_counter()
+        time.sleep(args.segundos)
+        detener.set()
+        hilo.join()
+
+        antes = [ms for t, ms in mediciones if t < inicio_cambio]
+        durante = [ms for t, ms in mediciones if inicio_cambio <= t < fin_cambio]
+        despues = [ms for t, ms in mediciones if t >= fin_cambio]
+        print(f"{args.profesores} profesores, {len(peticiones)} callbacks en bucle; "
+              f"cambio en {(fin_cambio - inicio_cambio):.2f} s (versión {app._facultad(None)[0].version[:8]})")
+        print(f"{'ventana':>22} {'p50 ms':>8} {'p99 ms':>8} {'máx ms':>8} {'n':>6}")
+        print(f"{'antes del cambio':>22} {percentiles(antes)}")
+        print(f"{'durante el cambio':>22} {percentiles(durante)}")
+        print(f"{'después del cambio':>22} {percentiles(despues)}")
+        print(f"{'reinicio (en frío)':>22} {percentiles(frias)}  + carga {carga:.0f} ms")
+        print(f"Figuras en caché: {cache_figuras.estadisticas()['figuras']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from datos import DatosProfesores
+from sintetico import generar_datos
+
+TAMANOS = [709, 5_000, 20_000, 100_000]
+
+def parsear_texto(valor: str) -> np.ndarray:
+    # Lo que hacía cada renderer por solicitud
+    return pd.to_numeric(valor.split(','), errors='coerce')
+
+def main():
+    print(f"{'profesores':>10} {'carga (ms)':>11} {'split (µs)':>11} {'slice (µs)':>11}")
+    for n in TAMANOS:
+        df = generar_datos(n)
+        inicio = time.perf_counter()
+        datos = DatosProfesores(df)
+        carga = (time.perf_counter() - inicio) * 1000
+
+        nombres = list(df['profesor'].sample(200, random_state=0))
+
+        inicio = time.perf_counter()
+        for nombre in nombres:
+            parsear_texto(datos.valor(nombre, 'facilidad'))
+        split = (time.perf_counter() - inicio) / len(nombres) * 1e6
+
+        inicio = time.perf_counter()
+        for nombre in nombres:
+            datos.valores(nombre, 'facilidad')
+        rebanada = (time.perf_counter() - inicio) / len(nombres) * 1e6
+
+        print(f"{n:>10} {carga:>11.1f} {split:>11.1f} {rebanada:>11.1f}")
+
+if __name__ == "__main__":
+    main()
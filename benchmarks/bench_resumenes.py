@@ -0,0 +1,58 @@
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR / "analysis"))
+
+from resumenes import BackendPrueba, actualizar_resumenes
+from datos import DATA_PATH
+
+DEMORA = 0.02  # segundos por llamada al backend de prueba
+CONCURRENCIAS = [1, 8]
+NUEVAS = 300  # reseñas nuevas entre ejecuciones
+PROFESORES_NUEVAS = 10  # profesores a los que llegan esas reseñas
+
+def _reseñas(nombres: list[str], rng) -> pd.DataFrame:
+    n = rng.integers(1, 40, len(nombres))
+    return pd.DataFrame({
+        "profesor": np.repeat(nombres, n),
+        "comentario": [f"Comentario {i}: explica bien pero deja muchas tareas" for i in range(n.sum())],
+    })
+
+def main():
+    nombres = pd.read_csv(DATA_PATH, usecols=["profesor"])["profesor"].tolist()
+    rng = np.random.default_rng(0)
+    reseñas = _reseñas(nombres, rng)
+    print(f"{'ejecución':>28} {'llamadas':>9} {'regenerados':>12} {'total (s)':>10}")
+
+    for concurrencia in CONCURRENCIAS:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            entrada = tmp / "reviews_plus_score.csv"
+            reseñas.to_csv(entrada, index=False)
+            shutil.copy(DATA_PATH, tmp / DATA_PATH.name)
+            kwargs = dict(entrada=entrada, checkpoint_path=tmp / "checkpoint.jsonl", summaries_path=tmp / "summaries.csv",
+                          datos_path=tmp / DATA_PATH.name, dataset_path=tmp / "sin_dataset",
+                          concurrencia=concurrencia)
+
+            ejecuciones = [("completa", actualizar_resumenes(BackendPrueba(DEMORA), **kwargs))]
+            ejecuciones.append(("sin cambios", actualizar_resumenes(BackendPrueba(DEMORA), **kwargs)))
+            elegidos = rng.choice(nombres, PROFESORES_NUEVAS, replace=False)
+            pd.DataFrame({
+                "profesor": np.resize(elegidos, NUEVAS),
+                "comentario": [f"Reseña nueva {i}" for i in range(NUEVAS)],
+            }).to_csv(entrada, mode="a", header=False, index=False)
+            ejecuciones.append((f"+{NUEVAS} reseñas", actualizar_resumenes(BackendPrueba(DEMORA), **kwargs)))
+
+        for nombre, r in ejecuciones:
+            print(f"{nombre + f' (concurrencia {concurrencia})':>28} {r['llamadas']:>9} "
+                  f"{r['regenerados']:>12} {r['segundos']:>10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR / "scrap"))
+
+from get_stats import main as extraer
+from sitio_local import generar_sitio, servir
+
+N_PROFESORES = 24
+TRABAJADORES = [1, 2, 4, 8]
+TASA = 20.0       # peticiones por segundo al host local
+LATENCIA = 0.2    # segundos por petición al servidor
+RETRASO_MS = 150  # cambio de página de reseñas
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        tabla = generar_sitio(tmp / "sitio", N_PROFESORES, retraso_ms=RETRASO_MS)
+        servidor, url = servir(tmp / "sitio", latencia=LATENCIA)
+        entrada = tmp / "profesores.csv"
+        tabla.assign(enlace=url + "/" + tabla["pagina"]).to_csv(entrada, index=False)
+
+        resultados = {}
+        for n in TRABAJADORES:
+            salida = tmp / f"salida_{n}"
+            (salida / "tags").mkdir(parents=True)
+            (salida / "reviews").mkdir(parents=True)
+
+            inicio = time.perf_counter()
+            completados = asyncio.run(extraer(entrada, n, TASA, salida / "tags", salida / "reviews"))
+            resultados[n] = len(completados) / (time.perf_counter() - inicio)
+
+        servidor.shutdown()
+
+    print(f"\n{N_PROFESORES} profesores, {int(tabla['num_reviews'].sum())} reseñas, tasa máxima {TASA:g}/s por host")
+    for n, profesores_s in resultados.items():
+        print(f"  {n} trabajadores: {profesores_s:.2f} profesores/s")
+
+if __name__ == "__main__":
+    main()
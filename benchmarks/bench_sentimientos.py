@@ -0,0 +1,53 @@
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR / "analysis"))
+
+from sentimientos import ModeloDeterminista, puntuar_reseñas
+
+N_RESEÑAS = 100_000
+NUEVAS = 5_000  # reseñas agregadas entre ejecuciones
+PALABRAS = ["excelente", "explica", "claro", "nunca", "asiste", "pésima", "tareas", "examen", "buena",
+            "clase", "aburrida", "recomiendo", "no", "aprendes", "mucho", "poco", "la", "el", "muy"]
+
+def _reseñas(n: int, rng, inicio: int = 0) -> pd.DataFrame:
+    # Comentarios de 8 a 40 palabras
+    comentarios = [" ".join(rng.choice(PALABRAS, rng.integers(8, 40))) + f" ({i})" for i in range(inicio, inicio + n)]
+    return pd.DataFrame({
+        "profesor": [f"Profesor {i % 2000:04d}" for i in range(n)],
+        "fecha": "15/Ago/2024",
+        "comentario": comentarios,
+        "calidad_general": rng.integers(0, 11, n).astype(float),
+        "facilidad": rng.integers(1, 6, n).astype(float),
+    })
+
+def _medir(**kwargs) -> tuple[float, dict]:
+    inicio = time.perf_counter()
+    resumen = puntuar_reseñas(ModeloDeterminista(), **kwargs)
+    return time.perf_counter() - inicio, resumen
+
+def main():
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        entrada = tmp / "merged_reviews.csv"
+        _reseñas(N_RESEÑAS, rng).to_csv(entrada, index=False)
+        kwargs = dict(entrada=entrada, salida=tmp / "reviews_plus_score.csv", cache_path=tmp / "cache.csv")
+
+        resultados = [("sin caché", *_medir(**kwargs)), ("sin cambios", *_medir(**kwargs))]
+        _reseñas(NUEVAS, rng, inicio=N_RESEÑAS).to_csv(entrada, mode="a", header=False, index=False)
+        resultados.append((f"+{NUEVAS} reseñas", *_medir(**kwargs)))
+
+    print(f"\n{'ejecución':>16} {'total (s)':>10} {'puntuados':>10} {'de caché':>9} {'comentarios/s':>14}")
+    for nombre, segundos, resumen in resultados:
+        print(f"{nombre:>16} {segundos:>10.2f} {resumen['puntuados']:>10} {resumen['cache']:>9} "
+              f"{resumen['comentarios_por_segundo']:>14.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import json
+import urllib.request
+
+def obtener(url: str, datos: dict | None = None) -> bytes:
+    """
+    Hace una petición GET (o POST con JSON si se pasan datos) y devuelve el cuerpo.
+    """
+    cuerpo = json.dumps(datos).encode() if datos is not None else None
+    solicitud = urllib.request.Request(url, data=cuerpo, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(solicitud, timeout=60) as respuesta:
+        return respuesta.read()
+
+def _salida(output: str) -> list[dict] | dict:
+    # Dash codifica callbacks con varias salidas como "..a.children...b.children.."
+    if output.startswith(".."):
+        return [_salida(parte) for parte in output[2:-2].split("...")]
+    id_, _, propiedad = output.rpartition(".")
+    return {"id": id_, "property": propiedad}
+
+def peticiones_profesor(dependencias: list[dict], nombre: str, facultad: str | None = None) -> list[dict]:
+    """
+    Construye los cuerpos de `/_dash-update-component` de los callbacks que
+    dependen del selector de profesor, a partir de `/_dash-dependencies`.
+    """
+    peticiones = []
+    for callback in dependencias:
+        if callback.get("clientside_function"):
+            continue
+        entradas = callback["inputs"]
+        if not any(e["id"] == "selector-profesor" and e["property"] == "value" for e in entradas):
+            continue
+        peticiones.append({
+            "output": callback["output"],
+            "outputs": _salida(callback["output"]),
+            "inputs": [
+                {**e, "value": nombre if (e["id"], e["property"]) == ("selector-profesor", "value") else None}
+                for e in entradas
+            ],
+            "state": [
+                {**s, "value": facultad if s["id"] == "selector-facultad" else None}
+                for s in callback.get("state", [])
+            ],
+            "changedPropIds": ["selector-profesor.value"],
+        })
+    return peticiones
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Paths seguros
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+DATA_PATH = DATA_DIR / "professor_data.csv"
+
+def generar_datos(n_profesores: int, base: pd.DataFrame | None = None, seed: int = 0) -> pd.DataFrame:
+    """
+    Genera una tabla sintética con el mismo esquema que `professor_data.csv`.
+    Args:
+        n_profesores (int): Número de filas (profesores) a generar.
+        base (pd.DataFrame | None): Tabla de la que se muestrean las filas. Por defecto la tabla real.
+        seed (int): Semilla para el muestreo.
+    Returns:
+        pd.DataFrame: Tabla con `n_profesores` filas y nombres únicos.
+    """
+    if base is None:
+        base = pd.read_csv(DATA_PATH)
+
+    rng = np.random.default_rng(seed)
+    filas = rng.integers(0, len(base), size=n_profesores)
+    df = base.iloc[filas].reset_index(drop=True)
+    # Nombres únicos para que cada fila sea un profesor distinto
+    df['profesor'] = [f"{nombre} #{i}" for i, nombre in enumerate(df['profesor'])]
+    return df
+
+# Columnas con una entrada por reseña, separadas por comas
+COLUMNAS_RESEÑAS = ['rating', 'fecha', 'calidad_general', 'facilidad']
+
+def generar_datos_reseñas(n_profesores: int, n_reseñas: int, base: pd.DataFrame | None = None,
+                          seed: int = 0) -> pd.DataFrame:
+    """
+    Genera una tabla sintética de `n_profesores` x `n_reseñas` con el esquema de `professor_data.csv`.
+    Cada profesor toma el resto de columnas de una fila de la tabla base y sus reseñas
+    se muestrean (con reemplazo) de las de esa fila, así que los valores y fechas son reales.
+    Args:
+        n_profesores (int): Número de filas (profesores) a generar.
+        n_reseñas (int): Reseñas por profesor.
+        base (pd.DataFrame | None): Tabla de la que se muestrean las filas. Por defecto la tabla real.
+        seed (int): Semilla para el muestreo.
+    Returns:
+        pd.DataFrame: Tabla con nombres únicos y `n_reseñas` valores en cada columna de reseñas.
+    """
+    df = generar_datos(n_profesores, base, seed)
+    rng = np.random.default_rng(seed + 1)
+    partes = {columna: df[columna].astype(str).str.split(', ') for columna in COLUMNAS_RESEÑAS}
+    nuevas = {columna: [] for columna in COLUMNAS_RESEÑAS}
+    for i in range(len(df)):
+        elegidas = rng.integers(0, len(partes['fecha'].iat[i]), size=n_reseñas)
+        for columna in COLUMNAS_RESEÑAS:
+            valores = partes[columna].iat[i]
+            nuevas[columna].append(', '.join(valores[j % len(valores)] for j in elegidas))
+    for columna in COLUMNAS_RESEÑAS:
+        df[columna] = nuevas[columna]
+    df['num_reviews'] = n_reseñas
+    return df
+
+def escribir_individuales(df: pd.DataFrame, tags_dir: Path, reviews_dir: Path):
+    """
+    Escribe una tabla con el esquema de `professor_data.csv` como los archivos
+    individuales de tags y reseñas que lee `analysis/merge_data.py`.
+    Args:
+        df (pd.DataFrame): Tabla de profesores (p. ej. de `generar_datos_reseñas`).
+        tags_dir (Path): Carpeta de tags individuales.
+        reviews_dir (Path): Carpeta de reseñas individuales.
+    """
+    tags_dir.mkdir(parents=True, exist_ok=True)
+    reviews_dir.mkdir(parents=True, exist_ok=True)
+    for i, fila in enumerate(df.itertuples(index=False)):
+        fechas = str(fila.fecha).split(', ')
+        pd.DataFrame({
+            "profesor": fila.profesor,
+            "fecha": fechas,
+            "comentario": [f"Comentario {j} sobre {fila.profesor}, con comas y \"comillas\"" for j in range(len(fechas))],
+            "calidad_general": str(fila.calidad_general).split(', '),
+            "facilidad": str(fila.facilidad).split(', '),
+        }).to_csv(reviews_dir / f"p{i:06d}_reviews.csv", index=False)
+        pd.DataFrame({"profesor": [fila.profesor], "tags": [fila.tags]}).to_csv(tags_dir / f"p{i:06d}_tags.csv", index=False)
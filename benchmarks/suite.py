@@ -0,0 +1,378 @@
+"""
+Suite de benchmarks reproducible del dashboard.
+
+Genera una tabla sintética de N profesores x M reseñas (mismo esquema que
+`professor_data.csv`) y mide, con esos datos:
+
+- carga: arranque de `app.py` en un proceso nuevo (caché binaria fría y caliente)
+  y `datos.cargar_datos` en proceso.
+- callbacks: todas las peticiones de Dash de un profesor (lo que hacía
+  `update_dashboard`) con la caché de figuras fría y caliente, por callback y en
+  total, y los bytes de la respuesta.
+- renderers: cada función de `utils.py` por separado, sin cachés.
+- merge: `merge_data.merge_data` sobre archivos individuales de esos profesores.
+- concurrencia: peticiones simultáneas al `server` de Flask con su cliente de
+  pruebas (WSGI) desde varios hilos.
+
+Los resultados se escriben en JSON (`--salida`) junto con el commit, la máquina y
+los parámetros, y se pueden comparar con los de otra ejecución (`--comparar`).
+
+    python benchmarks/suite.py --salida antes.json
+    python benchmarks/suite.py --salida despues.json --comparar antes.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+BENCH_DIR = Path(__file__).resolve().parent
+BASE_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(BASE_DIR / "analysis"))
+
+from sintetico import escribir_individuales, generar_datos_reseñas
+
+# Versión del formato del JSON de resultados
+VERSION_RESULTADOS = 1
+GRUPOS = ["carga", "callbacks", "renderers", "merge", "concurrencia"]
+HILOS = [1, 4, 8]
+# Cambio relativo de la mediana a partir del cual se marca una regresión
+TOLERANCIA = 0.10
+# Diferencia mínima (en ms) para marcar un cambio en tiempos muy cortos, donde domina el ruido
+MINIMO_MS = 0.25
+# Parámetros que cambian los datos o la muestra (los grupos e hilos solo eligen qué se mide)
+PARAMETROS_DATOS = ("profesores", "reseñas", "muestra", "repeticiones", "seed")
+
+# Arranque completo en un proceso nuevo: importar app.py carga los datos y construye el layout
+ARRANQUE = """
+import time
+inicio = time.perf_counter()
+import app
+print(time.perf_counter() - inicio)
+"""
+
+
+def _estadisticas(muestras: list[float], unidad: str, mayor_es_mejor: bool = False) -> dict:
+    muestras = np.asarray(muestras, dtype=float)
+    return {
+        "unidad": unidad,
+        "mayor_es_mejor": mayor_es_mejor,
+        "n": int(len(muestras)),
+        "mediana": float(np.median(muestras)),
+        "p95": float(np.percentile(muestras, 95)),
+        "min": float(muestras.min()),
+    }
+
+
+def _cronometrar(funcion) -> float:
+    inicio = time.perf_counter()
+    funcion()
+    return (time.perf_counter() - inicio) * 1000
+
+
+def _entorno(tmp: Path) -> dict:
+    # Datos sintéticos, sin facultades ni dashboards precalculados: se mide el renderizado en vivo
+    return {
+        "PROFESORES_DATA": str(tmp / "profesores.csv"),
+        "PROFESORES_CACHE": str(tmp / "cache"),
+        "PROFESORES_PRERENDER": str(tmp / "sin_prerender"),
+        "PROFESORES_FACULTADES": str(tmp / "sin_facultades"),
+    }
+
+
+def medir_carga(tmp: Path, repeticiones: int) -> dict:
+    from datos import cargar_datos
+
+    def arrancar(cache: Path) -> float:
+        env = {**os.environ, **_entorno(tmp), "PROFESORES_CACHE": str(cache)}
+        salida = subprocess.run([sys.executable, "-c", ARRANQUE], cwd=BASE_DIR, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        return float(salida.strip().splitlines()[-1]) * 1000
+
+    resultados = {}
+    arrancar(tmp / "cache_arranque")
+    for modo in ("fria", "caliente"):
+        muestras = []
+        for i in range(repeticiones):
+            # Con la caché fría cada proceso usa una carpeta de caché nueva
+            muestras.append(arrancar(tmp / (f"cache_arranque_{i}" if modo == "fria" else "cache_arranque")))
+        resultados[f"carga.arranque_app.{modo}"] = _estadisticas(muestras, "ms")
+
+    ruta = tmp / "profesores.csv"
+    frias = [_cronometrar(lambda: cargar_datos(ruta, tmp / f"cache_carga_{i}")) for i in range(repeticiones)]
+    calientes = [_cronometrar(lambda: cargar_datos(ruta, tmp / "cache_carga_0")) for _ in range(repeticiones)]
+    resultados["carga.cargar_datos.fria"] = _estadisticas(frias, "ms")
+    resultados["carga.cargar_datos.caliente"] = _estadisticas(calientes, "ms")
+    return resultados
+
+
+def _enviar(cliente, peticion: dict) -> tuple[str, float, int]:
+    inicio = time.perf_counter()
+    respuesta = cliente.post("/_dash-update-component", json=peticion)
+    ms = (time.perf_counter() - inicio) * 1000
+    if respuesta.status_code != 200:
+        raise RuntimeError(f"{peticion['output']}: HTTP {respuesta.status_code}")
+    salidas = peticion["outputs"]
+    callback = (salidas[0] if isinstance(salidas, list) else salidas)["id"]
+    return callback, ms, len(respuesta.data)
+
+
+def medir_callbacks(aplicacion, nombres: list[str]) -> dict:
+    from carga_http import peticiones_profesor
+    from utils import cache_figuras
+
+    cliente = aplicacion.server.test_client()
+    dependencias = cliente.get("/_dash-dependencies").get_json()
+    totales = {"fria": [], "caliente": []}
+    por_callback = {"fria": {}, "caliente": {}}
+    bytes_ = []
+    for nombre in nombres:
+        peticiones = peticiones_profesor(dependencias, nombre)
+        cache_figuras.limpiar()
+        for modo in ("fria", "caliente"):
+            total, tamano = 0.0, 0
+            for peticion in peticiones:
+                callback, ms, n = _enviar(cliente, peticion)
+                por_callback[modo].setdefault(callback, []).append(ms)
+                total += ms
+                tamano += n
+            totales[modo].append(total)
+        bytes_.append(tamano)
+
+    resultados = {}
+    for modo in ("fria", "caliente"):
+        resultados[f"callbacks.profesor.{modo}"] = _estadisticas(totales[modo], "ms")
+        for callback, muestras in sorted(por_callback[modo].items()):
+            resultados[f"callbacks.{callback}.{modo}"] = _estadisticas(muestras, "ms")
+    resultados["callbacks.profesor.bytes"] = _estadisticas(bytes_, "bytes")
+    return resultados
+
+
+def medir_renderers(datos, nombres: list[str]) -> dict:
+    import utils
+
+    # Las figuras se construyen sin `cache_figuras`; su serialización se mide aparte
+    renderers = {
+        "show_means": utils.show_means,
+        "generar_resumen": utils.generar_resumen,
+        "get_tags": utils.get_tags,
+        "num_estrellas": utils.num_estrellas,
+        "get_link": utils.get_link,
+        "figura_facilidad": utils._figura_facilidad,
+        "figura_calidad": utils._figura_calidad,
+        "figura_tendencias": utils._figura_tendencias,
+    }
+    # Calentamiento de Plotly (validadores y plantillas)
+    for renderer in renderers.values():
+        renderer(datos, nombres[0])
+
+    resultados = {}
+    figuras = []
+    for nombre_renderer, renderer in renderers.items():
+        muestras = []
+        for nombre in nombres:
+            inicio = time.perf_counter()
+            salida = renderer(datos, nombre)
+            muestras.append((time.perf_counter() - inicio) * 1000)
+            if nombre_renderer.startswith("figura_") and isinstance(salida, utils.go.Figure):
+                figuras.append(salida)
+        resultados[f"renderers.{nombre_renderer}"] = _estadisticas(muestras, "ms")
+    resultados["renderers.serializar_figura"] = _estadisticas(
+        [_cronometrar(figura.to_json) for figura in figuras], "ms")
+    return resultados
+
+
+def medir_merge(tmp: Path, df, repeticiones: int) -> dict:
+    from merge_data import merge_data
+
+    carpeta = tmp / "merge"
+    escribir_individuales(df, carpeta / "tags", carpeta / "reviews")
+    kwargs = dict(tags_dir=carpeta / "tags", reviews_dir=carpeta / "reviews", salida_dir=carpeta,
+                  manifiesto_path=carpeta / "manifiesto.json")
+    filas = int(df["num_reviews"].sum())
+    completo, sin_cambios = [], []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeticiones):
+            completo.append(filas / (_cronometrar(lambda: merge_data(completo=True, **kwargs)) / 1000))
+            sin_cambios.append(_cronometrar(lambda: merge_data(**kwargs)))
+    return {
+        "merge.completo": _estadisticas(completo, "filas/s", mayor_es_mejor=True),
+        "merge.sin_cambios": _estadisticas(sin_cambios, "ms"),
+    }
+
+
+def medir_concurrencia(aplicacion, nombres: list[str], hilos: list[int]) -> dict:
+    from carga_http import peticiones_profesor
+    from utils import cache_figuras
+
+    dependencias = aplicacion.server.test_client().get("/_dash-dependencies").get_json()
+    peticiones = [p for nombre in nombres for p in peticiones_profesor(dependencias, nombre)]
+    resultados = {}
+    for n in hilos:
+        cache_figuras.limpiar()
+        # Un cliente por petición: el cliente de pruebas de Flask no se comparte entre hilos
+        with ThreadPoolExecutor(max_workers=n) as pool:
+            inicio = time.perf_counter()
+            medidas = list(pool.map(lambda p: _enviar(aplicacion.server.test_client(), p), peticiones))
+            segundos = time.perf_counter() - inicio
+        latencias = [ms for _, ms, _ in medidas]
+        resultados[f"concurrencia.{n}_hilos.latencia"] = _estadisticas(latencias, "ms")
+        resultados[f"concurrencia.{n}_hilos.rendimiento"] = _estadisticas(
+            [len(peticiones) / segundos], "peticiones/s", mayor_es_mejor=True)
+    return resultados
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _maquina() -> dict:
+    import dash
+    import pandas as pd
+    import plotly
+
+    return {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "procesador": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "plotly": plotly.__version__,
+        "dash": dash.__version__,
+    }
+
+
+def ejecutar(n_profesores: int, n_reseñas: int, muestra: int, repeticiones: int, seed: int,
+             grupos: list[str], hilos: list[int]) -> dict:
+    """
+    Ejecuta los grupos de benchmarks pedidos sobre datos sintéticos.
+    Args:
+        n_profesores (int): Profesores de la tabla sintética.
+        n_reseñas (int): Reseñas por profesor.
+        muestra (int): Profesores con los que se miden callbacks, renderers y concurrencia.
+        repeticiones (int): Repeticiones de las mediciones de carga y merge.
+        seed (int): Semilla de los datos y de la muestra de profesores.
+        grupos (list[str]): Grupos de `GRUPOS` a ejecutar.
+        hilos (list[int]): Número de hilos de la prueba de concurrencia.
+    Returns:
+        dict: Resultados con metadatos (commit, máquina y parámetros).
+    """
+    resultados = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        df = generar_datos_reseñas(n_profesores, n_reseñas, seed=seed)
+        df.to_csv(tmp / "profesores.csv", index=False)
+        rng = np.random.default_rng(seed)
+        nombres = list(rng.choice(df["profesor"].to_numpy(), min(muestra, len(df)), replace=False))
+
+        if "carga" in grupos:
+            resultados.update(medir_carga(tmp, repeticiones))
+        if "merge" in grupos:
+            resultados.update(medir_merge(tmp, df, repeticiones))
+        if {"callbacks", "renderers", "concurrencia"} & set(grupos):
+            # app.py lee las variables de entorno al importarse
+            os.environ.update(_entorno(tmp))
+            import app as aplicacion
+
+            if "renderers" in grupos:
+                resultados.update(medir_renderers(aplicacion.data, nombres))
+            if "callbacks" in grupos:
+                resultados.update(medir_callbacks(aplicacion, nombres))
+            if "concurrencia" in grupos:
+                resultados.update(medir_concurrencia(aplicacion, nombres, hilos))
+
+    return {
+        "version": VERSION_RESULTADOS,
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _commit(),
+        "maquina": _maquina(),
+        "parametros": {"profesores": n_profesores, "reseñas": n_reseñas, "muestra": muestra,
+                       "repeticiones": repeticiones, "seed": seed, "grupos": grupos, "hilos": hilos},
+        "resultados": resultados,
+    }
+
+
+def comparar(base: dict, actual: dict, tolerancia: float = TOLERANCIA) -> list[str]:
+    """
+    Compara las medianas de dos ejecuciones e imprime el cambio de cada medición.
+    Args:
+        base (dict): Resultados de referencia (de `ejecutar`).
+        actual (dict): Resultados nuevos.
+        tolerancia (float): Cambio relativo a partir del cual se considera regresión o mejora
+            (en tiempos, además, de al menos `MINIMO_MS`).
+    Returns:
+        list[str]: Mediciones que empeoraron más que la tolerancia.
+    """
+    if any(base["parametros"].get(p) != actual["parametros"].get(p) for p in PARAMETROS_DATOS):
+        print("Aviso: las ejecuciones usan parámetros distintos; la comparación puede no ser válida.")
+    regresiones = []
+    print(f"\n{'medición':<42} {'base':>12} {'actual':>12} {'cambio':>9}")
+    for nombre, r in actual["resultados"].items():
+        anterior = base["resultados"].get(nombre)
+        if anterior is None or anterior["mediana"] == 0:
+            continue
+        cambio = r["mediana"] / anterior["mediana"] - 1
+        # Cambio positivo = peor, sin importar si la unidad es tiempo o rendimiento
+        peor = -cambio if r["mayor_es_mejor"] else cambio
+        if r["unidad"] == "ms" and abs(r["mediana"] - anterior["mediana"]) < MINIMO_MS:
+            peor = 0.0
+        marca = "  regresión" if peor > tolerancia else "  mejora" if peor < -tolerancia else ""
+        if peor > tolerancia:
+            regresiones.append(nombre)
+        print(f"{nombre:<42} {anterior['mediana']:>12.2f} {r['mediana']:>12.2f} {cambio:>+9.1%}{marca}")
+    return regresiones
+
+
+def imprimir(resultados: dict):
+    print(f"{'medición':<42} {'mediana':>12} {'p95':>12} {'n':>5}  unidad")
+    for nombre, r in resultados["resultados"].items():
+        print(f"{nombre:<42} {r['mediana']:>12.2f} {r['p95']:>12.2f} {r['n']:>5}  {r['unidad']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de benchmarks del dashboard con datos sintéticos.")
+    parser.add_argument("--profesores", type=int, default=2000, help="Profesores de la tabla sintética (N).")
+    parser.add_argument("--reseñas", type=int, default=20, help="Reseñas por profesor (M).")
+    parser.add_argument("--muestra", type=int, default=50, help="Profesores medidos en callbacks y renderers.")
+    parser.add_argument("--repeticiones", type=int, default=3, help="Repeticiones de carga y merge.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--grupos", nargs="+", choices=GRUPOS, default=GRUPOS)
+    parser.add_argument("--hilos", type=int, nargs="+", default=HILOS, help="Hilos de la prueba de concurrencia.")
+    parser.add_argument("--salida", type=Path, help="Archivo JSON donde guardar los resultados.")
+    parser.add_argument("--comparar", type=Path, help="JSON de una ejecución anterior con el que comparar.")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA,
+                        help="Cambio relativo de la mediana que se considera regresión.")
+    args = parser.parse_args()
+
+    resultados = ejecutar(args.profesores, args.reseñas, args.muestra, args.repeticiones, args.seed,
+                          args.grupos, args.hilos)
+    imprimir(resultados)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+        print(f"\nResultados guardados en {args.salida}")
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            regresiones = comparar(json.load(f), resultados, args.tolerancia)
+        if regresiones:
+            print(f"\n{len(regresiones)} regresiones de más del {args.tolerancia:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
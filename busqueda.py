@@ -0,0 +1,211 @@
+import re
+import unicodedata
+from bisect import bisect_left
+
+import numpy as np
+
+from datos import DatosProfesores, arreglos_derivados
+
+# Puntajes por palabra de la consulta: coincidencia exacta 1, prefijo entre 0.6 y 1
+# (más cerca de 1 cuanto más completa la palabra) y aproximada por debajo de 0.5
+PUNTAJE_PREFIJO = 0.6
+PUNTAJE_APROXIMADO = 0.5
+# Similitud mínima (coeficiente de Dice sobre trigramas) para una coincidencia aproximada
+SIMILITUD_MINIMA = 0.45
+# Las palabras más cortas solo se buscan por prefijo
+LARGO_MINIMO_APROXIMADO = 3
+
+
+def normalizar(texto: str) -> str:
+    """
+    Normaliza un texto para buscar: sin acentos, en minúsculas y con cualquier
+    carácter que no sea letra o número convertido en espacio (la misma
+    normalización que `slugify` en scrap/get_stats.py).
+    Args:
+        texto (str): Texto original, p. ej. "González Pérez, María".
+    Returns:
+        str: Texto normalizado, p. ej. "gonzalez perez maria".
+    """
+    texto = unicodedata.normalize('NFKD', str(texto)).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', ' ', texto.lower()).strip()
+
+
+def _trigramas(palabra: str) -> set[str]:
+    # Con espacios en los extremos para que el inicio y el final de la palabra pesen más
+    palabra = f" {palabra} "
+    return {palabra[i:i + 3] for i in range(len(palabra) - 2)}
+
+
+class IndiceBusqueda:
+    """
+    Índice para buscar profesores por nombre en el servidor.
+
+    Los nombres se separan en palabras normalizadas (`normalizar`), así
+    "gonzalez" encuentra "González". Las palabras distintas se guardan ordenadas
+    en `palabras`, de modo que todas las que empiezan con un prefijo forman un
+    rango contiguo que se encuentra con búsqueda binaria (como un trie, pero en
+    un arreglo). Los nombres que contienen cada palabra se guardan en `ids` con
+    `offsets`: los de la palabra `j` son `ids[offsets[j]:offsets[j + 1]]`, así
+    que los de un rango de palabras también son contiguos. Un índice de
+    trigramas encuentra palabras con errores de escritura.
+
+    Cada palabra de la consulta se compara con las palabras de cada nombre y un
+    nombre aparece en los resultados solo si coincide con todas; se ordenan por
+    la suma de los puntajes, después por longitud y por orden alfabético.
+
+    Todo el índice se puede guardar como arreglos (`arreglos`) y abrir sin
+    reconstruirlo (`desde_datos`, junto a la caché binaria de los datos).
+    """
+
+    def __init__(self, nombres: list[str]):
+        self.nombres = list(nombres)
+        pares = sorted({
+            (palabra, i)
+            for i, nombre in enumerate(self.nombres)
+            for palabra in normalizar(nombre).split()
+        })
+        self.palabras = sorted({palabra for palabra, _ in pares})
+        posicion = {palabra: j for j, palabra in enumerate(self.palabras)}
+
+        self.ids = np.array([i for _, i in pares], dtype=np.int32)
+        conteos = np.bincount([posicion[palabra] for palabra, _ in pares], minlength=len(self.palabras))
+        self.offsets = np.zeros(len(self.palabras) + 1, dtype=np.int64)
+        np.cumsum(conteos, out=self.offsets[1:])
+        self._largos = np.array([len(palabra) for palabra in self.palabras])
+
+        trigramas = {}
+        for j, palabra in enumerate(self.palabras):
+            for trigrama in _trigramas(palabra):
+                trigramas.setdefault(trigrama, []).append(j)
+        self._trigramas = {trigrama: np.array(js, dtype=np.int32) for trigrama, js in trigramas.items()}
+        self._n_trigramas = np.array([len(_trigramas(palabra)) for palabra in self.palabras])
+
+        # Desempates: nombres más cortos primero y luego en orden alfabético
+        self._longitudes = np.array([len(nombre) for nombre in self.nombres])
+        self._rango_alfabetico = np.empty(len(self.nombres), dtype=np.int64)
+        self._rango_alfabetico[sorted(range(len(self.nombres)), key=self.nombres.__getitem__)] = \
+            np.arange(len(self.nombres))
+
+    def arreglos(self) -> dict:
+        """
+        Devuelve el índice como arreglos de NumPy (sin objetos de Python), sin los nombres.
+        Returns:
+            dict: Nombre -> arreglo, en el formato que lee `desde_arreglos`.
+        """
+        trigramas = sorted(self._trigramas)
+        offsets = np.zeros(len(trigramas) + 1, dtype=np.int64)
+        np.cumsum([len(self._trigramas[t]) for t in trigramas], out=offsets[1:])
+        return {
+            'palabras': np.array(self.palabras, dtype=str),
+            'ids': self.ids,
+            'offsets': self.offsets,
+            'largos': self._largos,
+            'trigramas': np.array(trigramas, dtype=str),
+            'offsets_trigramas': offsets,
+            'palabras_trigramas': np.concatenate([self._trigramas[t] for t in trigramas] or [np.zeros(0, np.int32)]),
+            'n_trigramas': self._n_trigramas,
+            'longitudes': self._longitudes,
+            'rango_alfabetico': self._rango_alfabetico,
+        }
+
+    @classmethod
+    def desde_arreglos(cls, nombres: list[str], arreglos: dict) -> "IndiceBusqueda":
+        """
+        Reconstruye el índice a partir de `arreglos()` sin volver a separar ni ordenar.
+        Args:
+            nombres (list[str]): Los mismos nombres con los que se construyó.
+            arreglos (dict): Nombre -> arreglo, como lo devuelve `arreglos()`.
+        Returns:
+            IndiceBusqueda: Índice que usa los mismos arreglos (sin copiarlos).
+        """
+        indice = cls.__new__(cls)
+        indice.nombres = list(nombres)
+        indice.palabras = arreglos['palabras'].tolist()
+        indice.ids = arreglos['ids']
+        indice.offsets = arreglos['offsets']
+        indice._largos = arreglos['largos']
+        offsets, palabras = arreglos['offsets_trigramas'].tolist(), arreglos['palabras_trigramas']
+        indice._trigramas = {
+            trigrama: palabras[offsets[k]:offsets[k + 1]]
+            for k, trigrama in enumerate(arreglos['trigramas'].tolist())
+        }
+        indice._n_trigramas = arreglos['n_trigramas']
+        indice._longitudes = arreglos['longitudes']
+        indice._rango_alfabetico = arreglos['rango_alfabetico']
+        return indice
+
+    @classmethod
+    def desde_datos(cls, datos: DatosProfesores) -> "IndiceBusqueda":
+        """
+        Índice de los nombres de unos datos, guardado junto a su caché binaria
+        (ver `datos.arreglos_derivados`): solo se construye la primera vez.
+        Args:
+            datos (DatosProfesores): Datos de `cargar_datos`.
+        Returns:
+            IndiceBusqueda: Índice de `datos.nombres`.
+        """
+        arreglos = arreglos_derivados(datos, "busqueda", lambda d: cls(d.nombres).arreglos())
+        return cls.desde_arreglos(datos.nombres, arreglos)
+
+    def __len__(self) -> int:
+        return len(self.nombres)
+
+    def _puntajes_palabras(self, consulta: str) -> tuple[np.ndarray, np.ndarray]:
+        # Palabras del índice que coinciden con una palabra de la consulta y su puntaje
+        inicio = bisect_left(self.palabras, consulta)
+        fin = bisect_left(self.palabras, consulta + "\uffff")
+        palabras = np.arange(inicio, fin)
+        puntajes = PUNTAJE_PREFIJO + (1 - PUNTAJE_PREFIJO) * len(consulta) / self._largos[inicio:fin]
+
+        trigramas = _trigramas(consulta)
+        candidatos = [self._trigramas[t] for t in trigramas if t in self._trigramas]
+        if len(consulta) >= LARGO_MINIMO_APROXIMADO and candidatos:
+            conteos = np.bincount(np.concatenate(candidatos), minlength=len(self.palabras))
+            aproximadas = np.flatnonzero(conteos)
+            similitud = 2 * conteos[aproximadas] / (len(trigramas) + self._n_trigramas[aproximadas])
+            validas = (similitud >= SIMILITUD_MINIMA) & ((aproximadas < inicio) | (aproximadas >= fin))
+            palabras = np.concatenate([palabras, aproximadas[validas]])
+            puntajes = np.concatenate([puntajes, PUNTAJE_APROXIMADO * similitud[validas]])
+        return palabras, puntajes
+
+    def _puntajes_nombres(self, consulta: str) -> np.ndarray:
+        # Mejor puntaje de cada nombre para una palabra de la consulta (0 si no coincide)
+        palabras, puntajes = self._puntajes_palabras(consulta)
+        resultado = np.zeros(len(self.nombres))
+        if len(palabras) == 0:
+            return resultado
+        inicios, fines = self.offsets[palabras], self.offsets[palabras + 1]
+        conteos = fines - inicios
+        # Índices en `ids` de todos los nombres de las palabras encontradas
+        posiciones = np.repeat(inicios - np.cumsum(conteos) + conteos, conteos) + np.arange(conteos.sum())
+        np.maximum.at(resultado, self.ids[posiciones], np.repeat(puntajes, conteos))
+        return resultado
+
+    def buscar(self, consulta: str, limite: int = 20) -> list[str]:
+        """
+        Busca profesores por nombre sin importar acentos, mayúsculas ni el orden de las palabras.
+        Args:
+            consulta (str): Texto escrito por el usuario; cada palabra puede ser un prefijo
+                o tener errores de escritura.
+            limite (int): Número máximo de resultados.
+        Returns:
+            list[str]: Nombres ordenados del más al menos relevante.
+        """
+        palabras = normalizar(consulta or "").split()
+        if not palabras or not self.nombres or limite <= 0:
+            return []
+
+        total = np.zeros(len(self.nombres))
+        validos = np.ones(len(self.nombres), dtype=bool)
+        for palabra in dict.fromkeys(palabras):
+            puntajes = self._puntajes_nombres(palabra)
+            total += puntajes
+            validos &= puntajes > 0
+
+        candidatos = np.flatnonzero(validos)
+        if len(candidatos) > limite:
+            # Solo se ordenan los mejores (más los empatados con el último)
+            corte = -np.partition(-total[candidatos], limite - 1)[limite - 1]
+            candidatos = candidatos[total[candidatos] >= corte]
+        orden = np.lexsort((self._rango_alfabetico[candidatos], self._longitudes[candidatos], -total[candidatos]))
+        return [self.nombres[i] for i in candidatos[orden[:limite]]]
@@ -0,0 +1,208 @@
+import numpy as np
+
+from datos import ColumnaPuntajes, DatosProfesores, arreglos_derivados
+
+# Métricas por profesor que se pueden ordenar: nombre -> (etiqueta, mínimo, máximo)
+METRICAS = {
+    'calidad': ("Calidad promedio", 0, 10),
+    'facilidad': ("Facilidad promedio", 0, 10),
+    'rating': ("Sentimiento promedio (1-5)", 1, 5),
+    'promedio': ("Calificación del sitio", 0, 10),
+}
+# Columna de `COLUMNAS_PUNTAJES` de la que sale cada métrica que se promedia por reseña
+_COLUMNAS = {'calidad': 'calidad_general', 'facilidad': 'facilidad', 'rating': 'rating'}
+
+
+def _media_histogramas(puntajes: ColumnaPuntajes) -> np.ndarray:
+    # Promedio de cada fila a partir de su histograma (sin contar reseñas sin valor); NaN si no tiene
+    conteo = puntajes.histogramas.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (puntajes.histogramas @ puntajes.valores) / conteo
+
+
+def _pendientes(datos: DatosProfesores) -> np.ndarray:
+    # Pendiente de la recta de mínimos cuadrados (ponderada por reseñas) de la calidad
+    # por semestre contra el tiempo en años; NaN con menos de dos semestres
+    n_filas = datos.n_filas
+    filas = np.repeat(np.arange(n_filas), np.diff(datos.offsets_semestres))
+    x = np.asarray(datos.semestres['codigo'], dtype=float) / 2
+    y = np.asarray(datos.semestres['calidad'], dtype=float)
+    w = np.asarray(datos.semestres['n'], dtype=float)
+    validos = ~np.isnan(y)
+    filas, x, y, w = filas[validos], x[validos], y[validos], w[validos]
+
+    def suma(pesos):
+        return np.bincount(filas, weights=pesos, minlength=n_filas)
+
+    s, sx, sy = suma(w), suma(w * x), suma(w * y)
+    sxx, sxy = suma(w * x * x), suma(w * x * y)
+    denominador = s * sxx - sx * sx
+    with np.errstate(invalid='ignore', divide='ignore'):
+        pendiente = (s * sxy - sx * sy) / denominador
+    pendiente[np.bincount(filas, minlength=n_filas) < 2] = np.nan
+    return pendiente
+
+
+class TablaAgregados:
+    """
+    Tabla de agregados por profesor para comparar y ordenar a todo el catálogo.
+
+    Se calcula una sola vez al cargar los datos, con operaciones vectorizadas
+    sobre los arreglos de `DatosProfesores` (sin separar texto ni recorrer filas
+    en Python); los promedios salen de las matrices de histogramas de `puntajes`. Cada atributo es un arreglo con una posición por profesor (la
+    primera fila de cada nombre, como en `DatosProfesores.posiciones`):
+
+    - `metricas`: promedio de cada métrica de `METRICAS`.
+    - `n_reseñas`: número de reseñas.
+    - `tendencia`: cambio de la calidad por año según los promedios por semestre.
+    - `etiquetas`: matriz booleana profesor x etiqueta de `vocabulario`.
+
+    Filtrar, ordenar y elegir los k mejores son operaciones con máscaras y
+    `np.partition` sobre estos arreglos. Se pueden guardar (`arreglos`) y abrir
+    sin recalcularlos (`desde_datos`, junto a la caché binaria de los datos).
+    """
+
+    def __init__(self, datos: DatosProfesores):
+        self.version = datos.version
+        self.filas = np.sort(np.fromiter(datos.posiciones.values(), dtype=np.int64, count=len(datos.posiciones)))
+        profesores = datos.columnas['profesor']
+        self.nombres = np.array([profesores[i] for i in self.filas], dtype=object)
+        self.n_reseñas = np.diff(datos.offsets)[self.filas]
+
+        self.metricas = {}
+        for metrica, columna in _COLUMNAS.items():
+            if columna in datos.puntajes:
+                self.metricas[metrica] = _media_histogramas(datos.puntajes[columna])[self.filas]
+        if 'promedio' in datos.columnas:
+            self.metricas['promedio'] = np.asarray(datos.columnas['promedio'], dtype=float)[self.filas]
+
+        self.tendencia = _pendientes(datos)[self.filas]
+
+        self.vocabulario = list(datos.tags.vocabulario)
+        self._codigos = {etiqueta: j for j, etiqueta in enumerate(self.vocabulario)}
+        matriz = np.zeros((datos.n_filas, len(self.vocabulario)), dtype=bool)
+        matriz[np.repeat(np.arange(datos.n_filas), np.diff(datos.tags.offsets)), datos.tags.codigos] = True
+        self.etiquetas = matriz[self.filas]
+        self.frecuencia_etiquetas = self.etiquetas.sum(axis=0)
+
+        # Desempate: más reseñas primero y luego orden alfabético
+        self._rango_alfabetico = np.empty(len(self.nombres), dtype=np.int64)
+        self._rango_alfabetico[np.argsort(self.nombres, kind='stable')] = np.arange(len(self.nombres))
+
+    def arreglos(self) -> dict:
+        """
+        Devuelve la tabla como arreglos de NumPy (los nombres y el vocabulario salen de los datos).
+        Returns:
+            dict: Nombre -> arreglo, en el formato que lee `desde_arreglos`.
+        """
+        arreglos = {
+            'filas': self.filas,
+            'n_reseñas': self.n_reseñas,
+            'tendencia': self.tendencia,
+            'etiquetas': self.etiquetas,
+            'frecuencia_etiquetas': self.frecuencia_etiquetas,
+            'rango_alfabetico': self._rango_alfabetico,
+        }
+        for metrica, valores in self.metricas.items():
+            arreglos[f"metricas.{metrica}"] = valores
+        return arreglos
+
+    @classmethod
+    def desde_arreglos(cls, datos: DatosProfesores, arreglos: dict) -> "TablaAgregados":
+        """
+        Reconstruye la tabla a partir de `arreglos()` sin recalcular.
+        Args:
+            datos (DatosProfesores): Los mismos datos con los que se calculó.
+            arreglos (dict): Nombre -> arreglo, como lo devuelve `arreglos()`.
+        Returns:
+            TablaAgregados: Tabla que usa los mismos arreglos (sin copiarlos).
+        """
+        tabla = cls.__new__(cls)
+        tabla.version = datos.version
+        tabla.filas = arreglos['filas']
+        tabla.n_reseñas = arreglos['n_reseñas']
+        tabla.tendencia = arreglos['tendencia']
+        tabla.etiquetas = arreglos['etiquetas']
+        tabla.frecuencia_etiquetas = arreglos['frecuencia_etiquetas']
+        tabla._rango_alfabetico = arreglos['rango_alfabetico']
+        tabla.metricas = {
+            nombre.removeprefix('metricas.'): valores
+            for nombre, valores in arreglos.items() if nombre.startswith('metricas.')
+        }
+        # Los nombres son distintos, así que su rango alfabético es su posición en `datos.nombres`
+        tabla.nombres = np.array(datos.nombres, dtype=object)[tabla._rango_alfabetico]
+        tabla.vocabulario = list(datos.tags.vocabulario)
+        tabla._codigos = {etiqueta: j for j, etiqueta in enumerate(tabla.vocabulario)}
+        return tabla
+
+    @classmethod
+    def desde_datos(cls, datos: DatosProfesores) -> "TablaAgregados":
+        """
+        Agregados de unos datos, guardados junto a su caché binaria (ver
+        `datos.arreglos_derivados`): solo se calculan la primera vez.
+        Args:
+            datos (DatosProfesores): Datos de `cargar_datos`.
+        Returns:
+            TablaAgregados: Agregados de `datos`.
+        """
+        arreglos = arreglos_derivados(datos, "agregados", lambda d: cls(d).arreglos())
+        return cls.desde_arreglos(datos, arreglos)
+
+    def __len__(self) -> int:
+        return len(self.nombres)
+
+    def filtrar(self, metrica: str, min_reseñas: int = 0, etiquetas: list[str] | None = None) -> np.ndarray:
+        """
+        Selecciona los profesores con la métrica definida, suficientes reseñas y todas las etiquetas pedidas.
+        Args:
+            metrica (str): Una de `METRICAS`.
+            min_reseñas (int): Número mínimo de reseñas.
+            etiquetas (list[str] | None): Etiquetas que deben tener todos los profesores.
+        Returns:
+            np.ndarray: Máscara booleana con una posición por profesor.
+        """
+        mascara = ~np.isnan(self.metricas[metrica]) & (self.n_reseñas >= min_reseñas)
+        for etiqueta in etiquetas or []:
+            codigo = self._codigos.get(etiqueta)
+            if codigo is None:
+                return np.zeros(len(self), dtype=bool)
+            mascara &= self.etiquetas[:, codigo]
+        return mascara
+
+    def ranking(self, metrica: str, mascara: np.ndarray, mejores: bool = True, k: int = 10) -> np.ndarray:
+        """
+        Obtiene los k profesores con la métrica más alta (o más baja) entre los filtrados.
+        Args:
+            metrica (str): Una de `METRICAS`.
+            mascara (np.ndarray): Profesores filtrados (ver `filtrar`).
+            mejores (bool): True para los valores más altos, False para los más bajos.
+            k (int): Número de profesores.
+        Returns:
+            np.ndarray: Posiciones en la tabla, ordenadas; en empate van primero los de más reseñas.
+        """
+        candidatos = np.flatnonzero(mascara)
+        if k <= 0 or len(candidatos) == 0:
+            return candidatos[:0]
+        clave = self.metricas[metrica][candidatos]
+        if mejores:
+            clave = -clave
+        if len(candidatos) > k:
+            # Solo se ordenan los k primeros (más los empatados con el último)
+            corte = np.partition(clave, k - 1)[k - 1]
+            dentro = clave <= corte
+            candidatos, clave = candidatos[dentro], clave[dentro]
+        orden = np.lexsort((self._rango_alfabetico[candidatos], -self.n_reseñas[candidatos], clave))
+        return candidatos[orden[:k]]
+
+    def distribucion(self, metrica: str, mascara: np.ndarray, intervalos: int = 20) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Histograma de una métrica entre los profesores seleccionados.
+        Args:
+            metrica (str): Una de `METRICAS`.
+            mascara (np.ndarray): Profesores a contar (p. ej. de `filtrar`).
+            intervalos (int): Número de intervalos entre el mínimo y el máximo de la métrica.
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Conteos y bordes de los intervalos.
+        """
+        _, minimo, maximo = METRICAS[metrica]
+        return np.histogram(self.metricas[metrica][mascara], bins=intervalos, range=(minimo, maximo))
@@ -0,0 +1,105 @@
+"""
+Compresión de las respuestas del servidor de Flask con gzip o brotli.
+
+Se comprime según el encabezado `Accept-Encoding` del navegador (brotli si está
+instalado y el navegador lo acepta; si no, gzip). Las respuestas de los callbacks
+(JSON) se comprimen en cada petición; los archivos estáticos de Dash y de assets/
+siempre tienen el mismo contenido, así que se comprimen una vez y se guardan.
+
+Si un proxy (p. ej. nginx) ya comprime las respuestas, se puede desactivar con
+`PROFESORES_COMPRESION=0` (ver app.py).
+"""
+import gzip
+from collections import OrderedDict
+from hashlib import md5
+from threading import Lock
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Tipos de contenido que vale la pena comprimir
+TIPOS = {
+    "application/json", "application/javascript", "text/javascript", "text/html", "text/css", "text/plain",
+}
+# Respuestas más pequeñas se envían sin comprimir (el encabezado de gzip no compensa)
+MINIMO_BYTES = 500
+# Niveles: las respuestas de los callbacks se comprimen por petición, así que se usa un nivel rápido.
+# Con respuestas típicas (~1.8 KB) el nivel 3 tarda ~37% menos que el 6 y solo pesa ~4% más
+NIVEL_GZIP = 3
+CALIDAD_BROTLI = 5
+# Archivos estáticos comprimidos que se guardan
+MAX_ESTATICOS = 64
+
+
+def codificaciones() -> list[str]:
+    """
+    Codificaciones disponibles, en orden de preferencia.
+    Returns:
+        list[str]: 'br' (si brotli está instalado) y 'gzip'.
+    """
+    return (["br"] if brotli is not None else []) + ["gzip"]
+
+
+def comprimir(datos: bytes, codificacion: str) -> bytes:
+    """
+    Comprime un cuerpo de respuesta.
+    Args:
+        datos (bytes): Cuerpo sin comprimir.
+        codificacion (str): 'br' o 'gzip'.
+    Returns:
+        bytes: Cuerpo comprimido.
+    """
+    if codificacion == "br":
+        return brotli.compress(datos, quality=CALIDAD_BROTLI)
+    return gzip.compress(datos, compresslevel=NIVEL_GZIP, mtime=0)
+
+
+def _estatico(ruta: str) -> bool:
+    return ruta.startswith(("/_dash-component-suites/", "/assets/"))
+
+
+def comprimir_respuestas(server, minimo: int = MINIMO_BYTES):
+    """
+    Registra en el servidor de Flask la compresión de las respuestas.
+    Args:
+        server: Aplicación de Flask (`app.server`).
+        minimo (int): Tamaño mínimo en bytes para comprimir.
+    """
+    disponibles = codificaciones()
+    # (codificación, hash del contenido) -> cuerpo comprimido, de los archivos estáticos
+    estaticos = OrderedDict()
+    lock = Lock()
+
+    @server.after_request
+    def _comprimir(respuesta):
+        if (respuesta.direct_passthrough or respuesta.status_code != 200 or respuesta.mimetype not in TIPOS
+                or "Content-Encoding" in respuesta.headers):
+            return respuesta
+        respuesta.vary.add("Accept-Encoding")
+        codificacion = request.accept_encodings.best_match(disponibles)
+        datos = respuesta.get_data()
+        if codificacion is None or len(datos) < minimo:
+            return respuesta
+
+        if _estatico(request.path):
+            clave = (codificacion, md5(datos).hexdigest())
+            with lock:
+                comprimido = estaticos.get(clave)
+                if comprimido is not None:
+                    estaticos.move_to_end(clave)
+            if comprimido is None:
+                comprimido = comprimir(datos, codificacion)
+                with lock:
+                    estaticos[clave] = comprimido
+                    while len(estaticos) > MAX_ESTATICOS:
+                        estaticos.popitem(last=False)
+        else:
+            comprimido = comprimir(datos, codificacion)
+
+        respuesta.set_data(comprimido)
+        respuesta.headers["Content-Encoding"] = codificacion
+        return respuesta
@@ -0,0 +1,1239 @@
+import importlib.util
+import json
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+from hashlib import md5
+from pathlib import Path
+from uuid import uuid4
+
+import numpy as np
+import pandas as pd
+
+# Paths seguros
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+DATA_PATH = DATA_DIR / "professor_data.csv"
+# Dataset columnar (ver `escribir_dataset`); se usa en lugar del CSV si existe y hay pyarrow
+DATASET_PATH = DATA_DIR / "professor_data"
+CACHE_DIR = DATA_DIR / "cache"
+PRERENDER_DIR = DATA_DIR / "prerender"
+# Una carpeta por facultad con la misma estructura que `data/` (ver `carpeta_facultad`)
+FACULTADES_DIR = DATA_DIR / "facultades"
+
+# Solo se usa si no existe una copia local de los datos
+URL = "https://raw.githubusercontent.com/Christian-F-Badillo/Profesor_Resume/refs/heads/master/data/professor_data.csv"
+
+# Cambiar si cambia la forma en que se preprocesan los datos para invalidar las cachés
+VERSION_CACHE = 4
+# Formato de los registros de `guardar_dashboards` (2: un dict con las salidas de cada sección;
+# 3: figuras compactas con la plantilla `utils.PLANTILLA`)
+FORMATO_DASHBOARDS = 3
+
+# Columnas que guardan una lista de valores por reseña separados por comas
+COLUMNAS_RESEÑAS = ['rating', 'fecha', 'calidad_general', 'facilidad']
+# Columnas de reseñas con puntajes discretos (unos pocos valores distintos) que se codifican como enteros
+COLUMNAS_PUNTAJES = ['rating', 'calidad_general', 'facilidad']
+
+# Archivos del dataset columnar: una fila por profesor y una fila por reseña
+ARCHIVO_PROFESORES = "profesores.parquet"
+ARCHIVO_RESEÑAS = "reseñas.parquet"
+
+MESES = {
+    'Ene': 1, 'Feb': 2, 'Mar': 3, 'Abr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Ago': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dic': 12
+    }
+
+
+def _separar(serie: pd.Series) -> tuple[np.ndarray, list[str]]:
+    """
+    Separa una columna de valores unidos por comas en una lista plana.
+    Args:
+        serie (pd.Series): Columna con textos del tipo "a, b, c".
+    Returns:
+        tuple[np.ndarray, list[str]]: Número de valores por fila y los valores en orden.
+    """
+    presentes = serie.notna().to_numpy()
+    textos = serie[presentes].astype(str).tolist()
+
+    conteos = np.zeros(len(serie), dtype=np.int64)
+    conteos[presentes] = [texto.count(',') + 1 for texto in textos]
+    partes = ','.join(textos).split(',') if textos else []
+    return conteos, partes
+
+
+def _a_numeros(partes: list[str]) -> np.ndarray:
+    """
+    Convierte los valores separados a float; los que no son números quedan como NaN.
+    Args:
+        partes (list[str]): Valores como texto.
+    Returns:
+        np.ndarray: Arreglo float64.
+    """
+    try:
+        return np.array(partes, dtype=float)
+    except ValueError:
+        return pd.to_numeric(pd.Series(partes).str.strip(), errors='coerce').to_numpy(dtype=float)
+
+
+def _parsear_fechas(partes: list[str]) -> np.ndarray:
+    """
+    Convierte fechas del tipo "04/Nov/2024" (meses en español) a datetime64.
+    Solo se parsean las fechas distintas, que son muchas menos que las reseñas.
+    Args:
+        partes (list[str]): Fechas como texto.
+    Returns:
+        np.ndarray: Arreglo datetime64[ns]; NaT si la fecha no se reconoce.
+    """
+    codigos, unicas = pd.factorize(np.array(partes, dtype=object))
+    campos = pd.Series(unicas, dtype=object).str.strip().str.extract(r'(\d+)/(\w+)/(\d+)')
+    fechas = pd.to_datetime(
+        pd.DataFrame({
+            'year': pd.to_numeric(campos[2], errors='coerce'),
+            'month': campos[1].map(MESES),
+            'day': pd.to_numeric(campos[0], errors='coerce'),
+        }),
+        errors='coerce'
+    ).to_numpy()
+    return fechas[codigos]
+
+
+class ColumnaTexto:
+    """
+    Columna de texto guardada como bytes UTF-8 contiguos más un arreglo de offsets.
+
+    A diferencia de una columna `object` de pandas no crea un objeto de Python
+    por fila, así que los workers que heredan los datos por `fork` (o los abren
+    con memory-map) los comparten sin copiarlos. Los valores faltantes se
+    devuelven como NaN para que `pd.isna` siga funcionando.
+    """
+
+    def __init__(self, buffer: np.ndarray, offsets: np.ndarray, nulos: np.ndarray):
+        self.buffer = buffer
+        self.offsets = offsets
+        self.nulos = nulos
+
+    @classmethod
+    def desde_serie(cls, serie: pd.Series) -> "ColumnaTexto":
+        """
+        Empaqueta una columna de textos.
+        Args:
+            serie (pd.Series): Columna con textos o valores faltantes.
+        Returns:
+            ColumnaTexto: Columna empaquetada.
+        """
+        nulos = serie.isna().to_numpy()
+        codificados = [b'' if nulo else str(valor).encode() for valor, nulo in zip(serie, nulos)]
+
+        offsets = np.zeros(len(codificados) + 1, dtype=np.int64)
+        np.cumsum([len(texto) for texto in codificados], out=offsets[1:])
+        buffer = np.frombuffer(b''.join(codificados), dtype=np.uint8)
+        return cls(buffer, offsets, nulos)
+
+    def __len__(self) -> int:
+        return len(self.nulos)
+
+    def __getitem__(self, i: int):
+        if self.nulos[i]:
+            return np.nan
+        return self.buffer[self.offsets[i]:self.offsets[i + 1]].tobytes().decode()
+
+    def valores(self) -> list:
+        """
+        Decodifica todos los valores de una vez (más rápido que indexar uno por uno).
+        Returns:
+            list: Textos, con NaN en los valores faltantes.
+        """
+        texto = self.buffer.tobytes()
+        offsets = self.offsets.tolist()
+        return [np.nan if nulo else texto[offsets[i]:offsets[i + 1]].decode()
+                for i, nulo in enumerate(self.nulos.tolist())]
+
+    def arreglos(self) -> dict:
+        return {'buffer': self.buffer, 'offsets': self.offsets, 'nulos': self.nulos}
+
+
+class ColumnaEtiquetas:
+    """
+    Lista de etiquetas por fila codificada con un diccionario.
+
+    Cada etiqueta distinta se guarda una sola vez en `vocabulario` y cada fila
+    guarda sus códigos: las etiquetas de la fila `i` son
+    `codigos[offsets[i]:offsets[i + 1]]`. Así una etiqueta puede contener comas
+    y no hay que separar texto para obtener las etiquetas de un profesor.
+    """
+
+    def __init__(self, codigos: np.ndarray, offsets: np.ndarray, vocabulario: list[str]):
+        self.codigos = codigos
+        self.offsets = offsets
+        self.vocabulario = vocabulario
+
+    @classmethod
+    def desde_serie(cls, serie: pd.Series) -> "ColumnaEtiquetas":
+        """
+        Codifica una columna de etiquetas unidas por comas (como en el CSV).
+        Args:
+            serie (pd.Series): Columna con textos del tipo "A, B, C" o valores faltantes.
+        Returns:
+            ColumnaEtiquetas: Columna codificada; las etiquetas vacías se descartan.
+        """
+        conteos, partes = _separar(serie)
+        partes = np.array([parte.strip() for parte in partes], dtype=object)
+        validas = partes != ''
+        filas = np.repeat(np.arange(len(serie)), conteos)[validas]
+
+        codigos, vocabulario = pd.factorize(partes[validas], sort=True)
+        offsets = np.zeros(len(serie) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(filas, minlength=len(serie)), out=offsets[1:])
+        return cls(codigos.astype(np.int32), offsets, list(vocabulario))
+
+    @classmethod
+    def desde_arreglos(cls, arreglos: dict) -> "ColumnaEtiquetas":
+        """
+        Reconstruye la columna a partir de `arreglos()`.
+        Args:
+            arreglos (dict): Nombre -> arreglo, como lo devuelve `arreglos()`.
+        Returns:
+            ColumnaEtiquetas: Columna que usa los mismos arreglos de códigos y offsets.
+        """
+        vocabulario = ColumnaTexto(**{
+            parte.removeprefix('vocabulario.'): arreglo
+            for parte, arreglo in arreglos.items() if parte.startswith('vocabulario.')
+        })
+        return cls(arreglos['codigos'], arreglos['offsets'], [vocabulario[i] for i in range(len(vocabulario))])
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> list[str]:
+        return [self.vocabulario[codigo] for codigo in self.codigos[self.offsets[i]:self.offsets[i + 1]]]
+
+    def arreglos(self) -> dict:
+        vocabulario = ColumnaTexto.desde_serie(pd.Series(self.vocabulario, dtype=object))
+        return {
+            'codigos': self.codigos,
+            'offsets': self.offsets,
+            **{f"vocabulario.{parte}": arreglo for parte, arreglo in vocabulario.arreglos().items()},
+        }
+
+
+class ColumnaPuntajes:
+    """
+    Puntajes de una columna de reseñas codificados como enteros pequeños, con el
+    histograma de cada fila ya calculado.
+
+    Los valores distintos (a lo más unos diez, p. ej. 0-10 o 1-5) se guardan una
+    sola vez, ordenados, en `valores`, y cada reseña guarda en `codigos` el índice
+    de su valor (-1 si no tiene). `histogramas` es una matriz densa filas x valores
+    con el número de reseñas de cada fila con cada valor; se calcula para todas
+    las filas con un solo `np.bincount`, así que el histograma de un profesor es
+    leer una fila.
+    """
+
+    def __init__(self, codigos: np.ndarray, valores: np.ndarray, histogramas: np.ndarray):
+        self.codigos = codigos
+        self.valores = valores
+        self.histogramas = histogramas
+
+    @classmethod
+    def desde_valores(cls, valores: np.ndarray, offsets: np.ndarray) -> "ColumnaPuntajes":
+        """
+        Codifica los valores por reseña de una columna y cuenta los de cada fila.
+        Args:
+            valores (np.ndarray): Un valor por reseña (NaN si falta).
+            offsets (np.ndarray): Las reseñas de la fila `i` son `valores[offsets[i]:offsets[i + 1]]`.
+        Returns:
+            ColumnaPuntajes: Códigos, valores distintos y matriz de histogramas.
+        """
+        valores = np.asarray(valores, dtype=float)
+        validos = ~np.isnan(valores)
+        distintos = np.unique(valores[validos])
+        codigos = np.full(len(valores), -1, dtype=np.int8 if len(distintos) < 128 else np.int32)
+        codigos[validos] = np.searchsorted(distintos, valores[validos])
+
+        # Celda (fila, código) aplanada: fila * número de valores + código
+        n_filas, n_valores = len(offsets) - 1, len(distintos)
+        filas = np.repeat(np.arange(n_filas), np.diff(offsets))[validos]
+        celdas = filas * n_valores + codigos[validos]
+        histogramas = np.bincount(celdas, minlength=n_filas * n_valores).astype(np.int32)
+        return cls(codigos, distintos, histogramas.reshape(n_filas, n_valores))
+
+    @classmethod
+    def desde_arreglos(cls, arreglos: dict) -> "ColumnaPuntajes":
+        """
+        Reconstruye la columna a partir de `arreglos()`.
+        Args:
+            arreglos (dict): Nombre -> arreglo, como lo devuelve `arreglos()`.
+        Returns:
+            ColumnaPuntajes: Columna que usa los mismos arreglos.
+        """
+        return cls(arreglos['codigos'], arreglos['valores'], arreglos['histogramas'])
+
+    def histograma(self, i: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Histograma de una fila.
+        Args:
+            i (int): Fila.
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Valores presentes (ordenados) y número de reseñas con cada uno.
+        """
+        conteos = self.histogramas[i]
+        presentes = conteos > 0
+        return self.valores[presentes], conteos[presentes]
+
+    def arreglos(self) -> dict:
+        return {'codigos': self.codigos, 'valores': self.valores, 'histogramas': self.histogramas}
+
+
+class DatosProfesores:
+    """
+    Almacén de los datos de profesores con un índice por nombre construido una sola vez.
+
+    Cada columna se guarda como un arreglo de NumPy (o `ColumnaTexto` si es de
+    texto) y el índice `posiciones` asocia cada nombre con su fila, de modo que
+    los renderers de `utils.py` obtienen los valores de un profesor en O(1) sin
+    recorrer la tabla. Si un nombre aparece repetido se conserva la primera
+    fila, igual que al filtrar el DataFrame y tomar `values[0]`.
+
+    Las columnas de `COLUMNAS_RESEÑAS` se separan una sola vez al cargar en
+    arreglos planos (`reseñas`) con un arreglo de `offsets` por fila: las
+    reseñas de la fila `i` ocupan `offsets[i]:offsets[i + 1]`. Los promedios
+    por semestre de todos los profesores también se calculan al cargar y se
+    guardan en `semestres` con el mismo esquema de offsets. Las etiquetas de
+    cada profesor se codifican con un diccionario en `tags` (`ColumnaEtiquetas`),
+    y los puntajes de `COLUMNAS_PUNTAJES` como enteros con el histograma de cada
+    profesor en `puntajes` (`ColumnaPuntajes`).
+
+    Todo el estado son arreglos de NumPy sin objetos de Python por fila:
+    `guardar` los escribe como .npy y `desde_directorio` los abre con memory-map,
+    así varios procesos comparten la misma memoria (ver `cargar_datos`).
+
+    `version` identifica el conjunto de datos (p. ej. la firma del CSV) y sirve
+    como parte de la clave de las cachés de `utils.py`; si es None no se cachea.
+    Los datos que vienen de la caché binaria guardan además su carpeta
+    (`directorio`, ver `arreglos_derivados`) y el md5 de su contenido (`hash_datos`,
+    ver `hash_archivo`); si no, ambos son None.
+    """
+
+    def __init__(self, df: pd.DataFrame, version: str | None = None):
+        df = df.reset_index(drop=True)
+        self.version = version
+        self.directorio = self.hash_datos = None
+        self.n_filas = len(df)
+        self.columnas = {}
+        for columna in df.columns:
+            if columna in COLUMNAS_RESEÑAS or columna == 'tags':
+                continue
+            if pd.api.types.is_numeric_dtype(df[columna]):
+                self.columnas[columna] = df[columna].to_numpy()
+            else:
+                self.columnas[columna] = ColumnaTexto.desde_serie(df[columna])
+
+        self.tags = ColumnaEtiquetas.desde_serie(df['tags'] if 'tags' in df else pd.Series(np.nan, index=df.index))
+
+        self._indexar()
+        self._separar_reseñas(df)
+        self._agregar_semestres()
+        self._codificar_puntajes()
+
+    @classmethod
+    def desde_columnas(cls, columnas: dict, tags: ColumnaEtiquetas, filas: np.ndarray, reseñas: dict,
+                       version: str | None = None) -> "DatosProfesores":
+        """
+        Construye los datos a partir de columnas ya separadas (p. ej. del dataset
+        columnar de `leer_dataset`), sin separar ni parsear texto.
+        Args:
+            columnas (dict): Columna por profesor -> arreglo o `ColumnaTexto`; incluye 'profesor'.
+            tags (ColumnaEtiquetas): Etiquetas de cada profesor.
+            filas (np.ndarray): Fila del profesor de cada reseña, en orden no decreciente.
+            reseñas (dict): Columna de `COLUMNAS_RESEÑAS` -> arreglo con un valor por reseña.
+            version (str | None): Versión del conjunto de datos.
+        Returns:
+            DatosProfesores: Datos indexados, con los promedios por semestre calculados.
+        """
+        datos = cls.__new__(cls)
+        datos.version = version
+        datos.directorio = datos.hash_datos = None
+        datos.columnas = dict(columnas)
+        datos.n_filas = len(datos.columnas['profesor'])
+        datos.tags = tags
+        datos.offsets = np.zeros(datos.n_filas + 1, dtype=np.int64)
+        np.cumsum(np.bincount(filas, minlength=datos.n_filas), out=datos.offsets[1:])
+        datos.reseñas = dict(reseñas)
+
+        datos._indexar()
+        datos._agregar_semestres()
+        datos._codificar_puntajes()
+        return datos
+
+    def _indexar(self):
+        self.posiciones = {}
+        profesores = self.columnas['profesor']
+        if isinstance(profesores, ColumnaTexto):
+            profesores = profesores.valores()
+        for i, profesor in enumerate(profesores):
+            self.posiciones.setdefault(profesor, i)
+
+        self.nombres = sorted(self.posiciones)
+
+    def _separar_reseñas(self, df: pd.DataFrame):
+        n_filas = self.n_filas
+        separadas = {
+            columna: _separar(df[columna])
+            for columna in COLUMNAS_RESEÑAS if columna in df
+        }
+
+        # Número de reseñas por fila: la lista más larga entre las columnas
+        longitudes = np.zeros(n_filas, dtype=np.int64)
+        for conteos, _ in separadas.values():
+            longitudes = np.maximum(longitudes, conteos)
+
+        self.offsets = np.zeros(n_filas + 1, dtype=np.int64)
+        np.cumsum(longitudes, out=self.offsets[1:])
+        total = int(self.offsets[-1])
+
+        self.reseñas = {}
+        for columna, (conteos, partes) in separadas.items():
+            if columna == 'fecha':
+                valores = _parsear_fechas(partes)
+                arreglo = np.full(total, np.datetime64('NaT'), dtype='datetime64[ns]')
+            else:
+                valores = _a_numeros(partes)
+                arreglo = np.full(total, np.nan)
+
+            if np.array_equal(conteos, longitudes):
+                arreglo[:] = valores
+            else:
+                # Columna con menos valores en alguna fila: se rellena el final con NaN/NaT
+                filas = np.repeat(np.arange(n_filas), conteos)
+                inicio = np.repeat(np.cumsum(conteos) - conteos, conteos)
+                arreglo[self.offsets[filas] + np.arange(len(valores)) - inicio] = valores
+            self.reseñas[columna] = arreglo
+
+    def _agregar_semestres(self):
+        n_filas = self.n_filas
+        fechas = self.reseñas['fecha']
+        validas = ~np.isnat(fechas)
+
+        # Código entero del semestre: 2 * año + 0 (enero-junio) o 1 (julio-diciembre)
+        meses = fechas.astype('datetime64[M]').astype(np.int64)
+        codigos = (meses // 12 + 1970) * 2 + (meses % 12 >= 6)
+        filas = np.repeat(np.arange(n_filas), np.diff(self.offsets))
+
+        grupos = pd.DataFrame({
+            'fila': filas[validas],
+            'codigo': codigos[validas],
+            'facilidad': self.reseñas['facilidad'][validas],
+            'calidad': self.reseñas['calidad_general'][validas],
+        }).groupby(['fila', 'codigo'], sort=True)
+        resumen = grupos[['facilidad', 'calidad']].mean()
+        resumen['n'] = grupos.size()
+        resumen = resumen.reset_index()
+
+        self.semestres = {
+            campo: resumen[campo].to_numpy()
+            for campo in ('codigo', 'facilidad', 'calidad', 'n')
+        }
+        self.offsets_semestres = np.zeros(n_filas + 1, dtype=np.int64)
+        np.cumsum(np.bincount(resumen['fila'], minlength=n_filas), out=self.offsets_semestres[1:])
+
+    def _codificar_puntajes(self):
+        self.puntajes = {
+            columna: ColumnaPuntajes.desde_valores(self.reseñas[columna], self.offsets)
+            for columna in COLUMNAS_PUNTAJES if columna in self.reseñas
+        }
+
+    def arreglos(self) -> dict:
+        """
+        Devuelve todo el estado como arreglos de NumPy con nombres planos.
+        Returns:
+            dict: Nombre -> arreglo, en el formato que leen `guardar` y `desde_directorio`.
+        """
+        arreglos = {'offsets': self.offsets, 'offsets_semestres': self.offsets_semestres}
+        for columna, valores in self.columnas.items():
+            if isinstance(valores, ColumnaTexto):
+                for parte, arreglo in valores.arreglos().items():
+                    arreglos[f"texto.{columna}.{parte}"] = arreglo
+            else:
+                arreglos[f"columna.{columna}"] = valores
+        for columna, arreglo in self.reseñas.items():
+            arreglos[f"reseñas.{columna}"] = arreglo
+        for parte, arreglo in self.tags.arreglos().items():
+            arreglos[f"etiquetas.{parte}"] = arreglo
+        for campo, arreglo in self.semestres.items():
+            arreglos[f"semestres.{campo}"] = arreglo
+        for columna, puntajes in self.puntajes.items():
+            for parte, arreglo in puntajes.arreglos().items():
+                arreglos[f"puntajes.{columna}.{parte}"] = arreglo
+        return arreglos
+
+    @classmethod
+    def desde_arreglos(cls, arreglos: dict, version: str | None = None) -> "DatosProfesores":
+        """
+        Reconstruye los datos a partir de `arreglos()` sin volver a preprocesar.
+        Args:
+            arreglos (dict): Nombre -> arreglo, como lo devuelve `arreglos()`.
+            version (str | None): Versión del conjunto de datos.
+        Returns:
+            DatosProfesores: Datos que usan los mismos arreglos (sin copiarlos).
+        """
+        datos = cls.__new__(cls)
+        datos.version = version
+        datos.directorio = datos.hash_datos = None
+        datos.offsets = arreglos['offsets']
+        datos.offsets_semestres = arreglos['offsets_semestres']
+        datos.n_filas = len(datos.offsets) - 1
+        datos.columnas, datos.reseñas, datos.semestres = {}, {}, {}
+
+        textos, etiquetas, puntajes = {}, {}, {}
+        for nombre, arreglo in arreglos.items():
+            tipo, _, resto = nombre.partition('.')
+            if tipo == 'columna':
+                datos.columnas[resto] = arreglo
+            elif tipo == 'texto':
+                columna, _, parte = resto.rpartition('.')
+                textos.setdefault(columna, {})[parte] = arreglo
+            elif tipo == 'reseñas':
+                datos.reseñas[resto] = arreglo
+            elif tipo == 'semestres':
+                datos.semestres[resto] = arreglo
+            elif tipo == 'etiquetas':
+                etiquetas[resto] = arreglo
+            elif tipo == 'puntajes':
+                columna, _, parte = resto.rpartition('.')
+                puntajes.setdefault(columna, {})[parte] = arreglo
+        for columna, partes in textos.items():
+            datos.columnas[columna] = ColumnaTexto(**partes)
+        datos.tags = ColumnaEtiquetas.desde_arreglos(etiquetas)
+        datos.puntajes = {columna: ColumnaPuntajes.desde_arreglos(partes) for columna, partes in puntajes.items()}
+
+        datos._indexar()
+        return datos
+
+    def guardar(self, directorio: Path):
+        """
+        Guarda los datos preprocesados como un archivo .npy por arreglo.
+        Args:
+            directorio (Path): Carpeta destino; se crea si no existe.
+        """
+        _guardar_arreglos(self.arreglos(), directorio, hash_datos=self.hash_datos)
+
+    @classmethod
+    def desde_directorio(cls, directorio: Path, version: str | None = None) -> "DatosProfesores":
+        """
+        Carga datos guardados con `guardar`; los arreglos se abren con memory-map.
+        Args:
+            directorio (Path): Carpeta creada por `guardar`.
+            version (str | None): Versión del conjunto de datos.
+        Returns:
+            DatosProfesores: Datos listos para usarse, sin volver a preprocesar.
+        """
+        arreglos, estado = _abrir_arreglos(directorio)
+        datos = cls.desde_arreglos(arreglos, version)
+        datos.directorio = directorio
+        datos.hash_datos = estado.get('hash_datos')
+        return datos
+
+    def __len__(self) -> int:
+        return len(self.posiciones)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.posiciones
+
+    def posicion(self, name: str) -> int | None:
+        """
+        Obtiene la fila de un profesor.
+        Args:
+            name (str): Nombre del profesor.
+        Returns:
+            int | None: Posición de la fila o None si el profesor no existe.
+        """
+        return self.posiciones.get(name)
+
+    def valor(self, name: str, columna: str, default=None):
+        """
+        Obtiene el valor de una columna para un profesor.
+        Args:
+            name (str): Nombre del profesor.
+            columna (str): Nombre de la columna.
+            default: Valor devuelto si el profesor no existe.
+        Returns:
+            Valor de la columna para el profesor.
+        """
+        pos = self.posiciones.get(name)
+        if pos is None:
+            return default
+        return self.columnas[columna][pos]
+
+    def valores(self, name: str, columna: str) -> np.ndarray | None:
+        """
+        Obtiene los valores por reseña de un profesor sin volver a separar el texto.
+        Args:
+            name (str): Nombre del profesor.
+            columna (str): Una de `COLUMNAS_RESEÑAS`.
+        Returns:
+            np.ndarray | None: Vista del arreglo de reseñas o None si el profesor no existe.
+        """
+        pos = self.posiciones.get(name)
+        if pos is None:
+            return None
+        return self.reseñas[columna][self.offsets[pos]:self.offsets[pos + 1]]
+
+    def histograma(self, name: str, columna: str) -> tuple[np.ndarray, np.ndarray] | None:
+        """
+        Obtiene el histograma precalculado de los puntajes de un profesor.
+        Args:
+            name (str): Nombre del profesor.
+            columna (str): Una de `COLUMNAS_PUNTAJES`.
+        Returns:
+            tuple[np.ndarray, np.ndarray] | None: Valores presentes y número de reseñas con cada
+            uno (vacíos si no tiene reseñas); None si el profesor no existe.
+        """
+        pos = self.posiciones.get(name)
+        if pos is None:
+            return None
+        return self.puntajes[columna].histograma(pos)
+
+    def tags_de(self, name: str) -> list[str] | None:
+        """
+        Obtiene las etiquetas de un profesor.
+        Args:
+            name (str): Nombre del profesor.
+        Returns:
+            list[str] | None: Etiquetas (vacía si no tiene) o None si el profesor no existe.
+        """
+        pos = self.posiciones.get(name)
+        if pos is None:
+            return None
+        return self.tags[pos]
+
+    def semestres_de(self, name: str) -> pd.DataFrame | None:
+        """
+        Obtiene los promedios por semestre de un profesor.
+        Args:
+            name (str): Nombre del profesor.
+        Returns:
+            pd.DataFrame | None: Columnas `semestre`, `fecha_referencia`, `facilidad`,
+            `calidad` y `n`, ordenadas por semestre; None si el profesor no existe.
+        """
+        pos = self.posiciones.get(name)
+        if pos is None:
+            return None
+        rango = slice(self.offsets_semestres[pos], self.offsets_semestres[pos + 1])
+
+        # Etiqueta "2025-1" y fecha de referencia (1 de enero o 1 de julio)
+        codigos = np.asarray(self.semestres['codigo'][rango])
+        año, segundo = codigos // 2, codigos % 2
+        return pd.DataFrame({
+            'semestre': [f"{a}-{s + 1}" for a, s in zip(año, segundo)],
+            'fecha_referencia': ((año - 1970) * 12 + segundo * 6).astype('datetime64[M]').astype('datetime64[ns]'),
+            'facilidad': self.semestres['facilidad'][rango],
+            'calidad': self.semestres['calidad'][rango],
+            'n': self.semestres['n'][rango],
+        })
+
+    def tabla_reseñas(self) -> pd.DataFrame:
+        """
+        Construye la tabla larga con una fila por reseña.
+        Returns:
+            pd.DataFrame: Columnas `profesor`, `fila` y las de `COLUMNAS_RESEÑAS`.
+        """
+        filas = np.repeat(np.arange(self.n_filas), np.diff(self.offsets))
+        profesores = self.columnas['profesor']
+        nombres = np.array([profesores[i] for i in range(self.n_filas)], dtype=object)
+        return pd.DataFrame({
+            'profesor': nombres[filas],
+            'fila': filas,
+            **self.reseñas
+        })
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("El dataset columnar necesita pyarrow: pip install pyarrow") from e
+    return pa, pq
+
+
+def _texto_a_arrow(pa, columna: ColumnaTexto):
+    # Usa el buffer y los offsets de la columna tal cual (sin crear un str por fila)
+    validos = np.packbits(~np.asarray(columna.nulos, dtype=bool), bitorder='little')
+    return pa.Array.from_buffers(pa.large_string(), len(columna), [
+        pa.py_buffer(validos),
+        pa.py_buffer(np.ascontiguousarray(columna.offsets, dtype=np.int64)),
+        pa.py_buffer(np.ascontiguousarray(columna.buffer)),
+    ])
+
+
+def _texto_desde_arrow(pa, columna) -> ColumnaTexto:
+    columna = columna.cast(pa.large_string()).combine_chunks()
+    nulos = columna.is_null().to_numpy(zero_copy_only=False)
+    if len(columna) == 0:
+        return ColumnaTexto(np.zeros(0, dtype=np.uint8), np.zeros(1, dtype=np.int64), nulos)
+    _, offsets, buffer = columna.buffers()
+    offsets = np.frombuffer(offsets, dtype=np.int64)[columna.offset:columna.offset + len(columna) + 1]
+    buffer = np.frombuffer(buffer, dtype=np.uint8) if buffer is not None else np.zeros(0, dtype=np.uint8)
+    return ColumnaTexto(buffer[offsets[0]:offsets[-1]], offsets - offsets[0], nulos)
+
+
+def escribir_dataset(datos: DatosProfesores, destino: str | Path = DATASET_PATH) -> Path:
+    """
+    Escribe los datos como un dataset columnar de dos tablas Parquet.
+
+    - `profesores.parquet`: una fila por profesor con un `id` entero, las columnas
+      por profesor y `tags` como lista de etiquetas codificadas con diccionario.
+    - `reseñas.parquet`: una fila por reseña con `id_profesor`, `fecha` (date32) y
+      `rating`, `calidad_general` y `facilidad` (float32), agrupadas por profesor.
+
+    A diferencia del CSV no hay listas dentro de textos, así que leerlo no requiere
+    separar ni parsear. Cada archivo se escribe aparte y se renombra al terminar.
+    Args:
+        datos (DatosProfesores): Datos a escribir (p. ej. `DatosProfesores(pd.read_csv(csv))`).
+        destino (str | Path): Carpeta del dataset; se crea si no existe.
+    Returns:
+        Path: Carpeta del dataset.
+    """
+    pa, pq = _pyarrow()
+    destino = Path(destino)
+    destino.mkdir(parents=True, exist_ok=True)
+
+    profesores = {'id': pa.array(np.arange(datos.n_filas, dtype=np.int32))}
+    for columna, valores in datos.columnas.items():
+        if isinstance(valores, ColumnaTexto):
+            profesores[columna] = _texto_a_arrow(pa, valores)
+        else:
+            profesores[columna] = pa.array(np.asarray(valores), from_pandas=True)
+    profesores['tags'] = pa.LargeListArray.from_arrays(
+        pa.array(np.asarray(datos.tags.offsets, dtype=np.int64)),
+        pa.DictionaryArray.from_arrays(pa.array(np.asarray(datos.tags.codigos, dtype=np.int32)),
+                                       pa.array(datos.tags.vocabulario, pa.string())),
+    )
+
+    filas = np.repeat(np.arange(datos.n_filas, dtype=np.int32), np.diff(datos.offsets))
+    reseñas = {'id_profesor': pa.array(filas)}
+    for columna, valores in datos.reseñas.items():
+        if columna == 'fecha':
+            reseñas[columna] = pa.array(np.asarray(valores), from_pandas=True).cast(pa.date32())
+        else:
+            reseñas[columna] = pa.array(np.asarray(valores, dtype=np.float32), from_pandas=True)
+
+    for nombre, columnas in ((ARCHIVO_PROFESORES, profesores), (ARCHIVO_RESEÑAS, reseñas)):
+        temporal = destino / f".{nombre}.tmp"
+        pq.write_table(pa.table(columnas), temporal, compression="zstd")
+        os.replace(temporal, destino / nombre)
+    return destino
+
+
+def leer_dataset(carpeta: str | Path = DATASET_PATH, version: str | None = None) -> DatosProfesores:
+    """
+    Lee el dataset columnar de `escribir_dataset` directamente a los arreglos de
+    `DatosProfesores` (los textos y las etiquetas se copian desde los buffers de Arrow).
+    Args:
+        carpeta (str | Path): Carpeta del dataset.
+        version (str | None): Versión del conjunto de datos.
+    Returns:
+        DatosProfesores: Datos indexados.
+    Raises:
+        ValueError: Si alguna reseña apunta a un profesor que no existe.
+    """
+    pa, pq = _pyarrow()
+    carpeta = Path(carpeta)
+    profesores = pq.read_table(carpeta / ARCHIVO_PROFESORES)
+    reseñas = pq.read_table(carpeta / ARCHIVO_RESEÑAS)
+
+    ids = profesores.column('id').to_numpy()
+    if np.any(np.diff(ids) < 0):
+        profesores = profesores.take(np.argsort(ids, kind='stable'))
+        ids = profesores.column('id').to_numpy()
+
+    columnas = {}
+    for nombre in profesores.column_names:
+        if nombre in ('id', 'tags'):
+            continue
+        columna = profesores.column(nombre)
+        if pa.types.is_string(columna.type) or pa.types.is_large_string(columna.type):
+            columnas[nombre] = _texto_desde_arrow(pa, columna)
+        else:
+            columnas[nombre] = columna.to_numpy()
+
+    tags = profesores.column('tags').cast(pa.large_list(pa.string())).combine_chunks()
+    offsets = np.asarray(tags.offsets, dtype=np.int64)
+    valores = tags.flatten().dictionary_encode()
+    tags = ColumnaEtiquetas(valores.indices.to_numpy(zero_copy_only=False).astype(np.int32),
+                            offsets - offsets[0], valores.dictionary.to_pylist())
+
+    # Fila de cada reseña; si no vienen agrupadas por profesor se ordenan
+    id_profesor = reseñas.column('id_profesor').to_numpy()
+    filas = np.searchsorted(ids, id_profesor)
+    if len(filas) and (filas.max() >= len(ids) or np.any(ids[filas] != id_profesor)):
+        raise ValueError(f"{carpeta / ARCHIVO_RESEÑAS} tiene reseñas de profesores que no existen")
+    orden = None
+    if np.any(np.diff(filas) < 0):
+        orden = np.argsort(filas, kind='stable')
+        filas = filas[orden]
+
+    valores_reseñas = {}
+    for columna in COLUMNAS_RESEÑAS:
+        if columna not in reseñas.column_names:
+            continue
+        arreglo = reseñas.column(columna)
+        if columna == 'fecha':
+            arreglo = arreglo.cast(pa.timestamp('ns')).to_numpy(zero_copy_only=False)
+        else:
+            arreglo = arreglo.to_numpy(zero_copy_only=False).astype(np.float64)
+        valores_reseñas[columna] = arreglo if orden is None else arreglo[orden]
+
+    return DatosProfesores.desde_columnas(columnas, tags, filas, valores_reseñas, version)
+
+
+def resolver_ruta(ruta: str | Path | None = None) -> Path:
+    """
+    Resuelve la ruta de los datos: `ruta`, la variable de entorno `PROFESORES_DATA`,
+    el dataset columnar `data/professor_data/` (si existe y pyarrow está instalado)
+    o `data/professor_data.csv`.
+    Args:
+        ruta (str | Path | None): Ruta explícita (CSV o carpeta del dataset).
+    Returns:
+        Path: Ruta a usar.
+    """
+    ruta = ruta or os.environ.get("PROFESORES_DATA")
+    if ruta:
+        return Path(ruta)
+    return _ruta_en(DATA_DIR)
+
+
+def _ruta_en(carpeta: Path) -> Path:
+    # Dataset columnar de la carpeta si existe y hay pyarrow; si no, su CSV
+    dataset = carpeta / DATASET_PATH.name
+    if (dataset / ARCHIVO_PROFESORES).exists() and importlib.util.find_spec("pyarrow"):
+        return dataset
+    return carpeta / DATA_PATH.name
+
+
+def _archivos(ruta: Path) -> list[Path]:
+    # Archivos que forman los datos: el CSV o las tablas del dataset columnar
+    return [ruta / ARCHIVO_PROFESORES, ruta / ARCHIVO_RESEÑAS] if ruta.is_dir() else [ruta]
+
+
+def _leer(ruta: Path, version: str | None) -> DatosProfesores:
+    if ruta.is_dir():
+        return leer_dataset(ruta, version)
+    return DatosProfesores(pd.read_csv(ruta), version)
+
+
+def _firma(ruta: Path) -> str:
+    """
+    Calcula la clave de caché de los datos a partir de su ruta, mtime y tamaño.
+    Args:
+        ruta (Path): CSV o carpeta del dataset columnar.
+    Returns:
+        str: Hash que cambia cuando algún archivo se modifica.
+    """
+    partes = [str(ruta.resolve())]
+    for archivo in _archivos(ruta):
+        info = archivo.stat()
+        partes.append(f"{info.st_mtime_ns}|{info.st_size}")
+    clave = "|".join(partes + [str(VERSION_CACHE)])
+    return md5(clave.encode()).hexdigest()
+
+
+def firma_datos(ruta: str | Path | None = None) -> str:
+    """
+    Versión que tendrían los datos al cargarlos con `cargar_datos` (sin leerlos).
+    Args:
+        ruta (str | Path | None): Ruta del CSV o del dataset columnar (se resuelve con `resolver_ruta`).
+    Returns:
+        str: Firma de la ruta, su mtime y su tamaño; es la `version` de `DatosProfesores`.
+    Raises:
+        OSError: Si algún archivo de los datos no existe.
+    """
+    return _firma(resolver_ruta(ruta))
+
+
+def cargar_datos(ruta: str | Path | None = None, cache_dir: str | Path | None = None) -> DatosProfesores:
+    """
+    Carga los datos de los profesores priorizando la copia local y una caché binaria.
+
+    La ruta se resuelve con `resolver_ruta` (el dataset columnar si existe, si no el
+    CSV). Los datos preprocesados se guardan en una carpeta de caché por archivo
+    (`PROFESORES_CACHE`, por defecto `data/cache`) cuyo nombre depende del mtime y
+    tamaño de los datos, así que cualquier cambio la invalida.
+    Solo si no existe una copia local se descarga el CSV desde GitHub.
+    Args:
+        ruta (str | Path | None): Ruta del CSV o de la carpeta del dataset columnar.
+        cache_dir (str | Path | None): Carpeta de caché.
+    Returns:
+        DatosProfesores: Datos indexados y preprocesados.
+    """
+    ruta = resolver_ruta(ruta)
+    if not ruta.exists():
+        print(f"No se encontró {ruta}, descargando los datos desde {URL}")
+        return DatosProfesores(pd.read_csv(URL), version=uuid4().hex)
+
+    cache_dir = Path(cache_dir or os.environ.get("PROFESORES_CACHE", CACHE_DIR))
+    version = _firma(ruta)
+    destino = cache_dir / version
+    if (destino / "estado.json").exists():
+        try:
+            return DatosProfesores.desde_directorio(destino, version)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"⚠️ Caché inválida en {destino}: {e}. Se reconstruye.")
+
+    datos = _leer(ruta, version)
+    datos.hash_datos = hash_archivo(ruta)
+    try:
+        _escribir_cache(datos, cache_dir, destino)
+        datos.directorio = destino
+    except OSError as e:
+        print(f"⚠️ No se pudo escribir la caché en {cache_dir}: {e}")
+    return datos
+
+
+def _escribir_cache(datos: DatosProfesores, cache_dir: Path, destino: Path):
+    _publicar(datos.guardar, cache_dir, destino)
+
+
+def _guardar_arreglos(arreglos: dict, directorio: Path, **estado):
+    # Un .npy por arreglo y `estado.json` con sus nombres (más `estado`)
+    directorio.mkdir(parents=True, exist_ok=True)
+    for nombre, arreglo in arreglos.items():
+        np.save(directorio / f"{nombre}.npy", arreglo)
+    with open(directorio / "estado.json", "w", encoding="utf-8") as f:
+        json.dump({'arreglos': list(arreglos), **estado}, f, ensure_ascii=False)
+
+
+def _abrir_arreglos(directorio: Path) -> tuple[dict, dict]:
+    # Arreglos de `_guardar_arreglos` abiertos con memory-map y el contenido de `estado.json`
+    with open(directorio / "estado.json", encoding="utf-8") as f:
+        estado = json.load(f)
+    arreglos = {nombre: np.load(directorio / f"{nombre}.npy", mmap_mode='r') for nombre in estado['arreglos']}
+    return arreglos, estado
+
+
+def arreglos_derivados(datos: DatosProfesores, nombre: str, construir) -> dict:
+    """
+    Arreglos calculados a partir de los datos (p. ej. el índice de búsqueda) que se
+    guardan en una subcarpeta de su caché binaria: la primera vez se construyen y las
+    siguientes (en cualquier proceso) solo se abren con memory-map.
+    Args:
+        datos (DatosProfesores): Datos de `cargar_datos`; sin `directorio` no se guarda nada.
+        nombre (str): Nombre de la subcarpeta.
+        construir: Función (datos) -> dict de nombre -> arreglo de NumPy.
+    Returns:
+        dict: Nombre -> arreglo.
+    """
+    if datos.directorio is None:
+        return construir(datos)
+    destino = datos.directorio / nombre
+    if (destino / "estado.json").exists():
+        try:
+            return _abrir_arreglos(destino)[0]
+        except (OSError, KeyError, ValueError) as e:
+            print(f"⚠️ Caché inválida en {destino}: {e}. Se reconstruye.")
+
+    arreglos = construir(datos)
+    # Se escribe aparte y se renombra; si otro proceso ya la publicó se usa la suya
+    temporal = Path(tempfile.mkdtemp(dir=datos.directorio, prefix=".tmp-"))
+    try:
+        _guardar_arreglos(arreglos, temporal)
+        os.rename(temporal, destino)
+    except OSError as e:
+        shutil.rmtree(temporal, ignore_errors=True)
+        if not destino.exists():
+            print(f"⚠️ No se pudo escribir la caché en {destino}: {e}")
+    return arreglos
+
+
+def _publicar(escribir, directorio: Path, destino: Path):
+    # Se escribe en una carpeta temporal y se renombra para que otro proceso
+    # nunca lea una carpeta a medias; las versiones anteriores se borran.
+    directorio.mkdir(parents=True, exist_ok=True)
+    temporal = Path(tempfile.mkdtemp(dir=directorio, prefix=".tmp-"))
+    try:
+        escribir(temporal)
+        os.rename(temporal, destino)
+    except OSError:
+        shutil.rmtree(temporal, ignore_errors=True)
+        if not destino.exists():
+            raise
+        return
+
+    for anterior in directorio.iterdir():
+        if anterior.is_dir() and anterior != destino and not anterior.name.startswith(".tmp-"):
+            shutil.rmtree(anterior, ignore_errors=True)
+
+
+def carpeta_facultad(facultad: str, directorio: str | Path | None = None) -> Path:
+    """
+    Carpeta de la partición de una facultad: tiene la misma estructura que `data/`
+    (tablas del scraping, archivos individuales, datos procesados) más su propia
+    caché binaria (`cache/`) y sus dashboards prerenderizados (`prerender/`).
+    Args:
+        facultad (str): Identificador de la facultad (nombre de la carpeta).
+        directorio (str | Path | None): Carpeta base (`PROFESORES_FACULTADES` o `data/facultades`).
+    Returns:
+        Path: Carpeta de la facultad.
+    """
+    return Path(directorio or os.environ.get("PROFESORES_FACULTADES", FACULTADES_DIR)) / facultad
+
+
+def ruta_facultad(facultad: str, directorio: str | Path | None = None) -> Path:
+    """
+    Ruta de los datos procesados de una facultad (dataset columnar o CSV, como `resolver_ruta`).
+    Args:
+        facultad (str): Identificador de la facultad.
+        directorio (str | Path | None): Carpeta base de las facultades.
+    Returns:
+        Path: Ruta de los datos.
+    """
+    return _ruta_en(carpeta_facultad(facultad, directorio))
+
+
+def listar_facultades(directorio: str | Path | None = None) -> dict[str, str]:
+    """
+    Lista las facultades con datos procesados, sin cargarlos.
+    El nombre visible se toma de `facultad.json` (lo escribe scrap-links.py) o del identificador.
+    Args:
+        directorio (str | Path | None): Carpeta base de las facultades.
+    Returns:
+        dict[str, str]: Identificador -> nombre, en orden alfabético de identificador.
+    """
+    base = Path(directorio or os.environ.get("PROFESORES_FACULTADES", FACULTADES_DIR))
+    if not base.is_dir():
+        return {}
+    facultades = {}
+    for carpeta in sorted(base.iterdir()):
+        if not carpeta.is_dir() or not _ruta_en(carpeta).exists():
+            continue
+        nombre = carpeta.name
+        if (carpeta / "facultad.json").exists():
+            with open(carpeta / "facultad.json", encoding="utf-8") as f:
+                nombre = json.load(f).get("nombre", nombre)
+        facultades[carpeta.name] = nombre
+    return facultades
+
+
+def cargar_facultad(facultad: str, directorio: str | Path | None = None) -> DatosProfesores:
+    """
+    Carga los datos de una facultad con `cargar_datos`, usando la caché binaria de su partición.
+    Args:
+        facultad (str): Identificador de la facultad.
+        directorio (str | Path | None): Carpeta base de las facultades.
+    Returns:
+        DatosProfesores: Datos indexados de la facultad.
+    Raises:
+        FileNotFoundError: Si la facultad no tiene datos procesados.
+    """
+    ruta = ruta_facultad(facultad, directorio)
+    if not ruta.exists():
+        raise FileNotFoundError(f"No hay datos de la facultad '{facultad}' en {ruta}")
+    return cargar_datos(ruta, carpeta_facultad(facultad, directorio) / "cache")
+
+
+class CacheFacultades:
+    """
+    Carga perezosa de las particiones por facultad con un máximo de facultades en memoria.
+
+    `obtener` carga una facultad la primera vez que se pide (con la función
+    `cargar`) y la conserva mientras esté entre las `max_facultades` usadas más
+    recientemente; al pasar el límite se descarta la menos usada. Si varios hilos
+    piden la misma facultad a la vez solo uno la carga. Una facultad descartada
+    sigue siendo válida para quien ya la tenía (p. ej. un callback en curso) y
+    se libera cuando nadie la usa.
+    """
+
+    def __init__(self, cargar, max_facultades: int):
+        self.cargar = cargar
+        self.max_facultades = max_facultades
+        self.facultades = OrderedDict()
+        self.cargas = 0
+        self.descartes = 0
+        self._lock = threading.Lock()
+        self._cargando = {}
+
+    def obtener(self, facultad: str):
+        """
+        Obtiene los datos de una facultad, cargándolos si no están en memoria.
+        Args:
+            facultad (str): Identificador de la facultad.
+        Returns:
+            Lo que devuelve `cargar(facultad)`.
+        """
+        with self._lock:
+            if facultad in self.facultades:
+                self.facultades.move_to_end(facultad)
+                return self.facultades[facultad]
+            candado = self._cargando.setdefault(facultad, threading.Lock())
+
+        with candado:
+            with self._lock:
+                if facultad in self.facultades:
+                    self.facultades.move_to_end(facultad)
+                    return self.facultades[facultad]
+            valor = self.cargar(facultad)
+            with self._lock:
+                self.facultades[facultad] = valor
+                self._cargando.pop(facultad, None)
+                self.cargas += 1
+                while len(self.facultades) > self.max_facultades:
+                    self.facultades.popitem(last=False)
+                    self.descartes += 1
+            return valor
+
+    def __contains__(self, facultad: str) -> bool:
+        with self._lock:
+            return facultad in self.facultades
+
+    def cargadas(self) -> list[tuple]:
+        """
+        Facultades en memoria en este momento.
+        Returns:
+            list[tuple]: Pares (facultad, valor), de la menos a la más usada.
+        """
+        with self._lock:
+            return list(self.facultades.items())
+
+    def reemplazar(self, facultad: str, valor) -> bool:
+        """
+        Cambia los datos de una facultad en memoria por otros (p. ej. una versión nueva).
+        Quien ya obtuvo el valor anterior lo sigue usando hasta terminar.
+        Args:
+            facultad (str): Identificador de la facultad.
+            valor: Nuevo valor, como lo devuelve `cargar`.
+        Returns:
+            bool: False si la facultad ya no estaba en memoria (la próxima carga leerá los datos nuevos).
+        """
+        with self._lock:
+            if facultad not in self.facultades:
+                return False
+            self.facultades[facultad] = valor
+            return True
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            return {
+                'cargadas': list(self.facultades),
+                'cargas': self.cargas,
+                'descartes': self.descartes,
+                'max_facultades': self.max_facultades,
+            }
+
+
+def hash_archivo(ruta: str | Path) -> str:
+    """
+    Calcula el md5 del contenido de los datos (no depende de su mtime ni de su ruta).
+    Args:
+        ruta (str | Path): CSV o carpeta del dataset columnar (se leen sus dos tablas).
+    Returns:
+        str: Hash hexadecimal del contenido.
+    """
+    h = md5()
+    for archivo in _archivos(Path(ruta)):
+        with open(archivo, "rb") as f:
+            for bloque in iter(lambda: f.read(1 << 20), b""):
+                h.update(bloque)
+    return h.hexdigest()
+
+
+def guardar_dashboards(registros, hash_datos: str, directorio: str | Path | None = None) -> Path:
+    """
+    Escribe dashboards prerenderizados en un solo archivo indexado.
+
+    Cada registro es el JSON de las salidas de los callbacks comprimido con zlib; se
+    guardan uno tras otro en `dashboards.bin` y `indice.json` guarda el offset y
+    la longitud de cada profesor. Todo va en una carpeta nombrada con el hash de
+    los datos, así que la app solo la usa si coincide con sus datos (y con `FORMATO_DASHBOARDS`).
+    Args:
+        registros: Iterable de pares (nombre, bytes JSON sin comprimir).
+        hash_datos (str): `hash_archivo` de los datos con los que se renderizó.
+        directorio (str | Path | None): Carpeta base (`PROFESORES_PRERENDER` o `data/prerender`).
+    Returns:
+        Path: Carpeta con los dashboards.
+    """
+    directorio = Path(directorio or os.environ.get("PROFESORES_PRERENDER", PRERENDER_DIR))
+    destino = directorio / hash_datos
+
+    def escribir(carpeta: Path):
+        indice = {}
+        offset = 0
+        with open(carpeta / "dashboards.bin", "wb") as f:
+            for nombre, salida in registros:
+                comprimido = zlib.compress(salida, 6)
+                f.write(comprimido)
+                indice[nombre] = [offset, len(comprimido)]
+                offset += len(comprimido)
+        with open(carpeta / "indice.json", "w", encoding="utf-8") as f:
+            json.dump({'hash_datos': hash_datos, 'formato': FORMATO_DASHBOARDS, 'profesores': indice}, f,
+                      ensure_ascii=False)
+
+    if destino.exists():
+        shutil.rmtree(destino)
+    _publicar(escribir, directorio, destino)
+    return destino
+
+
+class DashboardsPrecalculados:
+    """
+    Lector de los dashboards escritos por `guardar_dashboards`.
+    Obtener un dashboard es leer un rango del archivo (abierto con mmap) y descomprimirlo.
+    """
+
+    def __init__(self, carpeta: Path):
+        with open(carpeta / "indice.json", encoding="utf-8") as f:
+            contenido = json.load(f)
+        self.formato = contenido.get('formato', 1)
+        self.indice = contenido['profesores']
+        with open(carpeta / "dashboards.bin", "rb") as f:
+            self._mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.indice else b""
+
+    @classmethod
+    def abrir(cls, ruta_datos: str | Path | None = None, directorio: str | Path | None = None,
+              hash_datos: str | None = None):
+        """
+        Abre los dashboards que corresponden a los datos actuales, si existen.
+        Args:
+            ruta_datos (str | Path | None): Ruta de los datos (misma resolución que `cargar_datos`).
+            directorio (str | Path | None): Carpeta base de los dashboards.
+            hash_datos (str | None): `hash_archivo` de los datos si ya se conoce (p. ej.
+                `DatosProfesores.hash_datos`); si no, se calcula.
+        Returns:
+            DashboardsPrecalculados | None: None si no hay dashboards para estos datos.
+        """
+        ruta_datos = resolver_ruta(ruta_datos)
+        directorio = Path(directorio or os.environ.get("PROFESORES_PRERENDER", PRERENDER_DIR))
+        if not ruta_datos.exists():
+            return None
+        carpeta = directorio / (hash_datos or hash_archivo(ruta_datos))
+        if not (carpeta / "indice.json").exists():
+            return None
+        dashboards = cls(carpeta)
+        if dashboards.formato != FORMATO_DASHBOARDS:
+            print(f"Dashboards en {carpeta} con formato {dashboards.formato}; vuelve a generarlos.")
+            return None
+        return dashboards
+
+    def __len__(self) -> int:
+        return len(self.indice)
+
+    def __contains__(self, nombre: str) -> bool:
+        return nombre in self.indice
+
+    def obtener(self, nombre: str) -> dict | None:
+        """
+        Obtiene las salidas de los callbacks de un profesor.
+        Args:
+            nombre (str): Nombre del profesor.
+        Returns:
+            dict | None: Salidas de cada sección (ver `utils.generar_secciones`); None si no está.
+        """
+        posicion = self.indice.get(nombre)
+        if posicion is None:
+            return None
+        offset, longitud = posicion
+        return json.loads(zlib.decompress(self._mapa[offset:offset + longitud]))
@@ -0,0 +1,12 @@
+import gc
+import os
+
+# Cargar y preprocesar los datos una sola vez en el proceso maestro; los
+# workers los heredan por fork y comparten las páginas (copy-on-write).
+preload_app = True
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+
+def pre_fork(server, worker):
+    # Mover los objetos ya creados a la generación permanente para que el
+    # recolector de basura de cada worker no los toque y no se copien sus páginas.
+    gc.freeze()
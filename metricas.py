@@ -0,0 +1,250 @@
+"""
+Métricas de rendimiento del servidor en formato de texto de Prometheus.
+
+- `medir(nombre)` decora un renderer de `utils.py` o un callback y registra su
+  latencia en un histograma.
+- `instrumentar(server)` mide cada petición de Dash (tiempo total, que incluye
+  la serialización a JSON, y bytes de la respuesta) por callback, publica
+  `/metrics` y, si `PROFESORES_PERFIL` es 'cprofile' o 'pyinstrument', permite
+  perfilar una sola petición.
+
+Cada proceso de gunicorn tiene sus propias métricas: `/metrics` muestra las del
+worker que atiende la petición.
+"""
+import functools
+import os
+import threading
+import time
+from pathlib import Path
+
+from flask import Response, g, jsonify, request
+
+BASE_DIR = Path(__file__).resolve().parent
+# Perfiles guardados por el hook de perfilado
+PERFILES_DIR = BASE_DIR / "data" / "perfiles"
+
+# Límites superiores de los intervalos de los histogramas
+LIMITES_SEGUNDOS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+LIMITES_BYTES = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histograma:
+    """Histograma acumulado al estilo de Prometheus (conteo por intervalo, suma y total)."""
+
+    def __init__(self, limites: tuple):
+        self.limites = limites
+        self.conteos = [0] * (len(limites) + 1)
+        self.suma = 0.0
+        self.total = 0
+
+    def observar(self, valor: float):
+        i = 0
+        while i < len(self.limites) and valor > self.limites[i]:
+            i += 1
+        self.conteos[i] += 1
+        self.suma += valor
+        self.total += 1
+
+
+class Registro:
+    """
+    Histogramas por nombre de métrica y etiqueta, seguros entre hilos, y
+    funciones que devuelven valores instantáneos (p. ej. estadísticas de cachés).
+    """
+
+    def __init__(self):
+        self._histogramas = {}
+        self._ayuda = {}
+        self._valores = []
+        self._lock = threading.Lock()
+
+    def observar(self, metrica: str, etiqueta: tuple[str, str], valor: float, limites: tuple, ayuda: str = ""):
+        with self._lock:
+            histogramas = self._histogramas.setdefault(metrica, {})
+            histograma = histogramas.get(etiqueta)
+            if histograma is None:
+                histograma = histogramas[etiqueta] = Histograma(limites)
+                self._ayuda.setdefault(metrica, ayuda)
+            histograma.observar(valor)
+
+    def agregar_valores(self, funcion):
+        """
+        Registra una función que devuelve `[(métrica, tipo, valor, ayuda), ...]` al publicar las métricas.
+        Args:
+            funcion: Función sin argumentos; `tipo` es 'counter' o 'gauge'.
+        """
+        self._valores.append(funcion)
+
+    def limpiar(self):
+        with self._lock:
+            self._histogramas.clear()
+
+    def texto(self) -> str:
+        """
+        Publica todas las métricas.
+        Returns:
+            str: Métricas en el formato de texto de Prometheus (versión 0.0.4).
+        """
+        lineas = []
+        with self._lock:
+            for metrica, histogramas in sorted(self._histogramas.items()):
+                lineas.append(f"# HELP {metrica} {self._ayuda.get(metrica, '')}")
+                lineas.append(f"# TYPE {metrica} histogram")
+                for (clave, valor), histograma in sorted(histogramas.items()):
+                    etiqueta = f'{clave}="{_escapar(valor)}"'
+                    acumulado = 0
+                    for limite, conteo in zip((*histograma.limites, "+Inf"), histograma.conteos):
+                        acumulado += conteo
+                        lineas.append(f'{metrica}_bucket{{{etiqueta},le="{limite}"}} {acumulado}')
+                    lineas.append(f"{metrica}_sum{{{etiqueta}}} {histograma.suma}")
+                    lineas.append(f"{metrica}_count{{{etiqueta}}} {histograma.total}")
+        for funcion in self._valores:
+            for metrica, tipo, valor, ayuda in funcion():
+                lineas.append(f"# HELP {metrica} {ayuda}")
+                lineas.append(f"# TYPE {metrica} {tipo}")
+                lineas.append(f"{metrica} {valor}")
+        return "\n".join(lineas) + "\n"
+
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registro = Registro()
+
+
+def medir(nombre: str):
+    """
+    Decorador que registra la latencia de una función en `profesores_render_segundos`.
+    Args:
+        nombre (str): Valor de la etiqueta `seccion` (p. ej. el nombre del renderer).
+    Returns:
+        Decorador.
+    """
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def medida(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                registro.observar("profesores_render_segundos", ("seccion", nombre), time.perf_counter() - inicio,
+                                  LIMITES_SEGUNDOS, "Latencia de cada renderer o callback (sin serializar).")
+        return medida
+    return decorador
+
+
+def _callback(cuerpo: dict | None) -> str:
+    # Identifica el callback por el id de su primera salida (p. ej. 'indicador-1' o 'grafica-calidad')
+    salidas = (cuerpo or {}).get("outputs")
+    if isinstance(salidas, list):
+        salidas = salidas[0] if salidas else {}
+    if isinstance(salidas, dict) and isinstance(salidas.get("id"), str):
+        return salidas["id"]
+    return "desconocido"
+
+
+class _Perfilador:
+    """Perfila peticiones sueltas con cProfile o pyinstrument y guarda el resultado en `PERFILES_DIR`."""
+
+    def __init__(self, herramienta: str, directorio: Path = PERFILES_DIR):
+        if herramienta not in ("cprofile", "pyinstrument"):
+            raise ValueError(f"PROFESORES_PERFIL debe ser 'cprofile' o 'pyinstrument', no {herramienta!r}")
+        if herramienta == "pyinstrument":
+            try:
+                import pyinstrument  # noqa: F401
+            except ImportError as e:
+                raise ImportError("El perfilado con pyinstrument necesita pyinstrument: pip install pyinstrument") from e
+        self.herramienta = herramienta
+        self.directorio = Path(directorio)
+        self._armado = threading.Event()
+
+    def armar(self):
+        # La siguiente petición de Dash se perfila aunque no traiga el encabezado
+        self._armado.set()
+
+    def debe_perfilar(self) -> bool:
+        if request.headers.get("X-Perfil") == "1":
+            return True
+        if request.path == "/_dash-update-component" and self._armado.is_set():
+            self._armado.clear()
+            return True
+        return False
+
+    def iniciar(self):
+        if self.herramienta == "cprofile":
+            import cProfile
+
+            perfil = cProfile.Profile()
+            perfil.enable()
+        else:
+            from pyinstrument import Profiler
+
+            perfil = Profiler()
+            perfil.start()
+        return perfil
+
+    def terminar(self, perfil, nombre: str) -> Path:
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        marca = time.strftime("%Y%m%d-%H%M%S")
+        if self.herramienta == "cprofile":
+            perfil.disable()
+            ruta = self.directorio / f"{marca}-{nombre}.prof"
+            perfil.dump_stats(ruta)
+        else:
+            perfil.stop()
+            ruta = self.directorio / f"{marca}-{nombre}.html"
+            ruta.write_text(perfil.output_html(), encoding="utf-8")
+        return ruta
+
+
+def instrumentar(server, herramienta: str | None = None):
+    """
+    Registra en el servidor de Flask la medición de las peticiones de Dash, la
+    ruta `/metrics` y, si se pide, el hook de perfilado.
+
+    Con perfilado activo, una petición con el encabezado `X-Perfil: 1` (o la
+    siguiente petición de Dash después de `POST /perfil`) se perfila y el
+    archivo se indica en el encabezado `X-Perfil-Archivo` de la respuesta.
+    Args:
+        server: Aplicación de Flask (`app.server`).
+        herramienta (str | None): 'cprofile' o 'pyinstrument'; por defecto la variable
+            de entorno `PROFESORES_PERFIL` (sin ella no hay perfilado).
+    """
+    herramienta = herramienta or os.environ.get("PROFESORES_PERFIL")
+    perfilador = _Perfilador(herramienta) if herramienta else None
+
+    @server.before_request
+    def _iniciar_medicion():
+        if request.path != "/_dash-update-component":
+            return
+        g.inicio_peticion = time.perf_counter()
+        if perfilador is not None and perfilador.debe_perfilar():
+            g.perfil = perfilador.iniciar()
+
+    @server.after_request
+    def _terminar_medicion(respuesta):
+        inicio = g.pop("inicio_peticion", None)
+        if inicio is None:
+            return respuesta
+        callback = _callback(request.get_json(silent=True))
+        perfil = g.pop("perfil", None)
+        if perfil is not None:
+            respuesta.headers["X-Perfil-Archivo"] = perfilador.terminar(perfil, callback).name
+        registro.observar("profesores_peticion_segundos", ("callback", callback), time.perf_counter() - inicio,
+                          LIMITES_SEGUNDOS, "Duración de cada petición de Dash, incluida la serialización a JSON.")
+        if not respuesta.direct_passthrough:
+            registro.observar("profesores_respuesta_bytes", ("callback", callback),
+                              respuesta.calculate_content_length() or 0, LIMITES_BYTES,
+                              "Tamaño de la respuesta de cada petición de Dash (comprimida si aplica).")
+        return respuesta
+
+    @server.route("/metrics")
+    def _metricas():
+        return Response(registro.texto(), mimetype="text/plain; version=0.0.4")
+
+    if perfilador is not None:
+        @server.route("/perfil", methods=["POST"])
+        def _armar_perfil():
+            perfilador.armar()
+            return jsonify({"herramienta": perfilador.herramienta, "directorio": str(perfilador.directorio)})
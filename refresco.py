@@ -0,0 +1,254 @@
+"""
+Actualización de los datos en caliente, sin reiniciar los workers.
+
+`Refrescador` revisa en un hilo en segundo plano si cambiaron los datos de las
+facultades cargadas (CSV o dataset columnar, con la misma ruta que usa la app,
+configurable con `PROFESORES_DATA`). Cuando hay una versión nueva:
+
+1. Construye en un proceso aparte (este script) la caché binaria, el índice de
+   búsqueda, los agregados y el md5 del contenido: nada de eso compite por el GIL
+   con los callbacks. Si varios workers detectan el cambio a la vez, solo uno la
+   construye y los demás la reutilizan.
+   Ese mismo proceso construye las figuras de los profesores consultados hace
+   poco (`recientes`).
+2. En el hilo solo abre todo eso con memory-map (`cargar`).
+3. Llama a `preparar(anterior, nuevo, figuras)` (p. ej. para guardar esas figuras
+   en la caché de figuras).
+4. Cambia la facultad en `CacheFacultades` de una sola vez; los callbacks en
+   curso terminan con los datos que ya tenían.
+5. Llama a `descartar(anterior, nuevo)` (p. ej. para borrar las figuras de la
+   versión anterior).
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from hashlib import md5
+from pathlib import Path
+
+from busqueda import IndiceBusqueda
+from comparacion import TablaAgregados
+from datos import CacheFacultades, DatosProfesores, cargar_datos, cargar_facultad, firma_datos, resolver_ruta
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+BASE_DIR = Path(__file__).resolve().parent
+
+logger = logging.getLogger(__name__)
+
+
+def construir_cache(facultad: str | None, ruta: str) -> DatosProfesores:
+    """
+    Construye la caché binaria de unos datos con su índice de búsqueda y sus
+    agregados (se ejecuta en un proceso aparte).
+    Args:
+        facultad (str | None): Facultad, o None para los datos de `data/`.
+        ruta (str): Ruta de los datos; identifica el candado entre procesos.
+    Returns:
+        DatosProfesores: Datos construidos.
+    """
+    candado = Path(tempfile.gettempdir()) / f"profesores-refresco-{md5(ruta.encode()).hexdigest()}.lock"
+    with open(candado, "w") as f:
+        # Un solo proceso construye; los demás esperan y encuentran la caché hecha
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        datos = cargar_datos() if facultad is None else cargar_facultad(facultad)
+        IndiceBusqueda.desde_datos(datos)
+        TablaAgregados.desde_datos(datos)
+    return datos
+
+
+def escribir_figuras(datos: DatosProfesores, nombres: list[str], archivo: str):
+    """
+    Escribe las figuras de unos profesores para que el worker las ponga en su caché
+    sin construirlas (se ejecuta en un proceso aparte).
+    Args:
+        datos (DatosProfesores): Datos nuevos.
+        nombres (list[str]): Profesores consultados hace poco en el worker.
+        archivo (str): Archivo de salida; una línea JSON [tipo, nombre, figura] por figura.
+    """
+    # Se importa aquí: solo el proceso aparte necesita Plotly para esto
+    from utils import serializar_figuras
+
+    with open(archivo, "w", encoding="utf-8") as f:
+        for figura in serializar_figuras(datos, nombres):
+            f.write(json.dumps(figura, ensure_ascii=False) + "\n")
+
+
+def _leer_figuras(archivo: Path) -> list[tuple[str, str, str]]:
+    if not archivo.exists():
+        return []
+    with open(archivo, encoding="utf-8") as f:
+        return [tuple(json.loads(linea)) for linea in f]
+
+
+class Refrescador:
+    """
+    Hilo que detecta datos nuevos y los cambia en `CacheFacultades` sin pausar las peticiones.
+
+    Una versión se aplica cuando su firma (ruta, mtime y tamaño) se mantiene igual
+    en dos revisiones seguidas, para no leer un archivo a medio escribir.
+    """
+
+    def __init__(self, cache: CacheFacultades, cargar, ruta, intervalo: float, preparar=None, descartar=None,
+                 recientes=None):
+        """
+        Args:
+            cache (CacheFacultades): Facultades en memoria de la app.
+            cargar: Función (facultad) -> valor de la caché; su primer elemento son los datos.
+            ruta: Función (facultad) -> ruta de los datos de la facultad.
+            intervalo (float): Segundos entre revisiones.
+            preparar: Función (anterior, nuevo, figuras) que se llama antes del cambio; `figuras`
+                son tuplas (tipo, nombre, JSON) construidas en el proceso aparte.
+            descartar: Función (anterior, nuevo) que se llama después del cambio.
+            recientes: Función (anterior) -> nombres de los profesores cuyas figuras se
+                construyen en el proceso aparte para pasarlas a `preparar`.
+        """
+        self.cache = cache
+        self.cargar = cargar
+        self.ruta = ruta
+        self.intervalo = intervalo
+        self.preparar = preparar
+        self.descartar = descartar
+        self.recientes = recientes
+        self.cambios = 0
+        self.errores = 0
+        self.ultimo_cambio = None
+        self._pendientes = {}
+        # Última firma que no se pudo cargar de cada facultad (no se reintenta hasta que cambie)
+        self._fallidas = {}
+        self._hilo = None
+        self._lock = threading.Lock()
+        self._detener = threading.Event()
+
+    def iniciar(self):
+        """
+        Inicia el hilo si no está corriendo en este proceso (después de un fork
+        el hilo del proceso padre no existe, así que se inicia uno por worker).
+        """
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        with self._lock:
+            if self._hilo is not None and self._hilo.is_alive():
+                return
+            self._detener.clear()
+            self._hilo = threading.Thread(target=self._ejecutar, name="refresco-datos", daemon=True)
+            self._hilo.start()
+
+    def detener(self):
+        self._detener.set()
+
+    def _ejecutar(self):
+        while not self._detener.wait(self.intervalo):
+            try:
+                self.revisar()
+            except Exception as e:
+                self.errores += 1
+                logger.exception("Error al revisar los datos: %s", e)
+
+    def revisar(self, esperar: bool = True) -> list:
+        """
+        Revisa las facultades en memoria y cambia las que tienen datos nuevos.
+        Args:
+            esperar (bool): Exigir que la firma nueva se repita en dos revisiones.
+        Returns:
+            list: Facultades que se cambiaron.
+        """
+        cambiadas = []
+        for facultad, anterior in self.cache.cargadas():
+            try:
+                firma = firma_datos(self.ruta(facultad))
+            except OSError:
+                # Los datos se están reemplazando (o no hay copia local): se revisa después
+                continue
+            if firma == anterior[0].version:
+                self._pendientes.pop(facultad, None)
+                continue
+            if esperar and self._pendientes.get(facultad) != firma:
+                self._pendientes[facultad] = firma
+                continue
+            if self._fallidas.get(facultad) == firma:
+                continue
+            if self._cambiar(facultad, anterior, firma):
+                cambiadas.append(facultad)
+        return cambiadas
+
+    def _cambiar(self, facultad: str | None, anterior, firma: str) -> bool:
+        inicio = time.perf_counter()
+        # Un intérprete nuevo (no multiprocessing) para no volver a importar app.py en el hijo
+        comando = [sys.executable, str(Path(__file__)), "--ruta", str(self.ruta(facultad))]
+        if facultad is not None:
+            comando += ["--facultad", facultad]
+        nombres = self.recientes(anterior) if self.recientes is not None else []
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                archivo = Path(tmp) / "figuras.jsonl"
+                if nombres:
+                    comando += ["--figuras", str(archivo)]
+                proceso = subprocess.run(comando, cwd=BASE_DIR, capture_output=True, text=True,
+                                         input="\n".join(nombres))
+                if proceso.returncode != 0:
+                    raise RuntimeError(proceso.stderr.strip().splitlines()[-1] if proceso.stderr.strip() else
+                                       f"código de salida {proceso.returncode}")
+                # La última línea es la versión construida
+                if proceso.stdout.split()[-1] != firma:
+                    # Los datos volvieron a cambiar mientras se construían: se espera a la siguiente revisión
+                    return False
+                figuras = _leer_figuras(archivo)
+            nuevo = self.cargar(facultad)
+        except Exception as e:
+            self.errores += 1
+            self._fallidas[facultad] = firma
+            logger.warning("No se pudieron cargar los datos nuevos de %s: %s: %s",
+                           facultad or "data/", type(e).__name__, e)
+            return False
+        if nuevo[0].version != firma:
+            return False
+
+        if self.preparar is not None:
+            self.preparar(anterior, nuevo, figuras)
+        if not self.cache.reemplazar(facultad, nuevo):
+            return False
+        if self.descartar is not None:
+            self.descartar(anterior, nuevo)
+        self._pendientes.pop(facultad, None)
+        self._fallidas.pop(facultad, None)
+        self.cambios += 1
+        self.ultimo_cambio = time.time()
+        logger.info("Datos de %s actualizados a la versión %s en %.2f s",
+                    facultad or "data/", firma[:8], time.perf_counter() - inicio)
+        return True
+
+    def estadisticas(self) -> dict:
+        return {
+            'cambios': self.cambios,
+            'errores': self.errores,
+            'ultimo_cambio': self.ultimo_cambio,
+            'corriendo': self._hilo is not None and self._hilo.is_alive(),
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Construye la caché binaria de los datos (la usa Refrescador).")
+    parser.add_argument("--facultad", help="Identificador de la facultad (carpeta en data/facultades/).")
+    parser.add_argument("--ruta", help="Ruta de los datos; por defecto la que usa la app.")
+    parser.add_argument("--figuras", help="Archivo donde escribir las figuras de los profesores leídos de stdin.")
+    parser.add_argument("--prioridad", type=int, default=10,
+                        help="Cuánto bajar la prioridad del proceso (nice) para no quitarle CPU al servidor.")
+    args = parser.parse_args()
+
+    if args.prioridad and hasattr(os, "nice"):
+        os.nice(args.prioridad)
+    ruta = args.ruta or str(resolver_ruta())
+    datos = construir_cache(args.facultad, ruta)
+    if args.figuras:
+        escribir_figuras(datos, sys.stdin.read().splitlines(), args.figuras)
+    print(datos.version)
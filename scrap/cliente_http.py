@@ -0,0 +1,262 @@
+"""
+Extracción sin navegador: un cliente HTTP asíncrono que reutiliza conexiones y un
+parser de HTML (solo biblioteca estándar) con los mismos selectores que usan los
+scrapers de Playwright.
+
+El parser entiende selectores simples `etiqueta.clase` unidos por descendencia
+(`div.tagbox span`, `td.url a`) y aproxima `innerText` (saltos de línea entre
+bloques y tabuladores entre celdas), así que `extraer_pagina` devuelve lo mismo
+que `get_stats.EXTRAER_PAGINA_JS` sobre el HTML del servidor.
+"""
+import re
+from html.parser import HTMLParser
+
+VACIOS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+BLOQUES = {
+    "address", "article", "aside", "blockquote", "body", "dd", "div", "dl", "dt", "fieldset", "figure",
+    "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "html", "li", "main", "nav",
+    "ol", "p", "pre", "section", "table", "tbody", "thead", "tfoot", "tr", "ul",
+}
+CELDAS = {"td", "th"}
+SIN_TEXTO = {"script", "style", "template", "head", "title"}
+# Etiquetas que se cierran solas al abrir otra igual (HTML sin cierres explícitos)
+AUTOCIERRE = {"li": {"li"}, "p": {"p"}, "tr": {"tr"}, "td": {"td", "th"}, "th": {"td", "th"}}
+
+_BLOQUE, _CELDA = "\x00", "\x01"
+# Espacios que colapsa el navegador; `&nbsp;` (\xa0) se conserva, como en `innerText`
+ESPACIOS = " \t\n\r\f"
+_ESPACIOS = re.compile(f"[{ESPACIOS}]+")
+
+
+class Elemento:
+    """Nodo del árbol de `parsear_html`."""
+
+    __slots__ = ("tag", "attrs", "clases", "hijos", "padre")
+
+    def __init__(self, tag: str, attrs: dict, padre: "Elemento | None" = None):
+        self.tag = tag
+        self.attrs = attrs
+        self.clases = set((attrs.get("class") or "").split())
+        self.hijos = []
+        self.padre = padre
+
+    def get(self, atributo: str, default=None):
+        return self.attrs.get(atributo, default)
+
+    def elementos(self):
+        """Descendientes en orden del documento."""
+        pila = [iter(self.hijos)]
+        while pila:
+            for hijo in pila[-1]:
+                if isinstance(hijo, Elemento):
+                    yield hijo
+                    pila.append(iter(hijo.hijos))
+                    break
+            else:
+                pila.pop()
+
+
+class _Constructor(HTMLParser):
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.raiz = Elemento("#documento", {})
+        self.pila = [self.raiz]
+
+    def handle_starttag(self, tag, attrs):
+        cierra = AUTOCIERRE.get(tag)
+        if cierra and self.pila[-1].tag in cierra:
+            self.pila.pop()
+        elemento = Elemento(tag, {k: v or "" for k, v in attrs}, self.pila[-1])
+        self.pila[-1].hijos.append(elemento)
+        if tag not in VACIOS:
+            self.pila.append(elemento)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VACIOS:
+            self.pila.pop()
+
+    def handle_endtag(self, tag):
+        # Cierra hasta la etiqueta abierta más cercana con ese nombre (si existe)
+        for i in range(len(self.pila) - 1, 0, -1):
+            if self.pila[i].tag == tag:
+                del self.pila[i:]
+                return
+
+    def handle_data(self, data):
+        self.pila[-1].hijos.append(data)
+
+
+def parsear_html(html: str) -> Elemento:
+    """
+    Construye el árbol de elementos de un documento HTML.
+    Args:
+        html (str): Documento.
+    Returns:
+        Elemento: Raíz del documento.
+    """
+    constructor = _Constructor()
+    constructor.feed(html)
+    constructor.close()
+    return constructor.raiz
+
+
+def _compilar(selector: str) -> list[tuple[str | None, set[str]]]:
+    partes = []
+    for simple in selector.split():
+        tag, *clases = simple.split(".")
+        partes.append((tag or None, set(clases)))
+    return partes
+
+
+def _coincide(elemento: Elemento, tag: str | None, clases: set[str]) -> bool:
+    return (tag is None or elemento.tag == tag) and clases <= elemento.clases
+
+
+def seleccionar(raiz: Elemento, selector: str) -> list[Elemento]:
+    """
+    Equivalente a `querySelectorAll` para selectores `etiqueta.clase` unidos por descendencia.
+    Args:
+        raiz (Elemento): Elemento donde buscar.
+        selector (str): Selector, p. ej. "div.tagbox span".
+    Returns:
+        list[Elemento]: Coincidencias en orden del documento.
+    """
+    *ancestros, (tag, clases) = _compilar(selector)
+    resultado = []
+    for elemento in raiz.elementos():
+        if not _coincide(elemento, tag, clases):
+            continue
+        # Los selectores anteriores deben coincidir con ancestros, de adentro hacia afuera
+        pendiente = len(ancestros) - 1
+        actual = elemento.padre
+        while pendiente >= 0 and actual is not None:
+            if _coincide(actual, *ancestros[pendiente]):
+                pendiente -= 1
+            actual = actual.padre
+        if pendiente < 0:
+            resultado.append(elemento)
+    return resultado
+
+
+def _partes(elemento: Elemento, salida: list[str]):
+    for hijo in elemento.hijos:
+        if isinstance(hijo, str):
+            salida.append(_ESPACIOS.sub(" ", hijo))
+        elif hijo.tag in SIN_TEXTO:
+            continue
+        elif hijo.tag == "br":
+            salida.append(_BLOQUE)
+        elif hijo.tag in CELDAS:
+            salida.append(_CELDA)
+            _partes(hijo, salida)
+        elif hijo.tag in BLOQUES:
+            salida.append(_BLOQUE)
+            _partes(hijo, salida)
+            salida.append(_BLOQUE)
+        else:
+            _partes(hijo, salida)
+
+
+def texto_interno(elemento: Elemento) -> str:
+    """
+    Aproxima `innerText`: saltos de línea entre bloques, tabuladores entre celdas.
+    Args:
+        elemento (Elemento): Elemento.
+    Returns:
+        str: Texto visible.
+    """
+    partes = []
+    _partes(elemento, partes)
+    lineas = []
+    for linea in "".join(partes).split(_BLOQUE):
+        celdas = [c.strip(ESPACIOS) for c in linea.split(_CELDA)]
+        linea = "\t".join(c for c in celdas if c)
+        if linea:
+            lineas.append(linea)
+    return "\n".join(lineas)
+
+
+def textos(raiz: Elemento, selector: str) -> list[str]:
+    """`texto_interno` de cada coincidencia de `selector` (como `all_inner_texts()`)."""
+    return [texto_interno(e) for e in seleccionar(raiz, selector)]
+
+
+def extraer_pagina(html: str) -> dict:
+    """
+    Extrae los campos de una página de reseñas, con la misma forma que `EXTRAER_PAGINA_JS`.
+    Args:
+        html (str): HTML de la página de un profesor.
+    Returns:
+        dict: `tags`, `comments`, `dates`, `stats`, `primera`, `ultima_pagina` (None si no
+        hay paginación) y `siguiente` (href del último elemento de la paginación).
+    """
+    raiz = parsear_html(html)
+    comments = textos(raiz, "p.commentsParagraph")
+    dates = textos(raiz, "div.date")
+    lis = seleccionar(raiz, "ul.pagination li")
+    ultimo = lis[-1] if lis else None
+    enlace = seleccionar(ultimo, "a") if ultimo is not None else []
+    return {
+        "tags": textos(raiz, "div.tagbox span"),
+        "comments": comments,
+        "dates": dates,
+        "stats": textos(raiz, "div.descriptor-container"),
+        "primera": f"{dates[0]}\n{comments[0]}" if dates and comments else None,
+        "ultima_pagina": None if ultimo is None else "disabled" in ultimo.clases,
+        "siguiente": enlace[0].get("href") if enlace else None,
+    }
+
+
+def extraer_tabla(html: str, selector_enlaces: str = "td.url a") -> tuple[list[str], list[str]]:
+    """
+    Extrae la tabla de profesores de la página de la escuela.
+    Args:
+        html (str): HTML de la página de la escuela.
+        selector_enlaces (str): Selector de los enlaces a cada profesor.
+    Returns:
+        tuple[list[str], list[str]]: Texto de cada fila (celdas separadas por tabuladores) y enlaces.
+    """
+    raiz = parsear_html(html)
+    return textos(raiz, "tr"), [a.get("href") for a in seleccionar(raiz, selector_enlaces)]
+
+
+class ClienteHTTP:
+    """
+    Cliente HTTP asíncrono con un pool de conexiones (httpx), para usar con `async with`.
+    Cada descarga ocupa unos pocos MB, frente a los cientos de un contexto de Chromium.
+    """
+
+    def __init__(self, max_conexiones: int = 8, timeout: float = 30.0):
+        self.max_conexiones = max_conexiones
+        self.timeout = timeout
+        self._cliente = None
+
+    async def __aenter__(self):
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError("El cliente HTTP necesita httpx: pip install httpx") from e
+        self._cliente = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=self.max_conexiones, max_keepalive_connections=self.max_conexiones),
+            timeout=self.timeout,
+            follow_redirects=True,
+            headers={"User-Agent": "Mozilla/5.0 (compatible; analisis-opiniones-profesores)"},
+        )
+        return self
+
+    async def __aexit__(self, *args):
+        await self._cliente.aclose()
+
+    async def obtener(self, url: str) -> tuple[str, str]:
+        """
+        Descarga una página.
+        Args:
+            url (str): URL.
+        Returns:
+            tuple[str, str]: HTML y URL final (después de redirecciones).
+        """
+        respuesta = await self._cliente.get(url)
+        respuesta.raise_for_status()
+        return respuesta.text, str(respuesta.url)
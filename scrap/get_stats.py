@@ -1,10 +1,22 @@
+import argparse
 import asyncio
-from playwright.async_api import async_playwright
+import json
+import os
+try:
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
+except ImportError:  # Solo hace falta con el navegador (--fetcher navegador/auto)
+    async_playwright = None
+    PlaywrightTimeout = TimeoutError
 import pandas as pd
 from pathlib import Path
 import re
+import time
 from hashlib import md5
+from urllib.parse import urlsplit
 import unicodedata
+from urllib.parse import urljoin
+
+from cliente_http import ClienteHTTP, extraer_pagina
 
 # Paths seguros
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -16,9 +28,43 @@ REVIEWS_DIR = DATA_DIR / "reviews_individuales"
 TAGS_DIR.mkdir(exist_ok=True)
 REVIEWS_DIR.mkdir(exist_ok=True)
 
-data = pd.read_csv(DATA_DIR / "merged_profesores.csv")
-urls = data["enlace"].tolist()
-profesores = data["profesor"].tolist()
+ENTRADA_PATH = DATA_DIR / "merged_profesores.csv"
+# Conteos actuales de reseñas (scrap-links.py) y lo último que se extrajo de cada profesor
+TABLA_PATH = DATA_DIR / "tabla_profesores.csv"
+MANIFIESTO_PATH = DATA_DIR / "manifiesto_reseñas.json"
+# Una carpeta por facultad con los mismos archivos que data/
+FACULTADES_DIR = DATA_DIR / "facultades"
+
+# Esperas por disponibilidad (no pausas fijas)
+TIMEOUT_RESEÑAS_MS = 100000
+TIMEOUT_CAMBIO_MS = 15000
+
+# Fecha y texto de la primera reseña visible; identifica la página mostrada
+PRIMERA_RESEÑA_JS = """() => {
+    const fecha = document.querySelector('div.date');
+    const comentario = document.querySelector('p.commentsParagraph');
+    return fecha && comentario ? fecha.innerText + '\\n' + comentario.innerText : null;
+}"""
+
+# Verdadero cuando la primera reseña ya no es la de antes del click
+CAMBIO_PAGINA_JS = f"""anterior => ({PRIMERA_RESEÑA_JS})() !== anterior"""
+
+# Todos los campos de la página en una sola llamada: los mismos textos que
+# `all_inner_texts()` de cada selector, la primera reseña y el estado de la paginación
+# (`ultima_pagina` es null si no hay paginación)
+EXTRAER_PAGINA_JS = f"""() => {{
+    const textos = selector => Array.from(document.querySelectorAll(selector), e => e.innerText);
+    const lis = document.querySelectorAll('ul.pagination li');
+    const ultimo = lis.length ? lis[lis.length - 1] : null;
+    return {{
+        tags: textos('div.tagbox span'),
+        comments: textos('p.commentsParagraph'),
+        dates: textos('div.date'),
+        stats: textos('div.descriptor-container'),
+        primera: ({PRIMERA_RESEÑA_JS})(),
+        ultima_pagina: ultimo === null ? null : (ultimo.getAttribute('class') || '').includes('disabled'),
+    }};
+}}"""
 
 # Función para convertir nombre a nombre de archivo seguro
 def slugify(value):
@@ -27,179 +73,593 @@ def slugify(value):
     value = re.sub(r'[^\w\s-]', '', value).strip().lower()
     return re.sub(r'[-\s]+', '_', value)
 
-# Obtener profesores ya procesados (por nombre de archivo en REVIEWS_DIR)
-procesados = {re.sub(r'_reviews\.csv$', '', f.name) for f in REVIEWS_DIR.glob("*_reviews.csv")}
-
-# Filtrar urls y profesores pendientes
-urls_filtradas = []
-profesores_filtrados = []
-
-for prof, url in zip(profesores, urls):
-    if slugify(prof) not in procesados:
-        profesores_filtrados.append(prof)
-        urls_filtradas.append(url)
-
-# Reemplazar las listas originales por las filtradas
-urls = urls_filtradas
-profesores = profesores_filtrados
 
-
-async def main():
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        print("Navegador iniciado")
-        print(f"Total de URLs a procesar: {len(urls)}")
-
-        for i, url in enumerate(urls):
-            nombre_profesor = profesores[i]
-            print(f"\nExtrayendo datos del profesor {i + 1}/{len(urls)}: {nombre_profesor}")
+def hash_reseña(fecha: str, comentario: str) -> str:
+    """
+    Identidad de una reseña: hash de su fecha y su texto (lo mismo que `PRIMERA_RESEÑA_JS`).
+    Args:
+        fecha (str): Fecha como aparece en la página.
+        comentario (str): Texto del comentario.
+    Returns:
+        str: Hash hexadecimal.
+    """
+    return md5(f"{str(fecha).strip()}\n{str(comentario).strip()}".encode()).hexdigest()
+
+
+def cargar_manifiesto(ruta: Path = MANIFIESTO_PATH) -> dict:
+    """
+    Lee el manifiesto: por profesor, `num_reviews` y el hash de su reseña más reciente.
+    Args:
+        ruta (Path): Archivo JSON del manifiesto.
+    Returns:
+        dict: Manifiesto (vacío si no existe).
+    """
+    if not Path(ruta).exists():
+        return {}
+    with open(ruta, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def guardar_manifiesto(manifiesto: dict, ruta: Path = MANIFIESTO_PATH):
+    """
+    Escribe el manifiesto de forma atómica; sirve de checkpoint tras cada profesor.
+    Args:
+        manifiesto (dict): Manifiesto completo.
+        ruta (Path): Archivo JSON del manifiesto.
+    """
+    temporal = Path(ruta).with_suffix(".tmp")
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(manifiesto, f, ensure_ascii=False, indent=1)
+    os.replace(temporal, ruta)
+
+
+class LimitadorHost:
+    """
+    Limita las peticiones por host: como máximo `tasa` por segundo, repartidas
+    entre todos los trabajadores. Cada petición reserva el siguiente turno libre.
+    """
+
+    def __init__(self, tasa: float | None):
+        self.intervalo = 1 / tasa if tasa else 0.0
+        self._siguiente = {}
+        self._lock = asyncio.Lock()
+
+    async def esperar(self, url: str):
+        """
+        Espera el turno del host de `url`.
+        Args:
+            url (str): URL que se va a pedir.
+        """
+        host = urlsplit(url).netloc
+        async with self._lock:
+            ahora = time.monotonic()
+            turno = max(ahora, self._siguiente.get(host, 0.0))
+            self._siguiente[host] = turno + self.intervalo
+        if turno > ahora:
+            await asyncio.sleep(turno - ahora)
+
+
+def pendientes(data: pd.DataFrame, reviews_dir: Path = REVIEWS_DIR) -> list[tuple[str, str, None]]:
+    """
+    Profesores que aún no tienen archivo de reseñas.
+    Args:
+        data (pd.DataFrame): Tabla con las columnas `profesor` y `enlace`.
+        reviews_dir (Path): Carpeta de reseñas individuales.
+    Returns:
+        list[tuple[str, str, None]]: Tareas (profesor, url, None) por extraer completas.
+    """
+    # Obtener profesores ya procesados (por nombre de archivo en reviews_dir)
+    procesados = {re.sub(r'_reviews\.csv$', '', f.name) for f in reviews_dir.glob("*_reviews.csv")}
+    return [
+        (prof, url, None)
+        for prof, url in zip(data["profesor"].tolist(), data["enlace"].tolist())
+        if slugify(prof) not in procesados
+    ]
+
+
+def _ultima_reseña(prof: str, manifiesto: dict, reviews_dir: Path) -> str | None:
+    # Hash de la reseña más reciente ya extraída: del manifiesto o, si no hay entrada,
+    # de la primera fila del archivo (una extracción completa guarda de la más nueva a la más vieja)
+    if prof in manifiesto:
+        return manifiesto[prof]["ultima_reseña"]
+    archivo = reviews_dir / f"{slugify(prof)}_reviews.csv"
+    if not archivo.exists():
+        return None
+    primera = pd.read_csv(archivo, nrows=1)
+    if primera.empty:
+        return None
+    return hash_reseña(primera["fecha"].iloc[0], primera["comentario"].iloc[0])
+
+
+def por_actualizar(data: pd.DataFrame, tabla: pd.DataFrame, manifiesto: dict,
+                   reviews_dir: Path = REVIEWS_DIR) -> list[tuple[str, str, str | None]]:
+    """
+    Profesores con reseñas nuevas según los conteos de `tabla_profesores.csv`.
+    Args:
+        data (pd.DataFrame): Tabla con las columnas `profesor` y `enlace`.
+        tabla (pd.DataFrame): Tabla de scrap-links.py con `profesor` y `num_reviews`.
+        manifiesto (dict): Resultado de `cargar_manifiesto`.
+        reviews_dir (Path): Carpeta de reseñas individuales.
+    Returns:
+        list[tuple[str, str, str | None]]: Tareas (profesor, url, hash de la última reseña
+        conocida); el hash es None si el profesor se extrae completo.
+    """
+    conteos = tabla.drop_duplicates("profesor").set_index("profesor")["num_reviews"]
+    sin_enlace = conteos.index.difference(data["profesor"])
+    if len(sin_enlace):
+        print(f"⚠️ {len(sin_enlace)} profesores de la tabla no tienen enlace (actualiza merged_profesores.csv).")
+
+    tareas = []
+    for prof, url in zip(data["profesor"].tolist(), data["enlace"].tolist()):
+        if prof not in conteos.index:
+            continue
+        conocido = manifiesto.get(prof, {}).get("num_reviews")
+        if conocido is not None and conteos[prof] <= conocido:
+            continue
+        tareas.append((prof, url, _ultima_reseña(prof, manifiesto, reviews_dir)))
+    return tareas
+
+
+def _agregar_pagina(extraido: dict[str, list[str]], pagina: dict, hasta: str | None, nombre_profesor: str,
+                    page_num: int) -> bool:
+    # Agrega las reseñas de una página; True si apareció la última reseña conocida
+    tags, comments, date_comment, stats = pagina["tags"], pagina["comments"], pagina["dates"], pagina["stats"]
+    vistas = [hash_reseña(fecha, comentario) for fecha, comentario in zip(date_comment, comments)]
+    if hasta is not None and hasta in vistas:
+        # Solo las reseñas anteriores a la ya conocida (las etiquetas no se pueden
+        # asignar a una reseña, así que se toman todas las de esta página)
+        nuevas = vistas.index(hasta)
+        extraido["tags"].extend(tags)
+        extraido["comments"].extend(comments[:nuevas])
+        extraido["dates"].extend(date_comment[:nuevas])
+        extraido["stats"].extend(stats[:2 * nuevas])
+        print(f"[{nombre_profesor}] ✅ Última reseña conocida en la página {page_num}.")
+        return True
+
+    extraido["tags"].extend(tags)
+    extraido["comments"].extend(comments)
+    extraido["dates"].extend(date_comment)
+    extraido["stats"].extend(stats)
+    return False
+
+
+def _avisar_no_encontrada(extraido: dict, hasta: str | None, nombre_profesor: str):
+    # Se recorrieron todas las páginas sin ver la última reseña conocida (se editó o se
+    # borró, o cambió el formato de la fecha): lo extraído es el historial completo
+    if hasta is not None and extraido["completo"]:
+        print(f"[{nombre_profesor}] ⚠️ No apareció la última reseña conocida; se reescriben todas sus reseñas.")
+
+
+async def extraer_profesor(page, url: str, limitador: LimitadorHost, nombre_profesor: str,
+                           hasta: str | None = None) -> dict[str, list[str]]:
+    """
+    Recorre las páginas de reseñas de un profesor, de la más nueva a la más vieja.
+    Args:
+        page: Página de Playwright.
+        url (str): Enlace del profesor.
+        limitador (LimitadorHost): Limitador de peticiones por host.
+        nombre_profesor (str): Nombre (solo para los mensajes).
+        hasta (str | None): `hash_reseña` de la última reseña conocida; al encontrarla se
+            descarta ella y todo lo posterior y se deja de paginar.
+    Returns:
+        dict[str, list[str]]: Listas `tags`, `comments`, `dates` y `stats`, y `completo`:
+        True si se llegó a la última página (sin encontrar `hasta`).
+    """
+    await limitador.esperar(url)
+    await page.goto(url)
+    print(f"[{nombre_profesor}] Página cargada:", await page.title())
+
+    extraido = {"tags": [], "comments": [], "dates": [], "stats": [], "completo": False}
+
+    page_num = 1
+    ultima_identidad = None
+    sin_cambio = 0
+    max_paginas_sin_cambio = 3
+
+    while True:
+        try:
+            await page.wait_for_selector("div.date", timeout=TIMEOUT_RESEÑAS_MS)
+        except PlaywrightTimeout:
+            print(f"[{nombre_profesor}] ⚠️ Timeout esperando 'div.date'. Rompiendo el ciclo.")
+            break
+
+        # Extraer información
+        pagina = await page.evaluate(EXTRAER_PAGINA_JS)
+        comments, date_comment = pagina["comments"], pagina["dates"]
+
+        # La página se identifica por su primera reseña (fecha y texto)
+        identidad = hash_reseña(date_comment[0], comments[0]) if date_comment and comments else None
+        if identidad == ultima_identidad:
+            sin_cambio += 1
+            print(f"[{nombre_profesor}] ⚠️ Página no cambió ({sin_cambio}/{max_paginas_sin_cambio})")
+            if sin_cambio >= max_paginas_sin_cambio:
+                print(f"[{nombre_profesor}] ⛔ Contenido repetido. Asumiendo fin de paginación.")
+                extraido["completo"] = True
+                break
+        else:
+            sin_cambio = 0
+            if _agregar_pagina(extraido, pagina, hasta, nombre_profesor, page_num):
+                break
+
+        ultima_identidad = identidad
+
+        if pagina["ultima_pagina"] is None:
+            print(f"[{nombre_profesor}] ✅ Sin paginación.")
+            extraido["completo"] = True
+            break
+        if pagina["ultima_pagina"]:
+            print(f"[{nombre_profesor}] ✅ Última página alcanzada ({page_num}).")
+            extraido["completo"] = True
+            break
+
+        # Botón "Siguiente"
+        try:
+            await limitador.esperar(url)
+            await page.locator("ul.pagination li").last.locator("a").click(force=True)
+        except Exception as e:
+            print(f"[{nombre_profesor}] ❌ No se pudo hacer clic en siguiente:", str(e))
+            break
+
+        # Esperar a que se muestren otras reseñas en lugar de una pausa fija
+        try:
+            await page.wait_for_function(CAMBIO_PAGINA_JS, arg=pagina["primera"], timeout=TIMEOUT_CAMBIO_MS)
+        except PlaywrightTimeout:
+            print(f"[{nombre_profesor}] ⚠️ Las reseñas no cambiaron tras el click.")
+
+        page_num += 1
+
+    _avisar_no_encontrada(extraido, hasta, nombre_profesor)
+    return extraido
+
+
+async def extraer_profesor_http(cliente: ClienteHTTP, url: str, limitador: LimitadorHost, nombre_profesor: str,
+                                hasta: str | None = None) -> dict[str, list[str]] | None:
+    """
+    Igual que `extraer_profesor`, pero descargando el HTML del servidor sin navegador.
+    Sigue los enlaces de la paginación cuando son URLs reales.
+    Args:
+        cliente (ClienteHTTP): Cliente HTTP abierto.
+        url (str): Enlace del profesor.
+        limitador (LimitadorHost): Limitador de peticiones por host.
+        nombre_profesor (str): Nombre (solo para los mensajes).
+        hasta (str | None): `hash_reseña` de la última reseña conocida.
+    Returns:
+        dict[str, list[str]] | None: Listas `tags`, `comments`, `dates` y `stats` y `completo`
+        (ver `extraer_profesor`); None si las reseñas necesitan JavaScript (no están en el
+        HTML o la paginación es por JS).
+    """
+    extraido = {"tags": [], "comments": [], "dates": [], "stats": [], "completo": False}
+    visitadas = set()
+    page_num = 1
+
+    while url not in visitadas:
+        visitadas.add(url)
+        await limitador.esperar(url)
+        html, url = await cliente.obtener(url)
+        pagina = extraer_pagina(html)
+
+        if not pagina["dates"]:
+            if page_num == 1:
+                print(f"[{nombre_profesor}] Sin reseñas en el HTML; se necesita el navegador.")
+                return None
+            extraido["completo"] = True
+            break
+        if _agregar_pagina(extraido, pagina, hasta, nombre_profesor, page_num):
+            break
+        if pagina["ultima_pagina"] is not False:
+            extraido["completo"] = True
+            break
+
+        siguiente = (pagina["siguiente"] or "").strip()
+        if not siguiente or siguiente.startswith(("#", "javascript:")):
+            print(f"[{nombre_profesor}] Paginación con JavaScript; se necesita el navegador.")
+            return None
+        url = urljoin(url, siguiente)
+        page_num += 1
+    else:
+        # La paginación volvió a una página ya vista
+        extraido["completo"] = True
+
+    _avisar_no_encontrada(extraido, hasta, nombre_profesor)
+    return extraido
+
+
+def limpiar_stats(all_stats: list[str]) -> dict[str, list[str]]:
+    """
+    Separa los pares de calidad y facilidad extraídos de `div.descriptor-container`.
+    Args:
+        all_stats (list[str]): Textos "valor\\nETIQUETA" en el orden de la página.
+    Returns:
+        dict[str, list[str]]: Listas `calidad_general` y `facilidad`.
+    """
+    stats_tuples = [s.split("\n") for s in all_stats]
+
+    clean_stats = {
+        "calidad_general": [],
+        "facilidad": []
+    }
+
+    # Validación: asegurar que haya número par de elementos
+    if len(stats_tuples) % 2 != 0:
+        raise ValueError("Número impar de entradas en stats_tuples; deberían ser pares de calidad y facilidad.")
+
+    # Procesar de dos en dos
+    for i in range(0, len(stats_tuples), 2):
+        calidad = stats_tuples[i]
+        facilidad = stats_tuples[i + 1]
+
+        if "CALIDAD" in calidad[1].upper() and "FACILIDAD" in facilidad[1].upper():
+            clean_stats["calidad_general"].append(calidad[0].strip())
+            clean_stats["facilidad"].append(facilidad[0].strip())
+        else:
+            # Si están invertidos o mal ordenados
+            print(f"⚠️ Orden inesperado en el par {calidad}, {facilidad}. Asignando de forma segura.")
+            val1, lab1 = calidad[0].strip(), calidad[1].strip().upper()
+            val2, lab2 = facilidad[0].strip(), facilidad[1].strip().upper()
+
+            if "CALIDAD" in lab1:
+                clean_stats["calidad_general"].append(val1)
+                clean_stats["facilidad"].append(val2)
+            elif "CALIDAD" in lab2:
+                clean_stats["calidad_general"].append(val2)
+                clean_stats["facilidad"].append(val1)
+            else:
+                # No se identifican correctamente, poner vacíos
+                clean_stats["calidad_general"].append("")
+                clean_stats["facilidad"].append("")
+
+    return clean_stats
+
+
+def guardar_profesor(nombre_profesor: str, extraido: dict[str, list[str]],
+                     tags_dir: Path = TAGS_DIR, reviews_dir: Path = REVIEWS_DIR, anexar: bool = False):
+    """
+    Guarda los tags y las reseñas de un profesor en sus archivos individuales.
+    Args:
+        nombre_profesor (str): Nombre del profesor.
+        extraido (dict[str, list[str]]): Resultado de `extraer_profesor`.
+        tags_dir (Path): Carpeta de tags individuales.
+        reviews_dir (Path): Carpeta de reseñas individuales.
+        anexar (bool): Agregar las reseñas al archivo existente y unir los tags en lugar de reemplazarlos.
+            Las reseñas nuevas quedan antes de las anteriores (de la más nueva a la más vieja,
+            como en una extracción completa) y las que ya estaban en el archivo no se repiten.
+    """
+    all_comments, all_dates = extraido["comments"], extraido["dates"]
+    print(f"[{nombre_profesor}] {len(all_comments)} comentarios y {len(extraido['tags'])} etiquetas extraídas")
+
+    tags = set(extraido["tags"])
+    clean_stats = limpiar_stats(extraido["stats"])
+
+    # Guardar tags individuales
+    tags_filename = tags_dir / f"{slugify(nombre_profesor)}_tags.csv"
+    if anexar and tags_filename.exists():
+        anteriores = pd.read_csv(tags_filename)["tags"].dropna()
+        tags.update(t.strip() for valor in anteriores for t in valor.split(",") if t.strip())
+    tags_df = pd.DataFrame({
+        "profesor": [nombre_profesor],
+        "tags": [', '.join(list(tags))]
+    })
+    tags_df.to_csv(tags_filename, index=False)
+
+    # Guardar reseñas individuales
+    # Asegurar que todas las listas tengan la misma longitud
+    n = min(len(all_comments), len(all_dates), len(clean_stats["calidad_general"]), len(clean_stats["facilidad"]))
+
+    if n == 0:
+        print(f"[{nombre_profesor}] ⚠️ No hay datos suficientes para guardar reseñas.")
+        return
+
+    reviews_df = pd.DataFrame({
+        "profesor": [nombre_profesor] * n,
+        "fecha": all_dates[:n],
+        "comentario": all_comments[:n],
+        "calidad_general": clean_stats["calidad_general"][:n],
+        "facilidad": clean_stats["facilidad"][:n]
+    })
+
+    reviews_filename = reviews_dir / f"{slugify(nombre_profesor)}_reviews.csv"
+    if anexar and reviews_filename.exists():
+        anteriores = pd.read_csv(reviews_filename, dtype=str, keep_default_na=False)
+        nuevas = {hash_reseña(f, c) for f, c in zip(reviews_df["fecha"], reviews_df["comentario"])}
+        repetidas = [hash_reseña(f, c) in nuevas for f, c in zip(anteriores["fecha"], anteriores["comentario"])]
+        reviews_df = pd.concat([reviews_df, anteriores[~pd.Series(repetidas, dtype=bool)]], ignore_index=True)
+    # Se escribe aparte y se reemplaza: una interrupción no deja el archivo a medias
+    temporal = reviews_filename.with_suffix(".tmp")
+    reviews_df.to_csv(temporal, index=False)
+    os.replace(temporal, reviews_filename)
+    print(f"[{nombre_profesor}] ✅ Guardado en {tags_filename.name} y {reviews_filename.name}")
+
+
+def _registrar(manifiesto: dict, ruta: Path, nombre_profesor: str, extraido: dict[str, list[str]],
+               num_reviews: int | None):
+    # La reseña más reciente es la primera extraída; si no hubo nuevas se conserva la anterior
+    anterior = manifiesto.get(nombre_profesor, {})
+    if extraido["comments"] and extraido["dates"]:
+        ultima = hash_reseña(extraido["dates"][0], extraido["comments"][0])
+    else:
+        ultima = anterior.get("ultima_reseña")
+    manifiesto[nombre_profesor] = {
+        "num_reviews": int(num_reviews) if num_reviews is not None else anterior.get("num_reviews"),
+        "ultima_reseña": ultima,
+        "actualizado": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    guardar_manifiesto(manifiesto, ruta)
+
+
+async def trabajador(browser, cola: asyncio.Queue, limitador: LimitadorHost, guardar):
+    # Cada trabajador tiene su propio contexto (cookies y caché aisladas)
+    contexto = await browser.new_context()
+    try:
+        while True:
+            tarea = await cola.get()
+            if tarea is None:
+                break
+            nombre_profesor, url, hasta = tarea
 
             if pd.isna(url) or url.strip() == "":
                 print(f"URL vacía para el profesor {nombre_profesor}, saltando...")
                 continue
 
-            page = await browser.new_page()
-            await page.goto(url)
-            print("Página cargada:", await page.title())
-
-            all_tags = []
-            all_comments = []
-            all_dates = []
-            all_stats = []
-
-            page_num = 1
-            last_page_hash = None
-            sin_cambio = 0
-            max_paginas_sin_cambio = 3
-
-            while True:
-                print(f"\nExtrayendo página {page_num}...")
-
-                try:
-                    await page.wait_for_selector("div.date", timeout=100000)
-                    await page.wait_for_timeout(2500)
-                except:
-                    print("⚠️ Timeout esperando 'div.date'. Rompiendo el ciclo.")
-                    break
-
-                current_html = await page.content()
-                current_hash = md5(current_html.encode()).hexdigest()
-
-                if current_hash == last_page_hash:
-                    sin_cambio += 1
-                    print(f"⚠️ Página no cambió ({sin_cambio}/{max_paginas_sin_cambio})")
-                    if sin_cambio >= max_paginas_sin_cambio:
-                        print("⛔ Contenido repetido. Asumiendo fin de paginación.")
-                        break
-                else:
-                    sin_cambio = 0
-
-                last_page_hash = current_hash
-
-                # Extraer información
-                tags = await page.locator("div.tagbox span").all_inner_texts()
-                comments = await page.locator("p.commentsParagraph").all_inner_texts()
-                date_comment = await page.locator("div.date").all_inner_texts()
-                stats = await page.locator('div.descriptor-container').all_inner_texts()
-
-                all_tags.extend(tags)
-                all_comments.extend(comments)
-                all_dates.extend(date_comment)
-                all_stats.extend(stats)
-
-                # Intentar encontrar el botón "Siguiente"
-                try:
-                    pagination_lis = page.locator("ul.pagination li")
-                    last_li = pagination_lis.nth(await pagination_lis.count() - 1)
-                    last_li_class = await last_li.get_attribute("class")
-
-                    if last_li_class and "disabled" in last_li_class:
-                        print("✅ Última página alcanzada.")
-                        break
-
-                    await last_li.locator("a").click(force=True)
-                    print("➡️ Click en siguiente")
-                    await page.wait_for_timeout(5000)
-                except Exception as e:
-                    print("❌ No se pudo hacer clic en siguiente:", str(e))
-                    break
-
-                page_num += 1
-
-            print("\nResumen:")
-            print("  Total de comentarios extraídos:", len(all_comments))
-            print("  Total de etiquetas extraídas:", len(all_tags))
-
-            tags_str = ', '.join(list(set(all_tags)))
-            stats_tuples = [s.split("\n") for s in all_stats]
-
-            clean_stats = {
-                "calidad_general": [],
-                "facilidad": []
-            }
-
-            # Validación: asegurar que haya número par de elementos
-            if len(stats_tuples) % 2 != 0:
-                raise ValueError("Número impar de entradas en stats_tuples; deberían ser pares de calidad y facilidad.")
-
-            # Procesar de dos en dos
-            for i in range(0, len(stats_tuples), 2):
-                calidad = stats_tuples[i]
-                facilidad = stats_tuples[i + 1]
-
-                if "CALIDAD" in calidad[1].upper() and "FACILIDAD" in facilidad[1].upper():
-                    clean_stats["calidad_general"].append(calidad[0].strip())
-                    clean_stats["facilidad"].append(facilidad[0].strip())
-                else:
-                    # Si están invertidos o mal ordenados
-                    print(f"⚠️ Orden inesperado en el par {calidad}, {facilidad}. Asignando de forma segura.")
-                    val1, lab1 = calidad[0].strip(), calidad[1].strip().upper()
-                    val2, lab2 = facilidad[0].strip(), facilidad[1].strip().upper()
-
-                    if "CALIDAD" in lab1:
-                        clean_stats["calidad_general"].append(val1)
-                        clean_stats["facilidad"].append(val2)
-                    elif "CALIDAD" in lab2:
-                        clean_stats["calidad_general"].append(val2)
-                        clean_stats["facilidad"].append(val1)
-                    else:
-                        # No se identifican correctamente, poner vacíos
-                        clean_stats["calidad_general"].append("")
-                        clean_stats["facilidad"].append("")
-
-            # Guardar tags individuales
-            tags_df = pd.DataFrame({
-                "profesor": [nombre_profesor],
-                "tags": [tags_str]
-            })
-            tags_filename = TAGS_DIR / f"{slugify(nombre_profesor)}_tags.csv"
-            tags_df.to_csv(tags_filename, index=False)
-            print(f"✅ Tags guardados en {tags_filename.name}")
-
-            # Guardar reseñas individuales
-            # Asegurar que todas las listas tengan la misma longitud
-            n = min(len(all_comments), len(all_dates), len(clean_stats["calidad_general"]), len(clean_stats["facilidad"]))
-
-            if n == 0:
-                print(f"⚠️ No hay datos suficientes para guardar reseñas para {nombre_profesor}.")
-            else:
-                reviews_df = pd.DataFrame({
-                    "profesor": [nombre_profesor] * n,
-                    "fecha": all_dates[:n],
-                    "comentario": all_comments[:n],
-                    "calidad_general": clean_stats["calidad_general"][:n],
-                    "facilidad": clean_stats["facilidad"][:n]
-                })
-
-                reviews_filename = REVIEWS_DIR / f"{slugify(nombre_profesor)}_reviews.csv"
-                reviews_df.to_csv(reviews_filename, index=False)
-                print(f"✅ Reseñas guardadas en {reviews_filename.name}")
-
-            await page.close()
-
-        await browser.close()
-        print("\n✅ Navegador cerrado y extracción finalizada.")
-        print(f"Archivos individuales guardados en:\n - {TAGS_DIR}\n - {REVIEWS_DIR}")
+            page = await contexto.new_page()
+            try:
+                guardar(nombre_profesor, await extraer_profesor(page, url, limitador, nombre_profesor, hasta), hasta)
+            except Exception as e:
+                print(f"[{nombre_profesor}] ❌ Error: {e}")
+            finally:
+                await page.close()
+    finally:
+        await contexto.close()
+
+
+async def trabajador_http(cliente: ClienteHTTP, cola: asyncio.Queue, limitador: LimitadorHost, guardar,
+                          para_navegador: list):
+    # Las tareas que necesitan JavaScript se dejan en `para_navegador`
+    while True:
+        tarea = await cola.get()
+        if tarea is None:
+            break
+        nombre_profesor, url, hasta = tarea
+
+        if pd.isna(url) or url.strip() == "":
+            print(f"URL vacía para el profesor {nombre_profesor}, saltando...")
+            continue
+
+        try:
+            extraido = await extraer_profesor_http(cliente, url, limitador, nombre_profesor, hasta)
+        except Exception as e:
+            print(f"[{nombre_profesor}] ❌ Error: {e}")
+            continue
+        if extraido is None:
+            para_navegador.append(tarea)
+            continue
+        try:
+            guardar(nombre_profesor, extraido, hasta)
+        except Exception as e:
+            print(f"[{nombre_profesor}] ❌ Error: {e}")
+
+
+def _cola(tareas: list, trabajadores: int) -> asyncio.Queue:
+    # Las tareas y un None por trabajador para indicarle que termine
+    cola = asyncio.Queue()
+    for tarea in tareas:
+        cola.put_nowait(tarea)
+    for _ in range(trabajadores):
+        cola.put_nowait(None)
+    return cola
+
+
+def rutas_facultad(facultad: str | None) -> dict:
+    """
+    Rutas de entrada y salida de una facultad.
+    Args:
+        facultad (str | None): Identificador de la facultad (None: directamente en data/).
+    Returns:
+        dict: `entrada`, `tabla`, `manifiesto_path`, `tags_dir` y `reviews_dir` (las carpetas se crean).
+    """
+    carpeta = DATA_DIR if facultad is None else FACULTADES_DIR / facultad
+    rutas = {
+        "entrada": carpeta / ENTRADA_PATH.name,
+        "tabla": carpeta / TABLA_PATH.name,
+        "manifiesto_path": carpeta / MANIFIESTO_PATH.name,
+        "tags_dir": carpeta / TAGS_DIR.name,
+        "reviews_dir": carpeta / REVIEWS_DIR.name,
+    }
+    rutas["tags_dir"].mkdir(parents=True, exist_ok=True)
+    rutas["reviews_dir"].mkdir(parents=True, exist_ok=True)
+    return rutas
+
+
+async def main(entrada: str | Path = ENTRADA_PATH, trabajadores: int = 4, tasa: float | None = 2.0,
+               tags_dir: Path = TAGS_DIR, reviews_dir: Path = REVIEWS_DIR, incremental: bool = False,
+               tabla: str | Path = TABLA_PATH, manifiesto_path: Path = MANIFIESTO_PATH,
+               fetcher: str = "navegador") -> list[str]:
+    """
+    Extrae las reseñas de los profesores pendientes con un pool de trabajadores.
+    Args:
+        entrada (str | Path): CSV con las columnas `profesor` y `enlace`.
+        trabajadores (int): Número de contextos del navegador (o conexiones HTTP) a la vez.
+        tasa (float | None): Peticiones por segundo permitidas por host (None, sin límite).
+        tags_dir (Path): Carpeta de tags individuales.
+        reviews_dir (Path): Carpeta de reseñas individuales.
+        incremental (bool): Extraer solo las reseñas nuevas de los profesores cuyo
+            `num_reviews` en `tabla` supera el del manifiesto (y completos los nuevos).
+        tabla (str | Path): CSV de scrap-links.py con los conteos actuales.
+        manifiesto_path (Path): Manifiesto con lo ya extraído (ver `cargar_manifiesto`).
+        fetcher (str): 'navegador' (Playwright), 'http' (cliente_http, sin JavaScript) o
+            'auto' (HTTP y el navegador solo para los profesores que necesitan JavaScript).
+    Returns:
+        list[str]: Profesores extraídos y guardados.
+    """
+    data = pd.read_csv(entrada)
+    manifiesto = cargar_manifiesto(manifiesto_path)
+    if incremental:
+        conteos_df = pd.read_csv(tabla)
+        tareas = por_actualizar(data, conteos_df, manifiesto, reviews_dir)
+        print(f"Modo incremental: {sum(h is not None for _, _, h in tareas)} profesores con reseñas nuevas, "
+              f"{sum(h is None for _, _, h in tareas)} completos")
+    else:
+        conteos_df = data
+        tareas = pendientes(data, reviews_dir)
+    conteos = (conteos_df.drop_duplicates("profesor").set_index("profesor")["num_reviews"].to_dict()
+               if "num_reviews" in conteos_df else {})
+
+    limitador = LimitadorHost(tasa)
+    completados = []
+
+    def guardar(nombre_profesor: str, extraido: dict[str, list[str]], hasta: str | None):
+        # Si se recorrieron todas las páginas sin encontrar `hasta`, se reescribe el archivo
+        anexar = hasta is not None and not extraido["completo"]
+        guardar_profesor(nombre_profesor, extraido, tags_dir, reviews_dir, anexar=anexar)
+        _registrar(manifiesto, manifiesto_path, nombre_profesor, extraido, conteos.get(nombre_profesor))
+        completados.append(nombre_profesor)
+
+    print(f"Total de URLs a procesar: {len(tareas)} con {trabajadores} trabajadores ({fetcher})")
+    inicio = time.perf_counter()
+
+    if fetcher in ("http", "auto"):
+        para_navegador = []
+        cola = _cola(tareas, trabajadores)
+        async with ClienteHTTP(max_conexiones=trabajadores) as cliente:
+            await asyncio.gather(*(
+                trabajador_http(cliente, cola, limitador, guardar, para_navegador)
+                for _ in range(trabajadores)
+            ))
+        if para_navegador:
+            print(f"{len(para_navegador)} profesores necesitan JavaScript"
+                  + (", se extraen con el navegador." if fetcher == "auto" else " y no se extrajeron."))
+        tareas = para_navegador if fetcher == "auto" else []
+
+    if tareas:
+        if async_playwright is None:
+            raise ImportError("El navegador necesita Playwright: pip install playwright && playwright install chromium")
+        cola = _cola(tareas, trabajadores)
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            print("Navegador iniciado")
+            await asyncio.gather(*(trabajador(browser, cola, limitador, guardar) for _ in range(trabajadores)))
+            await browser.close()
+            print("Navegador cerrado.")
+
+    duracion = time.perf_counter() - inicio
+    print(f"\n✅ {len(completados)} profesores en {duracion:.1f} s ({len(completados) / duracion:.2f} profesores/s)")
+    print(f"Archivos individuales guardados en:\n - {tags_dir}\n - {reviews_dir}")
+    return completados
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Extrae las reseñas de cada profesor.")
+    parser.add_argument("--facultad", help="Identificador de la facultad (carpeta en data/facultades/).")
+    parser.add_argument("--entrada", help="CSV con las columnas profesor y enlace.")
+    parser.add_argument("--trabajadores", type=int, default=4, help="Contextos del navegador en paralelo.")
+    parser.add_argument("--tasa", type=float, default=2.0,
+                        help="Peticiones por segundo por host (0 para no limitar).")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Solo reseñas nuevas según num_reviews de --tabla y el manifiesto.")
+    parser.add_argument("--tabla", help="CSV de scrap-links.py con num_reviews.")
+    parser.add_argument("--fetcher", choices=["navegador", "http", "auto"], default="navegador",
+                        help="Cómo se descargan las páginas (http y auto usan cliente_http.py).")
+    args = parser.parse_args()
+
+    rutas = rutas_facultad(args.facultad)
+    asyncio.run(main(args.entrada or rutas["entrada"], args.trabajadores, args.tasa or None,
+                     rutas["tags_dir"], rutas["reviews_dir"], args.incremental, args.tabla or rutas["tabla"],
+                     rutas["manifiesto_path"], args.fetcher))
@@ -1,9 +1,12 @@
+import argparse
 import asyncio
-from playwright.async_api import async_playwright
+import json
 import pandas as pd
 from pathlib import Path
 import re
 
+from cliente_http import ClienteHTTP, extraer_tabla
+
 # Paths seguros
 BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR / "data"
@@ -12,66 +15,121 @@ DATA_DIR.mkdir(exist_ok=True)
 URL_UNIVERSITY = "https://www.misprofesores.com/escuelas/Facultad-de-Psicologia-UNAM_1805"
 TABLE_NAME_PATH = DATA_DIR / "tabla_profesores.csv"
 LINKS_NAME_PATH = DATA_DIR / "enlaces_profesores.csv"
+# Una carpeta por facultad con los mismos archivos que data/
+FACULTADES_DIR = DATA_DIR / "facultades"
+
+async def obtener_con_navegador(url: str) -> tuple[list[str], list[str]]:
+    # Filas y enlaces de la tabla renderizada por Chromium
+    from playwright.async_api import async_playwright
 
-async def main():
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=True)
         page = await browser.new_page()
-        await page.goto(URL_UNIVERSITY)
+        await page.goto(url)
         
         await page.wait_for_selector("tr")
         print("Página cargada:", await page.title())
 
         # Obtener filas
         raw_rows = await page.locator("tr").all_inner_texts()
-        tabla = [row.split("\t") for row in raw_rows if row.strip()]
 
         # Enlaces
         link_locators = page.locator("td.url.hidden-xs.sorting_1 a")
         n = await link_locators.count()
         hrefs = [await link_locators.nth(i).get_attribute("href") for i in range(n)]
 
-        # Guardar
-        datos = []
-
-        for row in tabla:
-            row = [cell.strip() for cell in row if cell.strip()]
-
-            if len(row) < 3:
-                continue  # no tiene lo esencial
-
-            nombre = row[0]
-            dep = row[1] if len(row) == 4 else None
-
-            review_str = row[-2]  # penúltimo campo
-            rating_str = row[-1]  # último campo
-
-            # Validamos número de reviews
-            match_reviews = re.match(r"(\d+)", review_str)
-            try:
-                num_reviews = int(match_reviews.group()) if match_reviews else None
-                rating = float(rating_str)
-            except:
-                continue  # si falla conversión, lo ignoramos
-
-            if nombre and num_reviews is not None and rating is not None:
-                datos.append({
-                    "profesor": nombre,
-                    "dep": dep,
-                    "num_reviews": num_reviews,
-                    "rating": rating
-                })
-
-        # Convertir a DataFrame
-        df = pd.DataFrame(datos)
-        df.to_csv(TABLE_NAME_PATH, index=False)
-        print(f"Tabla guardada en {TABLE_NAME_PATH}")
-        # Guardar enlaces
-        enlaces_df = pd.DataFrame({"enlace": hrefs})
-        enlaces_df.to_csv(LINKS_NAME_PATH, index=False)
-        print(f"Enlaces guardados en {LINKS_NAME_PATH}")
-
         await browser.close()
+    return raw_rows, hrefs
+
+async def obtener_con_http(url: str) -> tuple[list[str], list[str]]:
+    # Filas y enlaces del HTML del servidor, sin navegador
+    async with ClienteHTTP(max_conexiones=1) as cliente:
+        html, _ = await cliente.obtener(url)
+    print("Página descargada:", url)
+    return extraer_tabla(html, "td.url a")
+
+def procesar_tabla(raw_rows: list[str]) -> pd.DataFrame:
+    """
+    Convierte el texto de las filas (celdas separadas por tabuladores) en la tabla de profesores.
+    Args:
+        raw_rows (list[str]): Texto de cada fila `tr`.
+    Returns:
+        pd.DataFrame: Columnas profesor, dep, num_reviews y rating.
+    """
+    tabla = [row.split("\t") for row in raw_rows if row.strip()]
+
+    # Guardar
+    datos = []
+
+    for row in tabla:
+        row = [cell.strip() for cell in row if cell.strip()]
+
+        if len(row) < 3:
+            continue  # no tiene lo esencial
+
+        nombre = row[0]
+        dep = row[1] if len(row) == 4 else None
+
+        review_str = row[-2]  # penúltimo campo
+        rating_str = row[-1]  # último campo
+
+        # Validamos número de reviews
+        match_reviews = re.match(r"(\d+)", review_str)
+        try:
+            num_reviews = int(match_reviews.group()) if match_reviews else None
+            rating = float(rating_str)
+        except:
+            continue  # si falla conversión, lo ignoramos
+
+        if nombre and num_reviews is not None and rating is not None:
+            datos.append({
+                "profesor": nombre,
+                "dep": dep,
+                "num_reviews": num_reviews,
+                "rating": rating
+            })
+
+    # Convertir a DataFrame
+    return pd.DataFrame(datos)
+
+async def main(url: str = URL_UNIVERSITY, fetcher: str = "navegador", facultad: str | None = None,
+               nombre: str | None = None):
+    """
+    Descarga la tabla de profesores de la escuela y guarda la tabla y los enlaces.
+    Args:
+        url (str): Página de la escuela.
+        fetcher (str): 'navegador' (Playwright) o 'http' (cliente_http, si la tabla viene en el HTML).
+        facultad (str | None): Identificador de la facultad; sus archivos van en
+            data/facultades/<facultad>/ (None: directamente en data/).
+        nombre (str | None): Nombre visible de la facultad (se guarda en facultad.json).
+    """
+    if fetcher == "http":
+        raw_rows, hrefs = await obtener_con_http(url)
+    else:
+        raw_rows, hrefs = await obtener_con_navegador(url)
+
+    tabla_path, enlaces_path = TABLE_NAME_PATH, LINKS_NAME_PATH
+    if facultad is not None:
+        carpeta = FACULTADES_DIR / facultad
+        carpeta.mkdir(parents=True, exist_ok=True)
+        tabla_path, enlaces_path = carpeta / TABLE_NAME_PATH.name, carpeta / LINKS_NAME_PATH.name
+        with open(carpeta / "facultad.json", "w", encoding="utf-8") as f:
+            json.dump({"nombre": nombre or facultad, "url": url}, f, ensure_ascii=False)
+
+    df = procesar_tabla(raw_rows)
+    df.to_csv(tabla_path, index=False)
+    print(f"Tabla guardada en {tabla_path}")
+    # Guardar enlaces
+    enlaces_df = pd.DataFrame({"enlace": hrefs})
+    enlaces_df.to_csv(enlaces_path, index=False)
+    print(f"Enlaces guardados en {enlaces_path}")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Extrae la tabla de profesores y sus enlaces.")
+    parser.add_argument("--url", default=URL_UNIVERSITY, help="Página de la escuela.")
+    parser.add_argument("--fetcher", choices=["navegador", "http"], default="navegador")
+    parser.add_argument("--facultad", help="Identificador de la facultad (carpeta en data/facultades/).")
+    parser.add_argument("--nombre", help="Nombre visible de la facultad.")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.url, args.fetcher, args.facultad, args.nombre))
@@ -0,0 +1,302 @@
+"""
+Réplica local y estática de misprofesores.com para probar los scrapers sin red.
+
+Genera una página de escuela (tabla de profesores con sus enlaces) y una página
+por profesor con el mismo marcado que usan los scrapers (`div.date`,
+`p.commentsParagraph`, `div.tagbox span`, `div.descriptor-container`,
+`ul.pagination li`). Con `renderizado="cliente"` (como en el sitio real) las
+reseñas se dibujan y paginan con JavaScript, sin navegar; con
+`renderizado="servidor"` cada página de reseñas es un HTML completo enlazado desde
+la paginación, que se puede leer sin navegador (ver cliente_http.py).
+
+Uso:
+    python scrap/sitio_local.py --profesores 50 --puerto 8000 --latencia 0.2
+"""
+import argparse
+import html
+import json
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RESEÑAS_POR_PAGINA = 5
+MESES = ["Ene", "Feb", "Mar", "Abr", "May", "Jun", "Jul", "Ago", "Sep", "Oct", "Nov", "Dic"]
+ETIQUETAS = [
+    "ASPECTOS DE CALIFICACIÓN CLAROS", "MUCHOS EXÁMENES", "MUCHAS TAREAS", "ASISTENCIA OBLIGATORIA",
+    "LAS CLASES SON LARGAS", "INSPIRACIONAL", "BRINDA APOYO", "DEJA LEER", "CALIFICA DURO",
+]
+
+PLANTILLA_PROFESOR = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{nombre} - Mis Profesores</title></head>
+<body>
+<h1>{nombre}</h1>
+<table class="tftable"><tbody id="lista-resenas"></tbody></table>
+<ul class="pagination" id="paginacion"></ul>
+<script id="datos" type="application/json">{datos}</script>
+<script>
+const RESEÑAS = JSON.parse(document.getElementById('datos').textContent);
+const POR_PAGINA = {por_pagina};
+const RETRASO_MS = {retraso_ms};
+let pagina = 0;
+
+function reseña(r) {{
+    const tags = r.tags.map(t => `<span>${{t}}</span>`).join('');
+    return `<tr><td class="rating"><div class="rating-block">
+        <div class="descriptor-container"><div class="score">${{r.calidad}}</div><div class="descriptor">CALIDAD GENERAL</div></div>
+        <div class="descriptor-container"><div class="score">${{r.facilidad}}</div><div class="descriptor">FACILIDAD</div></div>
+    </div></td><td class="comments"><div class="date">${{r.fecha}}</div>
+        <div class="tagbox">${{tags}}</div><p class="commentsParagraph">${{r.comentario}}</p></td></tr>`;
+}}
+
+function mostrar() {{
+    const paginas = Math.max(1, Math.ceil(RESEÑAS.length / POR_PAGINA));
+    document.getElementById('lista-resenas').innerHTML =
+        RESEÑAS.slice(pagina * POR_PAGINA, (pagina + 1) * POR_PAGINA).map(reseña).join('');
+    const numeros = Array.from({{length: paginas}}, (_, i) =>
+        `<li class="${{i === pagina ? 'active' : ''}}"><a href="#">${{i + 1}}</a></li>`).join('');
+    const ultima = pagina >= paginas - 1 ? 'next disabled' : 'next';
+    document.getElementById('paginacion').innerHTML =
+        `<li class="prev"><a href="#">«</a></li>${{numeros}}<li class="${{ultima}}"><a href="#" id="siguiente">»</a></li>`;
+    document.getElementById('siguiente').onclick = evento => {{
+        evento.preventDefault();
+        if (pagina >= paginas - 1) return;
+        // Simula la petición que hace el sitio real al cambiar de página
+        setTimeout(() => {{ pagina += 1; mostrar(); }}, RETRASO_MS);
+    }};
+}}
+mostrar();
+</script>
+</body></html>
+"""
+
+PLANTILLA_PROFESOR_SERVIDOR = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{nombre} - Mis Profesores</title></head>
+<body>
+<h1>{nombre}</h1>
+<table class="tftable"><tbody id="lista-resenas">
+{filas}
+</tbody></table>
+<ul class="pagination" id="paginacion">{paginacion}</ul>
+</body></html>
+"""
+
+PLANTILLA_ESCUELA = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Facultad local - Mis Profesores</title></head>
+<body><table id="mainTable"><tbody>
+{filas}
+</tbody></table></body></html>
+"""
+
+
+def _reseñas(rng: np.random.Generator, n: int, numero: int) -> list[dict]:
+    # Reseñas de la más nueva a la más vieja, como en el sitio
+    dias = np.sort(rng.integers(0, 365 * 8, n))
+    fechas = pd.Timestamp("2025-06-30") - pd.to_timedelta(dias, unit="D")
+    return [
+        {
+            "fecha": f"{fecha.day:02d}/{MESES[fecha.month - 1]}/{fecha.year}",
+            "calidad": f"{rng.integers(0, 11)}.0",
+            "facilidad": f"{2 * rng.integers(0, 6)}.0",
+            "tags": [str(t) for t in rng.choice(ETIQUETAS, size=rng.integers(0, 4), replace=False)],
+            "comentario": f"Comentario {j + 1} del profesor {numero}: {' '.join(rng.choice(ETIQUETAS, 3)).lower()}.",
+        }
+        for j, fecha in enumerate(fechas)
+    ]
+
+
+def _fila(r: dict) -> str:
+    # Mismo marcado que la función reseña() de PLANTILLA_PROFESOR
+    tags = "".join(f"<span>{html.escape(t)}</span>" for t in r["tags"])
+    return f"""<tr><td class="rating"><div class="rating-block">
+        <div class="descriptor-container"><div class="score">{r["calidad"]}</div><div class="descriptor">CALIDAD GENERAL</div></div>
+        <div class="descriptor-container"><div class="score">{r["facilidad"]}</div><div class="descriptor">FACILIDAD</div></div>
+    </div></td><td class="comments"><div class="date">{r["fecha"]}</div>
+        <div class="tagbox">{tags}</div><p class="commentsParagraph">{html.escape(r["comentario"])}</p></td></tr>"""
+
+
+def _pagina_servidor(pagina: str, k: int) -> str:
+    # Página k (desde 0) de las reseñas de un profesor
+    return pagina if k == 0 else pagina.replace(".html", f"-p{k + 1}.html")
+
+
+def _escribir_profesor(directorio: Path, nombre: str, pagina: str, reseñas: list[dict], retraso_ms: int,
+                       renderizado: str = "cliente"):
+    if renderizado == "servidor":
+        for anterior in (directorio / pagina).parent.glob(Path(pagina).stem + "-p*.html"):
+            anterior.unlink()
+        paginas = max(1, -(-len(reseñas) // RESEÑAS_POR_PAGINA))
+        for k in range(paginas):
+            numeros = "".join(
+                f'<li class="{"active" if i == k else ""}"><a href="/{_pagina_servidor(pagina, i)}">{i + 1}</a></li>'
+                for i in range(paginas)
+            )
+            siguiente = ('<li class="next disabled"><a href="#">»</a></li>' if k == paginas - 1 else
+                         f'<li class="next"><a href="/{_pagina_servidor(pagina, k + 1)}">»</a></li>')
+            (directorio / _pagina_servidor(pagina, k)).write_text(
+                PLANTILLA_PROFESOR_SERVIDOR.format(
+                    nombre=html.escape(nombre),
+                    filas="\n".join(_fila(r) for r in reseñas[k * RESEÑAS_POR_PAGINA:(k + 1) * RESEÑAS_POR_PAGINA]),
+                    paginacion=f'<li class="prev"><a href="#">«</a></li>{numeros}{siguiente}',
+                ),
+                encoding="utf-8",
+            )
+    else:
+        datos = json.dumps(reseñas, ensure_ascii=False).replace("</", "<\\/")
+        (directorio / pagina).write_text(
+            PLANTILLA_PROFESOR.format(nombre=html.escape(nombre), datos=datos,
+                                      por_pagina=RESEÑAS_POR_PAGINA, retraso_ms=retraso_ms),
+            encoding="utf-8",
+        )
+    # Copia de las reseñas para poder agregar nuevas después
+    (directorio / pagina).with_suffix(".json").write_text(json.dumps(reseñas, ensure_ascii=False), encoding="utf-8")
+
+
+def _escribir_escuela(directorio: Path, tabla: pd.DataFrame):
+    (directorio / "escuelas" / "local.html").write_text(
+        PLANTILLA_ESCUELA.format(filas="\n".join(
+            f'<tr><td class="url hidden-xs sorting_1"><a href="/{f.pagina}">{html.escape(f.profesor)}</a></td>'
+            f'<td>{f.dep}</td><td>{f.num_reviews}</td><td>{f.rating}</td></tr>'
+            for f in tabla.itertuples()
+        )),
+        encoding="utf-8",
+    )
+
+
+def _rating(reseñas: list[dict]) -> float:
+    return round(float(np.mean([float(r["calidad"]) for r in reseñas])) / 2, 1)
+
+
+def generar_sitio(directorio: str | Path, n_profesores: int = 20, max_reseñas: int = 30, retraso_ms: int = 50,
+                  seed: int = 0, renderizado: str = "cliente") -> pd.DataFrame:
+    """
+    Escribe las páginas del sitio local en `directorio`.
+    Args:
+        directorio (str | Path): Carpeta de salida (se sirve con `servir`).
+        n_profesores (int): Número de profesores.
+        max_reseñas (int): Máximo de reseñas por profesor.
+        retraso_ms (int): Retraso al cambiar de página de reseñas.
+        seed (int): Semilla del generador.
+        renderizado (str): 'cliente' (reseñas dibujadas con JavaScript) o 'servidor' (HTML por página).
+    Returns:
+        pd.DataFrame: Tabla de profesores (`profesor`, `dep`, `num_reviews`, `rating`, `pagina`),
+        con `pagina` relativa a la raíz del sitio.
+    """
+    directorio = Path(directorio)
+    (directorio / "profesores").mkdir(parents=True, exist_ok=True)
+    (directorio / "escuelas").mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+
+    filas = []
+    for i in range(n_profesores):
+        nombre = f"Apellido{i}, Nombre{i}"
+        pagina = f"profesores/Nombre{i}-Apellido{i}_{1000 + i}.html"
+        reseñas = _reseñas(rng, int(rng.integers(1, max_reseñas + 1)), i)
+        _escribir_profesor(directorio, nombre, pagina, reseñas, retraso_ms, renderizado)
+        filas.append({
+            "profesor": nombre,
+            "dep": "Psicología",
+            "num_reviews": len(reseñas),
+            "rating": _rating(reseñas),
+            "pagina": pagina,
+        })
+
+    tabla = pd.DataFrame(filas)
+    _escribir_escuela(directorio, tabla)
+    return tabla
+
+
+def agregar_reseñas(directorio: str | Path, tabla: pd.DataFrame, n_profesores: int = 5, max_nuevas: int = 8,
+                    retraso_ms: int = 50, seed: int = 1, renderizado: str = "cliente") -> pd.DataFrame:
+    """
+    Publica reseñas nuevas (más recientes que las existentes) para algunos profesores,
+    para probar la extracción incremental.
+    Args:
+        directorio (str | Path): Carpeta escrita por `generar_sitio`.
+        tabla (pd.DataFrame): Tabla devuelta por `generar_sitio` (o por esta función).
+        n_profesores (int): Profesores que reciben reseñas nuevas.
+        max_nuevas (int): Máximo de reseñas nuevas por profesor.
+        retraso_ms (int): Retraso al cambiar de página de reseñas.
+        seed (int): Semilla del generador.
+        renderizado (str): El mismo que se usó en `generar_sitio`.
+    Returns:
+        pd.DataFrame: Tabla con los `num_reviews` y `rating` actualizados.
+    """
+    directorio = Path(directorio)
+    rng = np.random.default_rng(seed)
+    tabla = tabla.copy()
+    for i in rng.choice(len(tabla), size=min(n_profesores, len(tabla)), replace=False):
+        fila = tabla.iloc[i]
+        anteriores = json.loads((directorio / fila["pagina"]).with_suffix(".json").read_text(encoding="utf-8"))
+        nuevas = _reseñas(rng, int(rng.integers(1, max_nuevas + 1)), i)
+        for r in nuevas:
+            # Posteriores a todas las de `generar_sitio`
+            r["fecha"] = f"{seed % 28 + 1:02d}/Jul/2025"
+            r["comentario"] = f"Nuevo ({seed}): {r['comentario']}"
+        reseñas = nuevas + anteriores
+        _escribir_profesor(directorio, fila["profesor"], fila["pagina"], reseñas, retraso_ms, renderizado)
+        tabla.loc[tabla.index[i], ["num_reviews", "rating"]] = [len(reseñas), _rating(reseñas)]
+    _escribir_escuela(directorio, tabla)
+    return tabla
+
+
+class _Manejador(SimpleHTTPRequestHandler):
+    latencia = 0.0
+    peticiones = None
+
+    def do_GET(self):
+        inicio = time.monotonic()
+        if self.latencia:
+            time.sleep(self.latencia)
+        super().do_GET()
+        if self.peticiones is not None:
+            self.peticiones.append((inicio, time.monotonic(), self.path))
+
+    def log_message(self, *args):
+        pass
+
+
+def servir(directorio: str | Path, puerto: int = 0, latencia: float = 0.0,
+           peticiones: list | None = None) -> tuple[ThreadingHTTPServer, str]:
+    """
+    Sirve `directorio` por HTTP en un hilo de fondo.
+    Args:
+        directorio (str | Path): Carpeta escrita por `generar_sitio`.
+        puerto (int): Puerto (0 elige uno libre).
+        latencia (float): Segundos de espera añadidos a cada petición.
+        peticiones (list | None): Lista donde se anota (inicio, fin, ruta) de cada petición,
+            con `time.monotonic()`.
+    Returns:
+        tuple[ThreadingHTTPServer, str]: Servidor (detener con `shutdown()`) y URL base.
+    """
+    manejador = type("Manejador", (_Manejador,), {"latencia": latencia, "peticiones": peticiones})
+    servidor = ThreadingHTTPServer(("127.0.0.1", puerto), partial(manejador, directory=str(directorio)))
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://127.0.0.1:{servidor.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sirve una réplica local de misprofesores.com.")
+    parser.add_argument("--directorio", default="sitio_local", help="Carpeta donde se generan las páginas.")
+    parser.add_argument("--profesores", type=int, default=20)
+    parser.add_argument("--max-reseñas", type=int, default=30)
+    parser.add_argument("--puerto", type=int, default=8000)
+    parser.add_argument("--latencia", type=float, default=0.0, help="Segundos añadidos a cada petición.")
+    parser.add_argument("--renderizado", choices=["cliente", "servidor"], default="cliente")
+    args = parser.parse_args()
+
+    tabla = generar_sitio(args.directorio, args.profesores, args.max_reseñas, renderizado=args.renderizado)
+    servidor, url = servir(args.directorio, args.puerto, args.latencia)
+    tabla.assign(enlace=url + "/" + tabla["pagina"]).drop(columns="pagina").to_csv(
+        Path(args.directorio) / "profesores.csv", index=False)
+    print(f"Sitio local en {url}/escuelas/local.html ({len(tabla)} profesores)")
+    print(f"Entrada para get_stats.py: {Path(args.directorio) / 'profesores.csv'}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        servidor.shutdown()
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# Los scripts de scrap/ y analysis/ se ejecutan directamente, no como paquetes
+BASE_DIR = Path(__file__).resolve().parent.parent
+for carpeta in (BASE_DIR, BASE_DIR / "scrap", BASE_DIR / "analysis"):
+    sys.path.insert(0, str(carpeta))
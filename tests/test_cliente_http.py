@@ -0,0 +1,55 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from cliente_http import extraer_pagina
+from get_stats import EXTRAER_PAGINA_JS, limpiar_stats
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+# Páginas de reseñas con el marcado del sitio real; el .json de cada una tiene el
+# `innerText` que devuelve el navegador para cada selector
+PAGINAS = ["profesor_p1", "profesor_p2"]
+CAMPOS = ["tags", "comments", "dates", "stats", "primera", "ultima_pagina"]
+
+
+def _html(nombre: str) -> str:
+    return (FIXTURES / f"{nombre}.html").read_text(encoding="utf-8")
+
+
+def _esperado(nombre: str) -> dict:
+    return json.loads((FIXTURES / f"{nombre}.json").read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize("nombre", PAGINAS)
+def test_extraer_pagina_como_inner_text(nombre):
+    pagina = extraer_pagina(_html(nombre))
+    esperado = _esperado(nombre)
+    assert {campo: pagina[campo] for campo in CAMPOS} == esperado
+    # Los pares de calidad y facilidad se separan igual que con el navegador
+    stats = limpiar_stats(pagina["stats"])
+    assert len(stats["calidad_general"]) == len(stats["facilidad"]) == len(esperado["comments"])
+
+
+async def _extraer_con_navegador(html: str) -> dict:
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            page = await browser.new_page()
+            await page.set_content(html)
+            return await page.evaluate(EXTRAER_PAGINA_JS)
+        finally:
+            await browser.close()
+
+
+@pytest.mark.parametrize("nombre", PAGINAS)
+def test_http_y_navegador_extraen_lo_mismo(nombre):
+    pytest.importorskip("playwright")
+    html = _html(nombre)
+    navegador = asyncio.run(_extraer_con_navegador(html))
+    http = extraer_pagina(html)
+    assert {campo: http[campo] for campo in CAMPOS} == {campo: navegador[campo] for campo in CAMPOS}
+    assert {campo: navegador[campo] for campo in CAMPOS} == _esperado(nombre)
@@ -0,0 +1,75 @@
+import base64
+import json
+import math
+import shutil
+import subprocess
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from plotly.io.json import to_json_plotly
+
+import utils
+from datos import DatosProfesores
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+SCRIPT = BASE_DIR / "assets" / "dashboard_cliente.js"
+# Dibuja las gráficas con assets/dashboard_cliente.js a partir de los datos de stdin
+NODE = f"""
+global.window = {{}};
+eval(require('fs').readFileSync({json.dumps(str(SCRIPT))}, 'utf8'));
+const datos = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+process.stdout.write(JSON.stringify(window.dash_clientside.profesores.graficas(datos, 'plantilla')));
+"""
+
+
+@pytest.fixture(scope="module")
+def datos():
+    return DatosProfesores(pd.read_csv(BASE_DIR / "data" / "professor_data.csv"))
+
+
+def _profesor_con_mas_semestres(datos) -> str:
+    return max(datos.nombres, key=lambda nombre: len(datos.semestres_de(nombre)))
+
+
+def _normalizar(valor):
+    # Arreglos binarios de Plotly ({dtype, bdata}) como listas y NaN como null, igual que en JSON
+    if isinstance(valor, dict):
+        if set(valor) == {"dtype", "bdata"}:
+            return _normalizar(np.frombuffer(base64.b64decode(valor["bdata"]), dtype=valor["dtype"]).tolist())
+        return {clave: _normalizar(v) for clave, v in valor.items()}
+    if isinstance(valor, list):
+        return [_normalizar(v) for v in valor]
+    if isinstance(valor, float) and math.isnan(valor):
+        return None
+    return valor
+
+
+@pytest.mark.parametrize("maximo", [utils.MAX_PUNTOS_TENDENCIA, 8])
+def test_datos_cliente_usa_los_semestres_reducidos(datos, monkeypatch, maximo):
+    monkeypatch.setattr(utils, "MAX_PUNTOS_TENDENCIA", maximo)
+    nombre = _profesor_con_mas_semestres(datos)
+    semestres = utils.datos_cliente(datos, nombre)["semestres"]
+    figura = utils._figura_tendencias(datos, nombre)
+
+    assert len(semestres["fechas"]) == min(maximo, len(datos.semestres_de(nombre)))
+    assert semestres["fechas"] == list(figura.data[0].x)
+    assert semestres["etiquetas"] == list(figura.layout.xaxis.ticktext)
+    assert semestres["n"] == list(figura.data[0].customdata)
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="Se necesita Node.js para ejecutar el script del cliente")
+@pytest.mark.parametrize("maximo", [utils.MAX_PUNTOS_TENDENCIA, 8])
+def test_tendencias_del_cliente_igual_que_en_el_servidor(datos, monkeypatch, maximo):
+    monkeypatch.setattr(utils, "MAX_PUNTOS_TENDENCIA", maximo)
+    nombre = _profesor_con_mas_semestres(datos)
+    # Como lo envía Dash al navegador
+    carga = to_json_plotly(utils.datos_cliente(datos, nombre))
+    salida = subprocess.run(["node", "-e", NODE], input=carga, capture_output=True, text=True, check=True)
+    cliente = json.loads(salida.stdout)[2]
+
+    servidor = json.loads(utils._serializar(utils._figura_tendencias(datos, nombre)))
+    servidor["layout"].pop("template", None)
+    assert cliente["layout"].pop("template") == "plantilla"
+    assert _normalizar(cliente) == _normalizar(servidor)
@@ -0,0 +1,93 @@
+import asyncio
+import json
+
+import pandas as pd
+import pytest
+
+from get_stats import main as extraer, slugify
+from sitio_local import generar_sitio, servir
+
+N_PROFESORES = 12
+TRABAJADORES = 4
+TASA = 10.0
+
+FETCHERS = [
+    pytest.param("http", "servidor", id="http"),
+    pytest.param("navegador", "cliente", id="navegador"),
+]
+
+
+def _preparar(tmp_path, renderizado: str, latencia: float = 0.0):
+    # Sitio local servido en un puerto libre, con la entrada para get_stats.py
+    tabla = generar_sitio(tmp_path / "sitio", N_PROFESORES, max_reseñas=15, renderizado=renderizado)
+    peticiones = []
+    servidor, url = servir(tmp_path / "sitio", latencia=latencia, peticiones=peticiones)
+    entrada = tmp_path / "profesores.csv"
+    tabla.assign(enlace=url + "/" + tabla["pagina"]).to_csv(entrada, index=False)
+    (tmp_path / "tags").mkdir()
+    (tmp_path / "reviews").mkdir()
+    return tabla, servidor, entrada, peticiones
+
+
+def _extraer(tmp_path, entrada, fetcher: str, tasa: float | None, trabajadores: int = TRABAJADORES) -> list[str]:
+    if fetcher == "navegador":
+        pytest.importorskip("playwright")
+    return asyncio.run(extraer(entrada, trabajadores, tasa, tmp_path / "tags", tmp_path / "reviews",
+                               manifiesto_path=tmp_path / "manifiesto.json", fetcher=fetcher))
+
+
+def _paginas(peticiones: list) -> list[tuple[float, float, str]]:
+    # Solo las páginas de profesores (el navegador puede pedir otros recursos)
+    return sorted(p for p in peticiones if p[2].startswith("/profesores/"))
+
+
+@pytest.mark.parametrize("fetcher,renderizado", FETCHERS)
+def test_pool_extrae_todas_las_reseñas(tmp_path, fetcher, renderizado):
+    tabla, servidor, entrada, _ = _preparar(tmp_path, renderizado)
+    try:
+        completados = _extraer(tmp_path, entrada, fetcher, TASA)
+    finally:
+        servidor.shutdown()
+
+    assert sorted(completados) == sorted(tabla["profesor"])
+    for profesor, pagina in zip(tabla["profesor"], tabla["pagina"]):
+        verdad = json.loads((tmp_path / "sitio" / pagina).with_suffix(".json").read_text(encoding="utf-8"))
+        reseñas = pd.read_csv(tmp_path / "reviews" / f"{slugify(profesor)}_reviews.csv",
+                              dtype=str, keep_default_na=False)
+        assert reseñas["profesor"].eq(profesor).all()
+        assert reseñas["fecha"].tolist() == [r["fecha"] for r in verdad]
+        assert reseñas["comentario"].tolist() == [r["comentario"] for r in verdad]
+        assert reseñas["calidad_general"].tolist() == [r["calidad"] for r in verdad]
+        assert reseñas["facilidad"].tolist() == [r["facilidad"] for r in verdad]
+
+        tags = pd.read_csv(tmp_path / "tags" / f"{slugify(profesor)}_tags.csv", keep_default_na=False)
+        extraidos = {t.strip() for t in tags["tags"].iloc[0].split(",") if t.strip()}
+        assert extraidos == {t for r in verdad for t in r["tags"]}
+
+
+def test_pool_respeta_la_tasa_por_host(tmp_path):
+    _, servidor, entrada, peticiones = _preparar(tmp_path, "servidor")
+    try:
+        _extraer(tmp_path, entrada, "http", TASA)
+    finally:
+        servidor.shutdown()
+
+    inicios = [inicio for inicio, _, _ in _paginas(peticiones)]
+    n = int(TASA)
+    assert len(inicios) > n
+    # Entre todos los trabajadores, nunca más de `TASA` peticiones en un segundo
+    # (con margen para el tiempo que tarda cada petición en llegar al servidor)
+    ventanas = [inicios[i + n] - inicios[i] for i in range(len(inicios) - n)]
+    assert min(ventanas) >= 0.9
+
+
+def test_pool_limita_las_peticiones_simultaneas(tmp_path):
+    _, servidor, entrada, peticiones = _preparar(tmp_path, "servidor", latencia=0.05)
+    try:
+        _extraer(tmp_path, entrada, "http", None, trabajadores=3)
+    finally:
+        servidor.shutdown()
+
+    paginas = _paginas(peticiones)
+    simultaneas = max(sum(inicio <= t < fin for inicio, fin, _ in paginas) for t, _, _ in paginas)
+    assert 1 < simultaneas <= 3
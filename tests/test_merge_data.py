@@ -0,0 +1,74 @@
+import pandas as pd
+import pytest
+
+from merge_data import ESQUEMAS, fusionar
+
+FORMATOS = ["csv", "parquet"]
+
+
+def _escribir(carpeta, nombre: str, profesor: str, n: int, inicio: int = 0, columnas: list | None = None):
+    pd.DataFrame({
+        "profesor": [profesor] * n,
+        "fecha": [f"{i % 28 + 1:02d}/Ene/2024" for i in range(inicio, inicio + n)],
+        "comentario": [f"Comentario {i} de {profesor}" for i in range(inicio, inicio + n)],
+        "calidad_general": [8.0] * n,
+        "facilidad": [6.0] * n,
+    }, columns=columnas or list(ESQUEMAS["reviews"])).to_csv(carpeta / nombre, index=False)
+
+
+def _leer(destino, formato: str) -> pd.DataFrame:
+    df = pd.read_parquet(destino) if formato == "parquet" else pd.read_csv(destino)
+    return df.sort_values(["profesor", "comentario"]).reset_index(drop=True)
+
+
+def _esperado(carpeta) -> pd.DataFrame:
+    partes = [pd.read_csv(archivo) for archivo in sorted(carpeta.glob("*.csv"))]
+    df = pd.concat([p[list(ESQUEMAS["reviews"])] for p in partes if not p.empty], ignore_index=True)
+    return df.sort_values(["profesor", "comentario"]).reset_index(drop=True)
+
+
+def _fusionar(carpeta, destino, manifiesto: dict, formato: str) -> dict:
+    if formato == "parquet":
+        pytest.importorskip("pyarrow")
+    return fusionar("reviews", carpeta, destino, manifiesto, hilos=2, formato=formato)
+
+
+@pytest.mark.parametrize("formato", FORMATOS)
+def test_solo_archivos_reescritos(tmp_path, formato):
+    carpeta, destino, manifiesto = tmp_path / "reviews", tmp_path / f"merged_reviews.{formato}", {}
+    carpeta.mkdir()
+    _escribir(carpeta, "a_reviews.csv", "A", 3)
+    # Vacío y con otro orden de columnas: al reescribirlo no es una ampliación del anterior
+    _escribir(carpeta, "b_reviews.csv", "B", 0, columnas=list(ESQUEMAS["reviews"])[::-1])
+    _fusionar(carpeta, destino, manifiesto, formato)
+
+    # B no tenía filas: al reescribirlo no hay nada que quitar de la salida
+    _escribir(carpeta, "b_reviews.csv", "B", 2)
+    resumen = _fusionar(carpeta, destino, manifiesto, formato)
+    assert (resumen["nuevos"], resumen["anexados"], resumen["reescritos"]) == (0, 0, 1)
+    pd.testing.assert_frame_equal(_leer(destino, formato), _esperado(carpeta), check_dtype=False)
+
+    # Reescritura de un archivo con filas
+    _escribir(carpeta, "a_reviews.csv", "A", 2, inicio=10)
+    assert _fusionar(carpeta, destino, manifiesto, formato)["reescritos"] == 1
+    pd.testing.assert_frame_equal(_leer(destino, formato), _esperado(carpeta), check_dtype=False)
+
+    # Sin cambios: la salida no se toca
+    antes = destino.stat().st_mtime_ns
+    assert _fusionar(carpeta, destino, manifiesto, formato)["filas"] == 0
+    assert destino.stat().st_mtime_ns == antes
+
+
+@pytest.mark.parametrize("formato", FORMATOS)
+def test_salida_vacia(tmp_path, formato):
+    carpeta, destino, manifiesto = tmp_path / "reviews", tmp_path / f"merged_reviews.{formato}", {}
+    carpeta.mkdir()
+    _escribir(carpeta, "a_reviews.csv", "A", 0)
+    _fusionar(carpeta, destino, manifiesto, formato)
+    assert _leer(destino, formato).columns.tolist() == list(ESQUEMAS["reviews"])
+    assert _leer(destino, formato).empty
+
+    # La siguiente fusión lee la salida vacía
+    _escribir(carpeta, "b_reviews.csv", "B", 2)
+    assert _fusionar(carpeta, destino, manifiesto, formato)["nuevos"] == 1
+    pd.testing.assert_frame_equal(_leer(destino, formato), _esperado(carpeta), check_dtype=False)
@@ -0,0 +1,110 @@
+import random
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from convertir_dataset import convertir
+from datos import leer_dataset
+from resumenes import BackendPrueba, actualizar_resumenes, leer_checkpoint
+
+DATOS_REALES = Path(__file__).resolve().parent.parent / "data" / "professor_data.csv"
+N_PROFESORES = 6
+
+
+class Interrupcion(BaseException):
+    """Corte del proceso (como un Ctrl+C) a mitad de la generación."""
+
+
+class BackendContado(BackendPrueba):
+    """`BackendPrueba` que anota cada prompt y se interrumpe tras `interrumpir` llamadas."""
+
+    def __init__(self, interrumpir: int | None = None):
+        super().__init__()
+        self.prompts = []
+        self.interrumpir = interrumpir
+
+    def generar(self, prompt: str) -> str:
+        if self.interrumpir is not None and len(self.prompts) >= self.interrumpir:
+            raise Interrupcion()
+        self.prompts.append(prompt)
+        return super().generar(prompt)
+
+
+@pytest.fixture
+def rutas(tmp_path):
+    # Los primeros profesores de los datos del repositorio y unas reseñas para cada uno
+    profesores = pd.read_csv(DATOS_REALES).head(N_PROFESORES)
+    profesores.to_csv(tmp_path / "professor_data.csv", index=False)
+    reseñas = pd.DataFrame([
+        {"profesor": profesor, "comentario": f"Comentario {j} sobre {profesor}", "rating": 3}
+        for profesor in profesores["profesor"] for j in range(3)
+    ])
+    reseñas.to_csv(tmp_path / "reviews_plus_score.csv", index=False)
+    return {
+        "entrada": tmp_path / "reviews_plus_score.csv",
+        "checkpoint_path": tmp_path / "resumenes_checkpoint.jsonl",
+        "summaries_path": tmp_path / "summaries.csv",
+        "datos_path": tmp_path / "professor_data.csv",
+        "dataset_path": tmp_path / "professor_data",
+    }
+
+
+def test_reanuda_desde_el_checkpoint(rutas):
+    with pytest.raises(Interrupcion):
+        actualizar_resumenes(BackendContado(interrumpir=2), concurrencia=1, **rutas)
+    # Lo generado antes del corte quedó en el checkpoint; una línea cortada se ignora
+    with open(rutas["checkpoint_path"], "a", encoding="utf-8") as f:
+        f.write('{"profesor": "A medias", "ha')
+    guardados = leer_checkpoint(rutas["checkpoint_path"])
+    assert len(guardados) == 2
+
+    backend = BackendContado()
+    resumen = actualizar_resumenes(backend, **rutas)
+
+    assert len(backend.prompts) == resumen["regenerados"] == N_PROFESORES - 2
+    assert resumen["sin_cambios"] == 2
+    assert not any(profesor.title() in prompt for profesor in guardados for prompt in backend.prompts)
+    assert set(pd.read_csv(rutas["summaries_path"])["profesor"]) == set(leer_checkpoint(rutas["checkpoint_path"]))
+    # El checkpoint se compacta a una línea por profesor
+    assert len(rutas["checkpoint_path"].read_text(encoding="utf-8").splitlines()) == N_PROFESORES
+
+
+def test_omite_profesores_con_los_mismos_comentarios(rutas):
+    actualizar_resumenes(BackendContado(), **rutas)
+
+    # Las mismas reseñas en otro orden: el hash no depende del orden
+    reseñas = pd.read_csv(rutas["entrada"])
+    filas = list(reseñas.index)
+    random.Random(0).shuffle(filas)
+    reseñas.loc[filas].to_csv(rutas["entrada"], index=False)
+    backend = BackendContado()
+    resumen = actualizar_resumenes(backend, **rutas)
+    assert backend.prompts == []
+    assert (resumen["sin_cambios"], resumen["regenerados"], resumen["escritos"]) == (N_PROFESORES, 0, 0)
+
+    # Un comentario nuevo solo regenera el resumen de ese profesor
+    profesor = reseñas["profesor"].iloc[0]
+    pd.concat([reseñas, pd.DataFrame([{"profesor": profesor, "comentario": "Comentario nuevo", "rating": 5}])]
+              ).to_csv(rutas["entrada"], index=False)
+    backend = BackendContado()
+    resumen = actualizar_resumenes(backend, **rutas)
+    assert len(backend.prompts) == resumen["regenerados"] == 1
+    assert "Comentario nuevo" in backend.prompts[0]
+
+
+def test_escribe_los_resumenes_y_regenera_el_dataset(rutas):
+    pytest.importorskip("pyarrow")
+    convertir(rutas["datos_path"], rutas["dataset_path"])
+    antes = leer_dataset(rutas["dataset_path"])
+
+    resumen = actualizar_resumenes(BackendContado(), **rutas)
+
+    assert resumen["escritos"] == N_PROFESORES
+    resumenes = pd.read_csv(rutas["summaries_path"]).set_index("profesor")["resumen"].to_dict()
+    datos = pd.read_csv(rutas["datos_path"]).set_index("profesor")["resumen"].to_dict()
+    assert datos == resumenes
+
+    dataset = leer_dataset(rutas["dataset_path"])
+    assert dict(zip(dataset.nombres, dataset.columnas["resumen"])) == resumenes
+    assert dict(zip(antes.nombres, antes.columnas["resumen"])) != resumenes
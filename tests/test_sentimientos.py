@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+from sentimientos import COMENTARIO_PENDIENTE, ModeloDeterminista, hash_texto, leer_cache, puntuar_reseñas
+
+COMENTARIOS = [
+    "Excelente profesor, explica muy claro",
+    "Pésimo, nunca llega a clase",
+    "Regular",
+    "Buena clase pero aburrida",
+    "Interesante y paciente",
+]
+
+
+class ModeloContado(ModeloDeterminista):
+    """`ModeloDeterminista` que anota cada lote que recibe."""
+
+    def __init__(self):
+        self.lotes = []
+
+    def clasificar(self, textos: list[str]) -> list[str]:
+        self.lotes.append(list(textos))
+        return super().clasificar(textos)
+
+    @property
+    def textos(self) -> list[str]:
+        return [texto for lote in self.lotes for texto in lote]
+
+
+def _reseñas(comentarios: list) -> pd.DataFrame:
+    return pd.DataFrame({
+        "profesor": [f"Profesor {i % 2}" for i in range(len(comentarios))],
+        "fecha": "01/Ene/2024",
+        "comentario": comentarios,
+        "calidad_general": 8.0,
+        "facilidad": 6.0,
+    })
+
+
+def test_puntua_por_lotes_cada_comentario_distinto_una_vez(tmp_path):
+    entrada, salida, cache = tmp_path / "merged_reviews.csv", tmp_path / "salida.csv", tmp_path / "cache.csv"
+    _reseñas(COMENTARIOS + COMENTARIOS[:2] + [COMENTARIO_PENDIENTE]).to_csv(entrada, index=False)
+
+    modelo = ModeloContado()
+    resumen = puntuar_reseñas(modelo, entrada, salida, cache, tamano_lote=2)
+
+    assert [len(lote) for lote in modelo.lotes] == [2, 2, 1]
+    assert sorted(modelo.textos) == sorted(COMENTARIOS)
+    assert (resumen["reseñas"], resumen["distintos"], resumen["puntuados"], resumen["cache"]) == (7, 5, 5, 0)
+
+    resultado = pd.read_csv(salida)
+    assert COMENTARIO_PENDIENTE not in resultado["comentario"].tolist()
+    assert resultado["rating"].tolist() == ModeloDeterminista().clasificar(resultado["review"].tolist())
+    assert leer_cache(cache, modelo.nombre) == dict(zip(map(hash_texto, modelo.textos),
+                                                        ModeloDeterminista().clasificar(modelo.textos)))
+
+
+def test_solo_puntua_lo_que_no_esta_en_la_cache(tmp_path):
+    entrada, salida, cache = tmp_path / "merged_reviews.csv", tmp_path / "salida.csv", tmp_path / "cache.csv"
+    _reseñas(COMENTARIOS[:3]).to_csv(entrada, index=False)
+    puntuar_reseñas(ModeloContado(), entrada, salida, cache)
+
+    # Filas de la caché escritas antes (por otra corrida o a mano): la de este modelo
+    # no se vuelve a puntuar y la de otro modelo no cuenta
+    pd.DataFrame({
+        "modelo": ["determinista", "otro"],
+        "hash": [hash_texto(COMENTARIOS[3]), hash_texto(COMENTARIOS[4])],
+        "rating": ["1 star", "1 star"],
+    }).to_csv(cache, mode="a", header=False, index=False)
+    _reseñas(COMENTARIOS + ["Nuevo comentario, lo recomiendo"]).to_csv(entrada, index=False)
+
+    modelo = ModeloContado()
+    resumen = puntuar_reseñas(modelo, entrada, salida, cache)
+
+    assert modelo.textos == [COMENTARIOS[4], "Nuevo comentario, lo recomiendo"]
+    assert (resumen["puntuados"], resumen["cache"]) == (2, 4)
+    resultado = pd.read_csv(salida).set_index("comentario")["rating"]
+    # La etiqueta de la caché se usa tal cual, aunque el modelo daría otra
+    assert resultado[COMENTARIOS[3]] == "1 star"
+    assert ModeloDeterminista().clasificar([COMENTARIOS[3]]) != ["1 star"]
+
+    # Con todo en la caché, el modelo no se llama
+    modelo = ModeloContado()
+    assert puntuar_reseñas(modelo, entrada, salida, cache)["puntuados"] == 0
+    assert modelo.lotes == []
+
+
+def test_descarta_reseñas_con_campos_vacios(tmp_path):
+    entrada, salida = tmp_path / "merged_reviews.csv", tmp_path / "salida.csv"
+    reseñas = _reseñas(COMENTARIOS[:3] + [np.nan])
+    reseñas.loc[1, "calidad_general"] = np.nan
+    reseñas.to_csv(entrada, index=False)
+
+    resumen = puntuar_reseñas(ModeloContado(), entrada, salida, tmp_path / "cache.csv")
+
+    assert resumen["reseñas"] == 2
+    assert pd.read_csv(salida)["comentario"].tolist() == [COMENTARIOS[0], COMENTARIOS[2]]
@@ -1,14 +1,33 @@
+import json
+import os
+from collections import OrderedDict
+from threading import Lock
 import pandas as pd
 from dash import html
-from plotly import express as px
 import plotly.graph_objects as go
-from dash import dcc
+from dash import dcc, dash_table
 import dash_daq as daq
 import plotly.io as pio
 import dash_bootstrap_components as dbc
 import numpy as np
-
-pio.templates.default = "plotly_dark"
+from comparacion import METRICAS, TablaAgregados
+from datos import DatosProfesores
+from metricas import medir, registro
+
+# Plantilla de las figuras: plotly_dark con el estilo común de todas las gráficas. Se envía
+# una sola vez al navegador con el layout (app.py), así que cada figura solo lleva lo propio.
+PLANTILLA = "profesores"
+pio.templates[PLANTILLA] = go.layout.Template(pio.templates["plotly_dark"])
+pio.templates[PLANTILLA].layout.update(
+    plot_bgcolor='black',
+    paper_bgcolor='black',
+    font=dict(color='white'),
+    xaxis=dict(showgrid=False, ticks="outside"),
+)
+pio.templates.default = PLANTILLA
+# Puntos como máximo en la gráfica de tendencias: los historiales más largos se agrupan
+# en semestres consecutivos para que la figura tenga un tamaño acotado
+MAX_PUNTOS_TENDENCIA = 40
 theme = {
     'dark': True
 }
@@ -38,23 +57,165 @@ etiqueta_color = {
     'RESPETADO POR LOS ESTUDIANTES': 'primary',
 }
 
-meses_es_a_en = {
-    'Ene': 'Jan', 'Feb': 'Feb', 'Mar': 'Mar', 'Abr': 'Apr', 'May': 'May', 'Jun': 'Jun',
-    'Jul': 'Jul', 'Ago': 'Aug', 'Sep': 'Sep', 'Oct': 'Oct', 'Nov': 'Nov', 'Dic': 'Dec'
-    }
+def _datos(df_prof: DatosProfesores | pd.DataFrame, name: str) -> DatosProfesores:
+    """
+    Devuelve los datos indexados. Si se recibe un DataFrame se indexan solo las filas del profesor.
+    Args:
+        df_prof (DatosProfesores | pd.DataFrame): Datos de los profesores.
+        name (str): Nombre del profesor.
+    Returns:
+        DatosProfesores: Datos indexados por nombre.
+    """
+    if isinstance(df_prof, DatosProfesores):
+        return df_prof
+    return DatosProfesores(df_prof[df_prof['profesor'] == name])
+
+class CacheFiguras:
+    """
+    Caché LRU de figuras serializadas a JSON, con contadores de aciertos y fallos.
+
+    Las claves incluyen la versión de los datos, así que una figura nunca se
+    reutiliza con otro conjunto de datos. Es segura entre hilos.
+    """
+
+    def __init__(self, max_figuras: int):
+        self.max_figuras = max_figuras
+        self.figuras = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+        self._lock = Lock()
+
+    def obtener(self, clave: tuple) -> str | None:
+        with self._lock:
+            figura = self.figuras.get(clave)
+            if figura is None:
+                self.fallos += 1
+                return None
+            self.figuras.move_to_end(clave)
+            self.aciertos += 1
+            return figura
+
+    def guardar(self, clave: tuple, figura: str):
+        with self._lock:
+            self.figuras[clave] = figura
+            self.figuras.move_to_end(clave)
+            while len(self.figuras) > self.max_figuras:
+                self.figuras.popitem(last=False)
+
+    def limpiar(self):
+        with self._lock:
+            self.figuras.clear()
+
+    def recientes(self, version: str, maximo: int) -> list[str]:
+        """
+        Profesores con figuras de una versión de los datos, del más al menos reciente.
+        Args:
+            version (str): Versión de los datos.
+            maximo (int): Número máximo de profesores.
+        Returns:
+            list[str]: Nombres sin repetir.
+        """
+        with self._lock:
+            claves = list(reversed(self.figuras))
+        nombres = {}
+        for _, nombre, version_clave in claves:
+            if version_clave == version:
+                nombres.setdefault(nombre, None)
+                if len(nombres) >= maximo:
+                    break
+        return list(nombres)
+
+    def invalidar(self, version: str) -> int:
+        """
+        Descarta las figuras de una versión de los datos.
+        Args:
+            version (str): Versión de los datos.
+        Returns:
+            int: Número de figuras descartadas.
+        """
+        with self._lock:
+            claves = [clave for clave in self.figuras if clave[2] == version]
+            for clave in claves:
+                del self.figuras[clave]
+        return len(claves)
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            return {
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'figuras': len(self.figuras),
+                'max_figuras': self.max_figuras,
+            }
+
+cache_figuras = CacheFiguras(int(os.environ.get("PROFESORES_CACHE_FIGURAS", 1024)))
+registro.agregar_valores(lambda: [
+    ("profesores_cache_figuras_aciertos_total", "counter", cache_figuras.aciertos, "Figuras servidas desde la caché."),
+    ("profesores_cache_figuras_fallos_total", "counter", cache_figuras.fallos, "Figuras que hubo que construir."),
+    ("profesores_cache_figuras", "gauge", len(cache_figuras.figuras), "Figuras guardadas en la caché."),
+])
+
+@medir('serializar_figura')
+def _serializar(figura: go.Figure) -> str:
+    return figura.to_json()
+
+def _figura_en_cache(tipo: str, construir, datos: DatosProfesores, name: str) -> str | html.Div:
+    """
+    Devuelve el JSON de la figura de un profesor usando `cache_figuras`.
+    En un acierto se usa el JSON guardado y no se construye ningún objeto de Plotly.
+    Args:
+        tipo (str): Tipo de gráfica (forma parte de la clave).
+        construir: Función (datos, name) -> go.Figure | html.Div.
+        datos (DatosProfesores): Datos indexados de los profesores.
+        name (str): Nombre del profesor.
+    Returns:
+        str | html.Div: JSON de la figura o el mensaje de falta de datos.
+    """
+    if datos.version is None:
+        resultado = construir(datos, name)
+        return _serializar(resultado) if isinstance(resultado, go.Figure) else resultado
+
+    clave = (tipo, name, datos.version)
+    figura = cache_figuras.obtener(clave)
+    if figura is not None:
+        return figura
+
+    resultado = construir(datos, name)
+    if not isinstance(resultado, go.Figure):
+        return resultado
+    figura = _serializar(resultado)
+    cache_figuras.guardar(clave, figura)
+    return figura
+
+def _grafica_en_cache(tipo: str, construir, datos: DatosProfesores, name: str) -> html.Div:
+    """
+    Devuelve la gráfica de un profesor usando `cache_figuras`.
+    Args:
+        tipo (str): Tipo de gráfica (forma parte de la clave).
+        construir: Función (datos, name) -> go.Figure | html.Div.
+        datos (DatosProfesores): Datos indexados de los profesores.
+        name (str): Nombre del profesor.
+    Returns:
+        html.Div: Contenedor HTML con la gráfica o con el mensaje de falta de datos.
+    """
+    figura = _figura_en_cache(tipo, construir, datos, name)
+    if isinstance(figura, str):
+        return html.Div(dcc.Graph(figure=json.loads(figura)))
+    return figura
 
-def generar_resumen(df_prof: pd.DataFrame, name:str) -> html.Div:
+@medir('generar_resumen')
+def generar_resumen(df_prof: DatosProfesores | pd.DataFrame, name:str) -> html.Div:
     """
     Genera un resumen de las reseñas de un profesor específico.
     Args:
-        df_prof (pd.DataFrame): DataFrame con las reseñas del profesor.
+        df_prof (DatosProfesores | pd.DataFrame): Datos indexados de los profesores.
         name (str): Nombre del profesor.
     Returns:
         html.Div: Contenedor HTML con el resumen.
     """
 
 
-    resumen = df_prof.loc[df_prof['profesor'] == name, 'resumen'].values[0] if not df_prof.empty else ''
+    resumen = _datos(df_prof, name).valor(name, 'resumen', '')
     
     if resumen != '':
         return html.Div([
@@ -67,128 +228,108 @@ def generar_resumen(df_prof: pd.DataFrame, name:str) -> html.Div:
             html.P("No se encontró un resumen generado para este profesor."),
         ])
 
-def plot_facilidad (df_prof: pd.DataFrame, name: str) -> html.Div:
+def _histograma(valores: np.ndarray, conteos: np.ndarray, etiqueta: str, titulo: str) -> go.Figure:
     """
-    Genera un histograma de la facilidad de comprensión de un profesor.
+    Genera el histograma de barras de una columna de reseñas.
+    Las etiquetas de las barras y el texto flotante se arman en el navegador a partir
+    de x e y, así que la figura solo lleva los dos arreglos numéricos.
     Args:
-        df_prof (pd.DataFrame): DataFrame con las reseñas del profesor.
-        name (str): Nombre del profesor.
+        valores (np.ndarray): Valores presentes (ver `DatosProfesores.histograma`).
+        conteos (np.ndarray): Número de reseñas con cada valor.
+        etiqueta (str): Nombre del eje x y del texto flotante.
+        titulo (str): Título de la gráfica.
     Returns:
-        html.Div: Contenedor HTML con el histograma.
+        go.Figure: Histograma.
     """
-    if df_prof.empty:
-        return html.Div("No hay datos disponibles para este profesor.")
-
-    facilidad = df_prof.loc[df_prof['profesor'] == name, ['facilidad']]['facilidad'].values[0]
-    facilidad = facilidad.split(',')
-    facilidad = pd.to_numeric(facilidad, errors='coerce')
-    facilidad = pd.DataFrame({'facilidad': facilidad}).astype("category")
-    facilidad = facilidad['facilidad'].value_counts().reset_index()
-    facilidad.columns = ['facilidad', 'frecuencia']
-
-    if facilidad.empty:
-        return html.Div("No hay datos de facilidad de comprensión para este profesor.")
-    
-    # Convertimos de string a num los datos separados por comas
-
     fig = go.Figure(
     data=go.Bar(
-        x=facilidad['facilidad'],
-        y=facilidad['frecuencia'],
-        text=facilidad['frecuencia'],    
+        x=valores,
+        y=conteos,
+        texttemplate='%{y}',
         textposition='auto',
-        hovertext=[f"Facilidad: {f}, Frecuencia: {v}" for f, v in zip(facilidad['facilidad'], facilidad['frecuencia'])],
-        hoverinfo='text',
-        marker=dict(line=dict(width=0)),       
-        orientation='v'
+        hovertemplate=f"{etiqueta}: %{{x:.1f}}, Frecuencia: %{{y}}<extra></extra>",
+        marker=dict(line=dict(width=0)),
     ))
 
     fig.update_layout(
-        title=f"Facilidad del docente {name}",
-        xaxis_title='Facilidad',
+        title=titulo,
+        xaxis_title=etiqueta,
         yaxis_title='Frecuencia',
         bargap=0.2,
-        plot_bgcolor='black',
-        paper_bgcolor='black',
         barcornerradius=30,
-        xaxis=dict(tickvals = facilidad['facilidad'].unique())
-    )
-    fig.update_xaxes(
-        showgrid= False,
-        ticks="outside",
+        xaxis=dict(tickvals = valores)
     )
 
-    return html.Div(dcc.Graph(figure=fig))
+    return fig
+
+def _figura_facilidad(datos: DatosProfesores, name: str) -> go.Figure | html.Div:
+    # Fila precalculada de la matriz de histogramas
+    histograma = datos.histograma(name, 'facilidad')
+    if histograma is None:
+        return html.Div("No hay datos disponibles para este profesor.")
+
+    valores, conteos = histograma
+    if len(valores) == 0:
+        return html.Div("No hay datos de facilidad de comprensión para este profesor.")
+
+    return _histograma(valores, conteos, 'Facilidad', f"Facilidad del docente {name}")
 
-def plot_calidad (df_prof: pd.DataFrame, name: str) -> html.Div:
+@medir('plot_facilidad')
+def plot_facilidad (df_prof: DatosProfesores | pd.DataFrame, name: str) -> html.Div:
     """
-    Genera un histograma de la calidad de las reseñas de un profesor.
+    Genera un histograma de la facilidad de comprensión de un profesor.
     Args:
-        df_prof (pd.DataFrame): DataFrame con las reseñas del profesor.
+        df_prof (DatosProfesores | pd.DataFrame): Datos indexados de los profesores.
         name (str): Nombre del profesor.
     Returns:
         html.Div: Contenedor HTML con el histograma.
     """
-    if df_prof.empty:
-        return html.Div("No hay datos disponibles para este profesor.")
+    return _grafica_en_cache('facilidad', _figura_facilidad, _datos(df_prof, name), name)
 
-    calidad = df_prof.loc[df_prof['profesor'] == name, ['calidad_general']]['calidad_general'].values[0]
-    calidad = calidad.split(',')
-    calidad = pd.to_numeric(calidad, errors='coerce')
-    calidad = pd.DataFrame({'calidad': calidad}).astype("category")
-    calidad = calidad['calidad'].value_counts().reset_index()
-    calidad.columns = ['calidad', 'frecuencia']
+def _figura_calidad(datos: DatosProfesores, name: str) -> go.Figure | html.Div:
+    histograma = datos.histograma(name, 'calidad_general')
+    if histograma is None:
+        return html.Div("No hay datos disponibles para este profesor.")
 
-    if calidad.empty:
+    valores, conteos = histograma
+    if len(valores) == 0:
         return html.Div("No hay datos de calidad para este profesor.")
 
-    # Convertimos de string a num los datos separados por comas
+    return _histograma(valores, conteos, 'Calidad', f"Calidad del docente {name}")
 
-    fig = go.Figure(
-    data=go.Bar(
-        x=calidad['calidad'],
-        y=calidad['frecuencia'],
-        text=calidad['frecuencia'],    
-        textposition='auto',
-        hovertext=[f"Calidad: {f}, Frecuencia: {v}" for f, v in zip(calidad['calidad'], calidad['frecuencia'])],
-        hoverinfo='text',
-        marker=dict(line=dict(width=0)),       
-        orientation='v'
-    ))
-
-    fig.update_layout(
-        title=f"Calidad del docente {name}",
-        xaxis_title='Calidad',
-        yaxis_title='Frecuencia',
-        plot_bgcolor='black',
-        paper_bgcolor='black',
-        bargap=0.2,
-        barcornerradius=30,
-        xaxis=dict(tickvals = calidad['calidad'].unique())
-    )
-    fig.update_xaxes(
-        showgrid= False,
-        ticks="outside",
-    )
-
-    return html.Div(dcc.Graph(figure=fig))
-
-def show_means(df_prof: pd.DataFrame, name: str):
-    row = df_prof[df_prof['profesor'] == name]
-    if row.empty:
-        return "", "", "", ""
+@medir('plot_calidad')
+def plot_calidad (df_prof: DatosProfesores | pd.DataFrame, name: str) -> html.Div:
+    """
+    Genera un histograma de la calidad de las reseñas de un profesor.
+    Args:
+        df_prof (DatosProfesores | pd.DataFrame): Datos indexados de los profesores.
+        name (str): Nombre del profesor.
+    Returns:
+        html.Div: Contenedor HTML con el histograma.
+    """
+    return _grafica_en_cache('calidad', _figura_calidad, _datos(df_prof, name), name)
 
-    row = row.iloc[0]
+def _valores_indicadores(datos: DatosProfesores, name: str) -> list[dict] | None:
+    """
+    Calcula etiqueta, valor y color de los cuatro indicadores de un profesor.
+    Args:
+        datos (DatosProfesores): Datos indexados de los profesores.
+        name (str): Nombre del profesor.
+    Returns:
+        list[dict] | None: Un dict por indicador; None si el profesor no existe.
+    """
+    if name not in datos:
+        return None
 
-    facilidad_vals = pd.to_numeric(str(row['facilidad']).split(','), errors='coerce')
-    calidad_vals = pd.to_numeric(str(row['calidad_general']).split(','), errors='coerce')
-    media = float(row['promedio'])
+    facilidad_vals = datos.valores(name, 'facilidad')
+    calidad_vals = datos.valores(name, 'calidad_general')
+    media = float(datos.valor(name, 'promedio'))
 
     facilidad_mean = round(facilidad_vals.mean(), 2)
     calidad_mean = round(calidad_vals.mean(), 2)
     media_round = round(media, 2)
 
-    numero_reseñas = row['num_reviews']
+    numero_reseñas = datos.valor(name, 'num_reviews')
 
     def color(valor):
         if valor >= 7.5:
@@ -206,63 +347,51 @@ def show_means(df_prof: pd.DataFrame, name: str):
         else:
             return "#FF4136"
 
+    return [
+        {'label': "Facilidad Promedio", 'value': facilidad_mean, 'color': color(facilidad_mean)},
+        {'label': "Calidad Promedio", 'value': calidad_mean, 'color': color(calidad_mean)},
+        {'label': "Promedio General", 'value': media_round, 'color': color(media_round)},
+        {'label': "Número de Opiniones Evaluadas", 'value': numero_reseñas, 'color': color_num_reviews(numero_reseñas)},
+    ]
+
+@medir('show_means')
+def show_means(df_prof: DatosProfesores | pd.DataFrame, name: str):
+    indicadores = _valores_indicadores(_datos(df_prof, name), name)
+    if indicadores is None:
+        return "", "", "", ""
+
     estilo_led = {'marginBottom': '15px'}
 
-    indicador_1 = daq.LEDDisplay(
-        label="Facilidad Promedio",
-        value=facilidad_mean,
-        color=color(facilidad_mean),
-        backgroundColor="#000000",
-        style=estilo_led,
-        labelPosition = "bottom"
-    )
-    indicador_2 = daq.LEDDisplay(
-        label="Calidad Promedio",
-        value=calidad_mean,
-        color=color(calidad_mean),
-        backgroundColor="#000000",
-        style=estilo_led,
-        labelPosition = "bottom"
-    )
-    indicador_3 = daq.LEDDisplay(
-        label="Promedio General",
-        value=media_round,
-        color=color(media_round),
-        backgroundColor="#000000",
-        style=estilo_led,
-        labelPosition = "bottom"
-    )
-    indicador_4 = daq.LEDDisplay(
-        label="Número de Opiniones Evaluadas",
-        value=numero_reseñas,
-        color=color_num_reviews(numero_reseñas),
-        backgroundColor="#000000",
-        style=estilo_led,
-        labelPosition = "bottom"
+    return tuple(
+        daq.LEDDisplay(
+            label=indicador['label'],
+            value=indicador['value'],
+            color=indicador['color'],
+            backgroundColor="#000000",
+            style=estilo_led,
+            labelPosition = "bottom"
+        )
+        for indicador in indicadores
     )
 
-    return indicador_1, indicador_2, indicador_3, indicador_4
-
-def get_tags(df_prof: pd.DataFrame, name: str) -> html.Div:
+@medir('get_tags')
+def get_tags(df_prof: DatosProfesores | pd.DataFrame, name: str) -> html.Div:
     """
     Obtiene las etiquetas asociadas a un profesor específico.
     Args:
-        df_prof (pd.DataFrame): DataFrame con las reseñas del profesor.
+        df_prof (DatosProfesores | pd.DataFrame): Datos indexados de los profesores.
         name (str): Nombre del profesor.
     Returns:
         list: Lista de etiquetas asociadas al profesor.
     """
-    row = df_prof[df_prof['profesor'] == name]
-    if row.empty:
+    datos = _datos(df_prof, name)
+    if name not in datos:
         return html.Div("No hay etiquetas disponibles para este profesor.")
 
-    tags = row.iloc[0]['tags']
-    if pd.isna(tags):
+    tags = datos.tags_de(name)
+    if not tags:
         return html.Div("No hay etiquetas disponibles para este profesor.")
 
-    tags = tags.split(',')
-    tags = [tag.strip() for tag in tags if tag.strip() != '']
-    
     return html.Div(
         [
             dbc.Badge(etiqueta,
@@ -274,99 +403,74 @@ def get_tags(df_prof: pd.DataFrame, name: str) -> html.Div:
         className="mb-3"
     )
 
-def plot_tendencias(df_prof: pd.DataFrame, name: str) -> html.Div:
+def _reducir_semestres(df_resumen: pd.DataFrame, maximo: int) -> pd.DataFrame:
     """
-    Genera un gráfico de líneas que muestra la evolución de las calificaciones a lo largo del tiempo.
+    Agrupa semestres consecutivos para que haya como máximo `maximo` puntos.
     Args:
-        df_prof (pd.DataFrame): DataFrame con las reseñas del profesor.
-        name (str): Nombre del profesor.
+        df_resumen (pd.DataFrame): Promedios por semestre (ver `DatosProfesores.semestres_de`).
+        maximo (int): Número máximo de filas.
     Returns:
-        html.Div: Contenedor HTML con el gráfico de líneas.
+        pd.DataFrame: Mismas columnas; cada grupo tiene la fecha de su primer semestre,
+        la etiqueta "primero–último", los promedios ponderados por reseñas y el total de reseñas.
     """
-    if df_prof.empty:
-        return html.Div("No hay datos disponibles para este profesor.")
-
-    df_prof = df_prof[df_prof['profesor'] == name]
-    if df_prof.empty:
-        return html.Div("No hay datos disponibles para este profesor.")
-
-    fechas_str = df_prof['fecha'].values[0]
-    facilidad_str = df_prof['facilidad'].values[0]
-    calidad_str = df_prof['calidad_general'].values[0]
-    # Convertir a listas
-    fechas = [f.strip() for f in fechas_str.split(',')]
-    facilidad = [float(f.strip()) for f in facilidad_str.split(',')]
-    calidad = [float(c.strip()) for c in calidad_str.split(',')]
-
-    # Reemplazar meses
-    fechas_en = [f.replace(mes_es, mes_en) for f in fechas for mes_es, mes_en in meses_es_a_en.items() if mes_es in f]
-
-
-    # Crear dataframe
-    df = pd.DataFrame({
-        'fecha': pd.to_datetime(fechas_en, format="%d/%b/%Y"),
-        'facilidad': facilidad,
-        'calidad': calidad
+    if len(df_resumen) <= maximo:
+        return df_resumen
+
+    grupo = np.arange(len(df_resumen)) * maximo // len(df_resumen)
+    agrupado = df_resumen.groupby(grupo)
+    primero, ultimo = agrupado['semestre'].first(), agrupado['semestre'].last()
+    reducido = pd.DataFrame({
+        'semestre': np.where(primero == ultimo, primero, primero + '–' + ultimo),
+        'fecha_referencia': agrupado['fecha_referencia'].first(),
+        'n': agrupado['n'].sum(),
     })
+    n = df_resumen['n'].to_numpy(dtype=float)
+    for columna in ('facilidad', 'calidad'):
+        valores = df_resumen[columna].to_numpy(dtype=float)
+        pesos = np.where(np.isnan(valores), 0, n)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            reducido[columna] = (np.bincount(grupo, np.nan_to_num(valores) * pesos, minlength=maximo)
+                                 / np.bincount(grupo, pesos, minlength=maximo))
+    return reducido.reset_index(drop=True)
+
+def _figura_tendencias(datos: DatosProfesores, name: str) -> go.Figure | html.Div:
+    # Promedios por semestre precalculados al cargar los datos
+    df_resumen = datos.semestres_de(name)
+    if df_resumen is None or df_resumen.empty:
+        return html.Div("No hay datos disponibles para este profesor.")
+    df_resumen = _reducir_semestres(df_resumen, MAX_PUNTOS_TENDENCIA)
 
-    # Crear columna 'semestre' como texto tipo "2025-1" o "2024-2"
-    df['año'] = df['fecha'].dt.year
-    df['mes'] = df['fecha'].dt.month
-    df['semestre'] = df.apply(lambda x: f"{x['año']}-1" if x['mes'] <= 6 else f"{x['año']}-2", axis=1)
-
-    # Crear fecha de referencia (1 de enero o 1 de julio de cada semestre)
-    df['fecha_referencia'] = df.apply(
-        lambda x: pd.Timestamp(year=x['año'], month=1 if x['mes'] <= 6 else 7, day=1),
-        axis=1
-    )
-
-    # Agrupar por semestre
-    df_resumen = df.groupby(['semestre', 'fecha_referencia'], as_index=False)[['facilidad', 'calidad']].mean()
-    df_resumen['n'] = df.groupby(['semestre', 'fecha_referencia']).size().values
-
-    # Crear gráfico
-    fig = px.line(
-        df_resumen,
-        x="fecha_referencia",
-        y=["facilidad", "calidad"],
-        markers=True,
-        title="Promedio por semestre",
-        labels={"fecha_referencia": "Semestre", "value": "Calificación promedio"}
-    )
-
-    # Ajustar trazo y marcadores proporcional al número de evaluaciones
-    fig.update_traces(
-        mode='lines+markers',
-        line=dict(width=4),
-        marker=dict(
-            size=df_resumen['n'],
-            sizemode='area',
-            sizeref=2.*max(df_resumen['n'])/(40.**2),  # controla el tamaño relativo
-            sizemin=6
-        ),
-        hovertemplate='%{y:.2f}<br>Semestre: %{x|%Y-%m}<br>N: %{customdata}',
-        customdata=df_resumen[['n']].values
-    )
+    # Fechas como "2024-07-01" (no como timestamps con nanosegundos)
+    fechas = np.datetime_as_string(df_resumen["fecha_referencia"].to_numpy(), unit='D')
+    n = df_resumen['n'].to_numpy()
 
-    # Agregar etiquetas de valores encima de los puntos
+    # Una traza por calificación; el grosor del marcador es proporcional al número de
+    # evaluaciones y la etiqueta del valor va encima de cada punto en la misma traza
+    fig = go.Figure()
     for columna in ["facilidad", "calidad"]:
         fig.add_scatter(
-            x=df_resumen["fecha_referencia"],
-            y=df_resumen[columna],
-            mode="text",
-            text=[f"{v:.1f}" for v in df_resumen[columna]],
+            x=fechas,
+            y=df_resumen[columna].to_numpy(dtype=float),
+            name=columna,
+            mode='lines+markers+text',
+            texttemplate='%{y:.1f}',
             textposition="top center",
-            showlegend=False
+            line=dict(width=4),
+            marker=dict(
+                size=n,
+                sizemode='area',
+                sizeref=2.*n.max()/(40.**2),  # controla el tamaño relativo
+                sizemin=6
+            ),
+            hovertemplate='%{y:.2f}<br>Semestre: %{x|%Y-%m}<br>N: %{customdata}',
+            customdata=n
         )
 
     # Personalizar apariencia
     fig.update_layout(
+        title="Promedio por semestre",
         xaxis_title="Semestre",
         yaxis_title="Calificación promedio",
-        template='plotly_dark',
-        plot_bgcolor='black',
-        paper_bgcolor='black',
-        font=dict(color='white'),
         legend_title_text='Calificaciones',
         legend=dict(
             orientation="h",
@@ -379,51 +483,54 @@ def plot_tendencias(df_prof: pd.DataFrame, name: str) -> html.Div:
 
     # Eje X con etiquetas de semestre
     fig.update_xaxes(
-        tickvals=df_resumen["fecha_referencia"],
+        tickvals=fechas,
         ticktext=df_resumen["semestre"],
-        tickangle=45,
-        showgrid=False,
-        ticks="outside"
+        tickangle=45
     )
 
     # Eje Y
     fig.update_yaxes(
-        showgrid=True,
         gridcolor='LightGray',
         ticks="outside"
     )
 
-    return html.Div(dcc.Graph(figure=fig))
+    return fig
+
+@medir('plot_tendencias')
+def plot_tendencias(df_prof: DatosProfesores | pd.DataFrame, name: str) -> html.Div:
+    """
+    Genera un gráfico de líneas que muestra la evolución de las calificaciones a lo largo del tiempo.
+    Args:
+        df_prof (DatosProfesores | pd.DataFrame): Datos indexados de los profesores.
+        name (str): Nombre del profesor.
+    Returns:
+        html.Div: Contenedor HTML con el gráfico de líneas.
+    """
+    return _grafica_en_cache('tendencias', _figura_tendencias, _datos(df_prof, name), name)
 
-def get_link(df_prof: pd.DataFrame, name: str) -> str:
+def get_link(df_prof: DatosProfesores | pd.DataFrame, name: str) -> str:
     """
     Obtiene el enlace asociado a un profesor específico.
     Args:
-        df_prof (pd.DataFrame): DataFrame con las reseñas del profesor.
+        df_prof (DatosProfesores | pd.DataFrame): Datos indexados de los profesores.
         name (str): Nombre del profesor.
     Returns:
         str: Enlace asociado al profesor.
     """
-    row = df_prof[df_prof['profesor'] == name]
-    if row.empty:
+    datos = _datos(df_prof, name)
+    if name not in datos:
         return "https://www.misprofesores.com/"
 
-    link = row.iloc[0]['enlace']
+    link = datos.valor(name, 'enlace')
     return link if pd.notna(link) else "https://www.misprofesores.com/"
 
-def num_estrellas(data: pd.DataFrame, name: str) -> html.Div:
-    row = data[data['profesor'] == name]
-    if row.empty:
+@medir('num_estrellas')
+def num_estrellas(data: DatosProfesores | pd.DataFrame, name: str) -> html.Div:
+    datos = _datos(data, name)
+    if name not in datos:
         return html.Div("No hay datos de estrellas disponibles para este profesor.")
     
-    valor = row.iloc[0]['rating']
-    
-    if isinstance(valor, str):
-        estrellas = pd.to_numeric(valor.split(','), errors='coerce')
-    elif isinstance(valor, list):
-        estrellas = pd.to_numeric(valor, errors='coerce')
-    else:
-        return html.Div("Formato de estrellas no reconocido.")
+    estrellas = datos.valores(name, 'rating')
 
     if estrellas.size > 0:
         promedio = np.mean(estrellas)
@@ -449,4 +556,408 @@ def generar_estrellas(entero: int, fraccion: float) -> html.Div:
     if fraccion >= 0.5:
         estrellas.append(html.I(className="fas fa-star-half-alt text-warning"))
     
-    return html.Div(estrellas, className="estrellas")
\ No newline at end of file
+    return html.Div(estrellas, className="estrellas")
+
+ESTILO_ENLACE = {
+    "textAlign": "center",
+    "marginTop": "30px",
+    "fontSize": "16px",
+    "color": "white"  # O ajusta según tu tema
+}
+
+GRAFICAS = ('facilidad', 'calidad', 'tendencias')
+
+def generar_textos(datos: DatosProfesores | pd.DataFrame, nombre: str) -> tuple:
+    """
+    Genera las secciones de texto del dashboard de un profesor.
+    Args:
+        datos (DatosProfesores | pd.DataFrame): Datos indexados de los profesores.
+        nombre (str): Nombre del profesor.
+    Returns:
+        tuple: Hijos del resumen, de las etiquetas, de las estrellas y del enlace.
+    """
+    resumen = [
+        generar_resumen(datos, nombre)
+    ]
+    etiquetas = [
+        html.H5(children=f"Etiquetas", className="text-left mb-4"),
+        dbc.Col(children=[
+            html.Div([
+                get_tags(datos, nombre)
+            ])
+        ], width=12)
+    ]
+    estrellas = [
+        html.H6(children=f"Número de Estrellas", className="text-left mb-4"),
+        dbc.Col(children=[
+        num_estrellas(datos, nombre)
+    ], width=12)
+    ]
+    enlace = [
+        html.Span("Opiniones de alumnos extraídas de: ", style={"fontWeight": "bold"}),
+        html.A(get_link(datos, nombre),
+            href=get_link(datos, nombre),  # Reemplaza con tu URL
+            target="_blank",
+            style={"color": "#1E90FF", "textDecoration": "none"})
+    ]
+    return resumen, etiquetas, estrellas, enlace
+
+def generar_contenido(datos: DatosProfesores | pd.DataFrame, nombre: str, graficas: tuple) -> dbc.Container:
+    """
+    Genera el contenedor principal del dashboard de un profesor.
+    Args:
+        datos (DatosProfesores | pd.DataFrame): Datos indexados de los profesores.
+        nombre (str): Nombre del profesor.
+        graficas (tuple): Componentes de facilidad, calidad y tendencias.
+    Returns:
+        dbc.Container: Resumen, etiquetas, estrellas, gráficas y enlace.
+    """
+    grafica_facilidad, grafica_calidad, grafica_tendencias = graficas
+    resumen, etiquetas, estrellas, enlace = generar_textos(datos, nombre)
+    return dbc.Container(
+            [
+                dbc.Row(resumen, className="mb-4"),
+                dbc.Row(etiquetas, className="mb-4"),
+                dbc.Row(estrellas, className="mb-4"),
+                dbc.Row(
+                    [
+                        dbc.Col(children=[
+                            html.Div([
+                                grafica_facilidad
+                            ])
+                            ], width=6),
+                        dbc.Col(children=[
+                            html.Div([
+                                grafica_calidad
+                            ])
+                        ], width=6)
+                    ]
+                ),
+                dbc.Row(
+                    [
+                        dbc.Col(children=[
+                            html.Div([
+                                grafica_tendencias
+                            ])
+                        ], width=12)
+                    ]
+                ),
+                html.Div(enlace, style=ESTILO_ENLACE)
+            ]
+        )
+
+def generar_esqueleto() -> dbc.Container:
+    """
+    Genera el contenedor del dashboard sin datos (misma estructura que `generar_contenido`),
+    con un id por sección para que cada una se actualice con su propio callback.
+    Returns:
+        dbc.Container: Contenedor oculto con id `secciones-profesor`.
+    """
+    grafica_facilidad, grafica_calidad, grafica_tendencias = (
+        html.Div([
+            html.Div(id=f"mensaje-{tipo}"),
+            dcc.Graph(id=f"grafica-{tipo}", style={"display": "none"})
+        ])
+        for tipo in GRAFICAS
+    )
+    return dbc.Container(
+        [
+            dbc.Row(id="seccion-resumen", className="mb-4"),
+            dbc.Row(id="seccion-etiquetas", className="mb-4"),
+            dbc.Row(id="seccion-estrellas", className="mb-4"),
+            dbc.Row(
+                [
+                    dbc.Col(children=[grafica_facilidad], width=6),
+                    dbc.Col(children=[grafica_calidad], width=6)
+                ]
+            ),
+            dbc.Row(
+                [
+                    dbc.Col(children=[grafica_tendencias], width=12)
+                ]
+            ),
+            html.Div(id="seccion-enlace", style=ESTILO_ENLACE)
+        ],
+        id="secciones-profesor",
+        style={"display": "none"}
+    )
+
+# Se mide solo la construcción de la figura de Plotly (en los fallos de la caché)
+_CONSTRUCTORES = {
+    'facilidad': medir('figura_facilidad')(_figura_facilidad),
+    'calidad': medir('figura_calidad')(_figura_calidad),
+    'tendencias': medir('figura_tendencias')(_figura_tendencias),
+}
+
+def figura_seccion(df_prof: DatosProfesores | pd.DataFrame, name: str, tipo: str) -> dict | html.Div:
+    """
+    Devuelve la figura de una gráfica sin su plantilla (que ya está en el navegador),
+    para enviarla como actualización parcial del `dcc.Graph`.
+    Args:
+        df_prof (DatosProfesores | pd.DataFrame): Datos indexados de los profesores.
+        name (str): Nombre del profesor.
+        tipo (str): 'facilidad', 'calidad' o 'tendencias'.
+    Returns:
+        dict | html.Div: Figura (data y layout) o el mensaje de falta de datos.
+    """
+    figura = _figura_en_cache(tipo, _CONSTRUCTORES[tipo], _datos(df_prof, name), name)
+    if not isinstance(figura, str):
+        return figura
+    figura = json.loads(figura)
+    figura['layout'].pop('template', None)
+    return figura
+
+def serializar_figuras(datos: DatosProfesores, nombres: list[str]):
+    """
+    Construye las figuras de varios profesores tal como las guarda `cache_figuras`.
+    Lo usa refresco.py para calentar la caché desde el proceso que construye los datos nuevos.
+    Args:
+        datos (DatosProfesores): Datos indexados de los profesores.
+        nombres (list[str]): Nombres de los profesores; se omiten los que no están en los datos.
+    Returns:
+        Iterator[tuple[str, str, str]]: Tipo de gráfica, nombre y JSON de cada figura.
+    """
+    for nombre in nombres:
+        if nombre not in datos:
+            continue
+        for tipo in GRAFICAS:
+            resultado = _CONSTRUCTORES[tipo](datos, nombre)
+            if isinstance(resultado, go.Figure):
+                yield tipo, nombre, _serializar(resultado)
+
+def generar_secciones(datos: DatosProfesores | pd.DataFrame, nombre: str) -> dict:
+    """
+    Genera las salidas de cada callback del dashboard de un profesor.
+    Args:
+        datos (DatosProfesores | pd.DataFrame): Datos indexados de los profesores.
+        nombre (str): Nombre del profesor.
+    Returns:
+        dict: 'indicadores', 'textos' y una entrada por gráfica (ver `figura_seccion`).
+    """
+    secciones = {
+        'indicadores': list(show_means(datos, nombre)),
+        'textos': list(generar_textos(datos, nombre)),
+    }
+    for tipo in GRAFICAS:
+        secciones[tipo] = figura_seccion(datos, nombre, tipo)
+    return secciones
+
+def generar_dashboard(datos: DatosProfesores | pd.DataFrame, nombre: str) -> tuple:
+    """
+    Genera todas las salidas del dashboard para un profesor.
+    Args:
+        datos (DatosProfesores | pd.DataFrame): Datos indexados de los profesores.
+        nombre (str): Nombre del profesor.
+    Returns:
+        tuple: Contenido del profesor y los cuatro indicadores.
+    """
+    indicador1, indicador2, indicador3, indicador4 = show_means(datos, nombre)
+    graficas = (plot_facilidad(datos, nombre), plot_calidad(datos, nombre), plot_tendencias(datos, nombre))
+    return generar_contenido(datos, nombre, graficas), indicador1, indicador2, indicador3, indicador4
+
+def datos_cliente(df_prof: DatosProfesores | pd.DataFrame, name: str) -> dict | None:
+    """
+    Genera los datos compactos con los que el navegador dibuja las gráficas y los
+    indicadores (ver `assets/dashboard_cliente.js`). Usa los mismos cálculos que
+    `plot_facilidad`, `plot_calidad`, `plot_tendencias` y `show_means`.
+    Args:
+        df_prof (DatosProfesores | pd.DataFrame): Datos indexados de los profesores.
+        name (str): Nombre del profesor.
+    Returns:
+        dict | None: Frecuencias, promedios por semestre e indicadores; None si el profesor no existe.
+    """
+    datos = _datos(df_prof, name)
+    if name not in datos:
+        return None
+
+    facilidad = datos.histograma(name, 'facilidad')
+    calidad = datos.histograma(name, 'calidad_general')
+    # Los mismos puntos que `_figura_tendencias`: la figura tiene un tamaño acotado
+    semestres = _reducir_semestres(datos.semestres_de(name), MAX_PUNTOS_TENDENCIA)
+    return {
+        'nombre': name,
+        'facilidad': {'valores': facilidad[0].tolist(), 'frecuencias': facilidad[1].tolist()},
+        'calidad': {'valores': calidad[0].tolist(), 'frecuencias': calidad[1].tolist()},
+        'semestres': {
+            'etiquetas': semestres['semestre'].tolist(),
+            'fechas': np.datetime_as_string(semestres['fecha_referencia'].to_numpy(), unit='D').tolist(),
+            'facilidad': semestres['facilidad'].tolist(),
+            'calidad': semestres['calidad'].tolist(),
+            'n': semestres['n'].tolist(),
+        },
+        'indicadores': _valores_indicadores(datos, name),
+    }
+
+def generar_dashboard_cliente(datos: DatosProfesores | pd.DataFrame, nombre: str) -> tuple:
+    """
+    Genera el contenido del dashboard sin gráficas (solo sus contenedores) y los
+    datos compactos para dibujarlas en el navegador.
+    Args:
+        datos (DatosProfesores | pd.DataFrame): Datos indexados de los profesores.
+        nombre (str): Nombre del profesor.
+    Returns:
+        tuple: Contenido del profesor y el resultado de `datos_cliente`.
+    """
+    graficas = tuple(html.Div(dcc.Graph(id=f"grafica-{tipo}")) for tipo in GRAFICAS)
+    return generar_contenido(datos, nombre, graficas), datos_cliente(datos, nombre)
+
+def generar_comparacion(metricas: list[str]) -> dbc.Container:
+    """
+    Genera los controles y los contenedores de la vista de comparación entre profesores.
+    Args:
+        metricas (list[str]): Métricas disponibles (claves de `comparacion.METRICAS`).
+    Returns:
+        dbc.Container: Controles del ranking, tabla y gráfica de distribución.
+    """
+    return dbc.Container(
+        [
+            dbc.Row(
+                [
+                    dbc.Col([
+                        html.Label("Ordenar por"),
+                        dcc.Dropdown(
+                            id="comparar-metrica",
+                            options=[{"label": METRICAS[m][0], "value": m} for m in metricas],
+                            value=metricas[0] if metricas else None,
+                            clearable=False
+                        )
+                    ], width=3),
+                    dbc.Col([
+                        html.Label("Mínimo de reseñas"),
+                        dbc.Input(id="comparar-minimo", type="number", min=0, step=1, value=5)
+                    ], width=2),
+                    dbc.Col([
+                        html.Label("Con las etiquetas"),
+                        dcc.Dropdown(id="comparar-etiquetas", options=[], multi=True,
+                                     placeholder="Cualquier etiqueta")
+                    ], width=4),
+                    dbc.Col([
+                        html.Label("Mostrar"),
+                        dbc.RadioItems(
+                            id="comparar-orden",
+                            options=[{"label": "Mejores", "value": "mejores"}, {"label": "Peores", "value": "peores"}],
+                            value="mejores",
+                            inline=True
+                        ),
+                        dcc.Dropdown(id="comparar-k", options=[10, 25, 50], value=10, clearable=False)
+                    ], width=3),
+                ],
+                className="mb-4"
+            ),
+            html.Div(id="comparar-resumen", className="text-muted mb-2"),
+            dbc.Row(
+                [
+                    dbc.Col(dash_table.DataTable(
+                        id="tabla-ranking",
+                        columns=columnas_ranking(metricas[0]) if metricas else [],
+                        style_as_list_view=True,
+                        style_header={"backgroundColor": "#222", "color": "white", "fontWeight": "bold"},
+                        style_cell={"backgroundColor": "black", "color": "white", "textAlign": "left",
+                                    "whiteSpace": "normal", "height": "auto", "fontSize": 14},
+                        style_data_conditional=[
+                            {"if": {"filter_query": '{tendencia} contains "▲"', "column_id": "tendencia"},
+                             "color": "#00FF00"},
+                            {"if": {"filter_query": '{tendencia} contains "▼"', "column_id": "tendencia"},
+                             "color": "#FF4136"},
+                        ],
+                    ), width=7),
+                    dbc.Col(dcc.Graph(id="grafica-distribucion"), width=5)
+                ]
+            ),
+        ],
+        fluid=True
+    )
+
+def opciones_etiquetas(agregados: TablaAgregados) -> list[dict]:
+    """
+    Opciones del filtro de etiquetas, de la más a la menos frecuente en el catálogo.
+    Args:
+        agregados (TablaAgregados): Agregados de los profesores.
+    Returns:
+        list[dict]: Opciones con el número de profesores de cada etiqueta.
+    """
+    orden = np.argsort(-agregados.frecuencia_etiquetas, kind='stable')
+    return [
+        {"label": f"{agregados.vocabulario[j]} ({agregados.frecuencia_etiquetas[j]})", "value": agregados.vocabulario[j]}
+        for j in orden
+    ]
+
+def _tendencia(pendiente: float) -> str:
+    if np.isnan(pendiente):
+        return "—"
+    if abs(pendiente) < 0.05:
+        return f"= {pendiente:+.2f}/año"
+    return f"{'▲' if pendiente > 0 else '▼'} {pendiente:+.2f}/año"
+
+def columnas_ranking(metrica: str) -> list[dict]:
+    """
+    Columnas de la tabla del ranking.
+    Args:
+        metrica (str): Métrica por la que se ordena (da nombre a su columna).
+    Returns:
+        list[dict]: Columnas para `dash_table.DataTable`.
+    """
+    return [
+        {"name": "#", "id": "lugar"},
+        {"name": "Profesor", "id": "profesor"},
+        {"name": METRICAS[metrica][0], "id": "valor", "type": "numeric"},
+        {"name": "Reseñas", "id": "reseñas", "type": "numeric"},
+        {"name": "Tendencia de calidad", "id": "tendencia"},
+        {"name": "Etiquetas", "id": "etiquetas"},
+    ]
+
+def filas_ranking(agregados: TablaAgregados, posiciones: np.ndarray, metrica: str) -> list[dict]:
+    """
+    Genera las filas de la tabla del ranking. Se envían como datos de una
+    `dash_table.DataTable` (no como un componente por celda) para que la
+    respuesta sea pequeña y rápida de serializar.
+    Args:
+        agregados (TablaAgregados): Agregados de los profesores.
+        posiciones (np.ndarray): Profesores del ranking, en orden (ver `TablaAgregados.ranking`).
+        metrica (str): Métrica por la que se ordenó.
+    Returns:
+        list[dict]: Una fila por profesor con posición, nombre, métrica, reseñas, tendencia y etiquetas.
+    """
+    valores = agregados.metricas[metrica][posiciones]
+    return [
+        {
+            "lugar": lugar,
+            "profesor": agregados.nombres[i],
+            "valor": round(float(valor), 2),
+            "reseñas": int(agregados.n_reseñas[i]),
+            "tendencia": _tendencia(agregados.tendencia[i]),
+            "etiquetas": ", ".join(agregados.vocabulario[j] for j in np.flatnonzero(agregados.etiquetas[i])),
+        }
+        for lugar, (i, valor) in enumerate(zip(posiciones, valores), start=1)
+    ]
+
+def figura_distribucion(agregados: TablaAgregados, metrica: str, mascara: np.ndarray) -> dict:
+    """
+    Genera el histograma de una métrica entre los profesores filtrados, como figura
+    sin plantilla (la pone el navegador) para enviarla como actualización parcial.
+    Args:
+        agregados (TablaAgregados): Agregados de los profesores.
+        metrica (str): Una de `comparacion.METRICAS`.
+        mascara (np.ndarray): Profesores filtrados (ver `TablaAgregados.filtrar`).
+    Returns:
+        dict: Figura (data y layout).
+    """
+    conteos, bordes = agregados.distribucion(metrica, mascara)
+    centros = (bordes[:-1] + bordes[1:]) / 2
+    etiqueta = METRICAS[metrica][0]
+    return {
+        'data': [{
+            'type': 'bar',
+            'x': centros.tolist(),
+            'y': conteos.tolist(),
+            'width': float(bordes[1] - bordes[0]),
+            'hovertemplate': f"{etiqueta}: %{{x:.2f}}<br>Profesores: %{{y}}<extra></extra>",
+            'marker': {'line': {'width': 0}},
+        }],
+        'layout': {
+            'title': {'text': f"Distribución de {etiqueta.lower()} ({int(mascara.sum())} profesores)"},
+            'xaxis': {'title': {'text': etiqueta}},
+            'yaxis': {'title': {'text': 'Profesores'}},
+            'bargap': 0.1,
+        },
+    }